@@ -0,0 +1,53 @@
+# Time building each window type and showing an entity in it.
+# Run with: python benchmarks/bench_construction.py [windows per type]
+import os
+import sys
+import time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QCoreApplication, QEvent
+from entities import DefaultEntity, CharacterEntity, ObstacleEntity, ZoneEntity
+
+# Build count windows with make_window, show the entity in each, and return the milliseconds per window
+def time_construction(make_window, entity, count):
+    windows = []
+    start = time.perf_counter()
+    for _ in range(count):
+        window = make_window()
+        window.set_entity(entity.copy())
+        windows.append(window)
+    elapsed = time.perf_counter() - start
+    for window in windows:
+        window.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return elapsed * 1000 / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = QApplication(sys.argv)
+    from theme import apply_theme, DEFAULT_THEME
+    apply_theme(DEFAULT_THEME)
+    from default_window import DefaultWindow
+    from character_window import CharacterWindow
+    from obstacle_window import ObstacleWindow
+    from zone_window import ZoneWindow
+    from window_registry import WindowRegistry
+    registry = WindowRegistry()
+    window_types = [
+        ("DefaultWindow", DefaultWindow, DefaultEntity),
+        ("CharacterWindow", CharacterWindow, CharacterEntity),
+        ("ObstacleWindow", lambda: ObstacleWindow(add_default_rows=False), ObstacleEntity),
+        ("ZoneWindow", lambda: ZoneWindow(registry), ZoneEntity),
+    ]
+    print(f"{'window type':>16} {'no notes':>10} {'with notes':>11}  (ms per window, best of 3, {count} windows)")
+    for label, make_window, entity_class in window_types:
+        plain = entity_class(name="Plain")
+        noted = entity_class(name="Noted", notes="Some notes")
+        best_plain = min(time_construction(make_window, plain, count) for _ in range(3))
+        best_noted = min(time_construction(make_window, noted, count) for _ in range(3))
+        print(f"{label:>16} {best_plain:10.3f} {best_noted:11.3f}")
+
+if __name__ == "__main__":
+    main()
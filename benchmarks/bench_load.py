@@ -0,0 +1,148 @@
+# Compare loading a synthetic campaign with the loader as it was before it was reworked (the repository's
+# first commit, run from an exported copy of that tree) and with the parallel, batched loader.
+# Both loaders end up adding one QMdiSubWindow per file, and QMdiArea's placement of each new window
+# grows with the number already open; batching suspends repaints and notifications but does not remove
+# that cost, so the gap narrows as the campaign grows.
+# Run with: python benchmarks/bench_load.py [number of files]
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import tarfile
+import tempfile
+import subprocess
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The baseline run imports the exported tree instead of this one
+BASELINE_RUN = len(sys.argv) > 1 and sys.argv[1] == "--baseline-run"
+sys.path.insert(0, sys.argv[2] if BASELINE_RUN else REPO)
+
+from PyQt5.QtWidgets import QApplication, QFileDialog
+from PyQt5.QtCore import QCoreApplication, QEvent, QStandardPaths
+from PyQt5.QtGui import QImage, QPainter, QLinearGradient, QColor
+# Sessions, thumbnails and search indexes go to Qt's test locations instead of the user's
+QStandardPaths.setTestModeEnabled(True)
+
+RUNS = 3
+
+# Write a synthetic campaign of characters, obstacles and zones with shared portraits
+def make_campaign(directory, count, image_count=50):
+    from entities import CharacterEntity, ObstacleEntity, ZoneEntity, write_entity
+    os.makedirs(os.path.join(directory, "saved"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "pictures"), exist_ok=True)
+    image_paths = []
+    for i in range(image_count):
+        image = QImage(1600, 1200, QImage.Format_RGB32)
+        gradient = QLinearGradient(0, 0, 1600, 1200)
+        gradient.setColorAt(0, QColor.fromHsv(i * 7 % 360, 200, 200))
+        gradient.setColorAt(1, QColor.fromHsv(i * 13 % 360, 120, 90))
+        painter = QPainter(image)
+        painter.fillRect(image.rect(), gradient)
+        painter.end()
+        image_path = os.path.join(directory, "pictures", f"portrait_{i}.png")
+        image.save(image_path)
+        image_paths.append(image_path)
+
+    zone_count = max(1, count // 10)
+    obstacle_count = max(1, count * 3 // 10)
+    character_count = count - zone_count - obstacle_count
+    entities = []
+    for i in range(character_count):
+        entities.append(CharacterEntity(name=f"Character {i}", image_path=image_paths[i % image_count], high_concept="Hero",
+                                        aspects=[f"Aspect {j}" for j in range(5)], stunts=[f"Stunt {j}" for j in range(3)]))
+    for i in range(obstacle_count):
+        entities.append(ObstacleEntity(name=f"Obstacle {i}", image_path=image_paths[i % image_count],
+                                       rows=[[f"Agent {j}", str(j)] for j in range(4)]))
+    for i in range(zone_count):
+        members = [f"Character {(i * 5 + j) % character_count}" for j in range(5)] + [f"Obstacle {i % obstacle_count}"]
+        entities.append(ZoneEntity(name=f"Zone {i}", notes="A place", members=members))
+    file_names = []
+    for entity in entities:
+        file_name = os.path.join(directory, "saved", f"{entity.name}.txt")
+        write_entity(entity, file_name)
+        file_names.append(file_name)
+    return file_names
+
+# Export the repository's first commit, whose loader opened one file at a time
+def export_baseline(directory):
+    revision = subprocess.run(["git", "-C", REPO, "rev-list", "--max-parents=0", "HEAD"], capture_output=True, text=True, check=True).stdout.split()[0]
+    archive = subprocess.run(["git", "-C", REPO, "archive", revision], capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+    return revision
+
+# Time the baseline's File > Load in a separate process, since its modules share names with this tree's
+def time_baseline(tree, file_names):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--baseline-run", tree] + file_names,
+                            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(file_names[0])))
+    return [tuple(run) for run in json.loads(result.stdout.splitlines()[-1])]
+
+# Run inside the baseline tree: load the files through its menu action, with the file dialog answered
+def baseline_run(file_names):
+    from main_window import MainWindow
+    app = QApplication(sys.argv[:1])
+    QFileDialog.getOpenFileNames = staticmethod(lambda *args, **kwargs: (file_names, ""))
+    runs = []
+    for _ in range(RUNS):
+        main_window = MainWindow()
+        main_window.show()
+        start = time.perf_counter()
+        main_window.load_windows()
+        QCoreApplication.processEvents()
+        elapsed = time.perf_counter() - start
+        runs.append((elapsed, len(main_window.mdi_area.subWindowList())))
+        main_window.close_all_windows()
+        main_window.close()
+        main_window.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    print(json.dumps(runs))
+
+# The two-phase loader
+def load_batched(main_window, file_names):
+    main_window.load_files(file_names)
+
+# Time one load into a fresh main window
+def time_load(load, file_names):
+    from main_window import MainWindow
+    from default_window import DefaultWindow
+    main_window = MainWindow()
+    main_window.show()
+    # Every run decodes the images afresh
+    DefaultWindow.thumbnails.clear()
+    shutil.rmtree(DefaultWindow.thumbnails.disk_directory(), ignore_errors=True)
+    start = time.perf_counter()
+    load(main_window, file_names)
+    main_window.thumbnail_loader.wait()
+    QCoreApplication.processEvents()
+    elapsed = time.perf_counter() - start
+    opened = len(main_window.registry.sub_windows())
+    main_window.close_all_windows()
+    main_window.close()
+    main_window.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return elapsed, opened
+
+def main():
+    if BASELINE_RUN:
+        baseline_run(sys.argv[3:])
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = make_campaign(directory, count)
+        tree = os.path.join(directory, "baseline")
+        revision = export_baseline(tree)
+        results = {f"baseline {revision[:7]}": time_baseline(tree, file_names)}
+        os.chdir(directory)
+        results["parallel + batched"] = [time_load(load_batched, file_names) for _ in range(RUNS)]
+        os.chdir("/")
+    best = {label: min(elapsed for elapsed, opened in runs) for label, runs in results.items()}
+    for label, runs in results.items():
+        print(f"{label:>20}: {best[label] * 1000:8.0f} ms (best of {len(runs)}, {runs[0][1]} windows)")
+    baseline, batched = best.values()
+    print(f"{'speedup':>20}: {baseline / batched:8.2f}x")
+
+if __name__ == "__main__":
+    main()
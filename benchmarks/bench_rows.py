@@ -0,0 +1,38 @@
+# Time adding member rows to a shown zone window, the widget-per-row case the stylesheet affects most.
+# Run with: python benchmarks/bench_rows.py [rows]
+import os
+import sys
+import time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QCoreApplication, QEvent
+
+# Add count rows to a new zone window, and return the milliseconds per row including the first paint
+def time_rows(count):
+    from zone_window import ZoneWindow
+    from window_registry import WindowRegistry
+    window = ZoneWindow(WindowRegistry())
+    window.show()
+    QApplication.processEvents()
+    start = time.perf_counter()
+    for row in range(count):
+        window.add_row(f"Member {row}")
+    QApplication.processEvents()
+    window.repaint()
+    elapsed = time.perf_counter() - start
+    window.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return elapsed * 1000 / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = QApplication(sys.argv)
+    from theme import apply_theme, DEFAULT_THEME
+    apply_theme(DEFAULT_THEME)
+    best = min(time_rows(count) for _ in range(3))
+    print(f"{best:.3f} ms per row (best of 3, {count} rows)")
+
+if __name__ == "__main__":
+    main()
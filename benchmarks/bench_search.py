@@ -0,0 +1,93 @@
+# Time building, reloading, syncing and querying the search index over a synthetic campaign.
+# Names are unique and notes are free text drawn from a large vocabulary with a few very common words,
+# so the index holds about as many distinct tokens as a real campaign of that size.
+# Run with: python benchmarks/bench_search.py [entities]
+import os
+import sys
+import time
+import itertools
+import random
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities import CharacterEntity, ObstacleEntity
+from campaign_store import CampaignStore
+from search_index import SearchIndex, index_path
+
+SYLLABLES = "ka ro mi tesh vu lan dor eth si pra gul nem oz ba ti rux ven al ur zo fen kil thu mar od ise pel gor yn cha".split()
+
+QUERIES = ["red", "mar", "rebel pilot", "oxygen dome storm", "kar", "nothing"]
+
+# Made-up words of two to five syllables, the same for a given generator
+def make_vocabulary(size, rng):
+    words = set("red dust crater rover oxygen colony dome storm airlock martian rebel pilot medic".split())
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return sorted(words)
+
+# Characters and obstacles with unique names and free-text fields; word use falls off with rank, as in prose
+def make_entities(count, rng):
+    vocabulary = make_vocabulary(max(1000, count * 20), rng)
+    rng.shuffle(vocabulary)
+    # Cumulative, so each draw is a binary search rather than a pass over the weights
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    text = lambda words: " ".join(rng.choices(vocabulary, cum_weights=weights, k=words))
+    entities = []
+    for index in range(count):
+        if index % 4 == 3:
+            entity = ObstacleEntity()
+            entity.rows = [(text(2), str(rng.randint(1, 4))) for _ in range(3)]
+        else:
+            entity = CharacterEntity()
+            entity.high_concept = text(4)
+            entity.trouble = text(3)
+            entity.aspects = [text(3) for _ in range(3)]
+            entity.stunts = [text(8) for _ in range(2)]
+        entity.name = f"{text(1).title()} {text(1).title()} {index}"
+        entity.notes = text(60)
+        entities.append(entity)
+    return entities
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as directory:
+        store = CampaignStore(os.path.join(directory, "campaign.db"))
+        entities = make_entities(count, random.Random(1))
+        store.save_entities(entities)
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.sync(store)
+        index.sort_tokens()
+        print(f"build over {count} entities   {(time.perf_counter() - start) * 1000:8.1f} ms, {len(index.postings)} tokens")
+        index.save(index_path(store))
+
+        start = time.perf_counter()
+        index = SearchIndex.load(index_path(store))
+        stale = index.sync(store)
+        print(f"reload and sync ({stale} stale) {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        # A large sync, as after another tool rewrote a tenth of the campaign
+        changed = make_entities(count // 10, random.Random(2))
+        for entity, old in zip(changed, entities):
+            entity.name = old.name
+        store.save_entities(changed)
+        start = time.perf_counter()
+        stale = index.sync(store)
+        index.sort_tokens()
+        print(f"sync ({stale} changed)        {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        entity = entities[0]
+        entity.notes = "xylophone"
+        start = time.perf_counter()
+        index.update(entity)
+        print(f"update one entity           {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+        for query in QUERIES:
+            start = time.perf_counter()
+            results = index.search(query)
+            print(f"search {query!r:<20} {(time.perf_counter() - start) * 1000:8.3f} ms, {len(results)} results")
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# Time the hot paths on synthetic campaigns of growing size and write the results as JSON.
+# Each size gets a campaign of characters, obstacles and zones (60/30/10), loaded into a fresh main window:
+#   load_windows         load_files on every saved file, what load_windows runs once files are picked
+#   save_all_windows     saving every window with all of them marked unsaved, until the pipeline is done
+#   zone_open            reopening every zone after closing it: reading it from the store, planning the load and
+#                        opening its window, ms per zone, with the rest of the campaign open
+#   overlay_paint        one synchronous ConnectionOverlay.paintEvent over the whole MDI area
+#   update_connections   one MainWindow.update_connections cycle
+# Window construction (CharacterWindow, ObstacleWindow) does not depend on the campaign and is timed once.
+# A path whose run took longer than the budget (60 s by default) is not timed at larger sizes. Every other path
+# works on the windows the load opened, so once the load goes over the budget no larger size is run.
+# --budget 0 times the full curve: without lazy loading that takes about 100 minutes on one core, most of it
+# the 10,000-entity load (about 6,000 s) as QMdiArea's per-window placement grows with the open windows.
+# Results go to benchmarks/benchmark_results.json unless --output names another file.
+# Run with: python benchmarks/bench_suite.py [--sizes 10 100 1000] [--budget 60] [--lazy] [--output results.json] [--compare old.json]
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QCoreApplication, QEvent, QStandardPaths, QT_VERSION_STR, PYQT_VERSION_STR
+from entities import CharacterEntity, ObstacleEntity, ZoneEntity, write_entity
+# Sessions, thumbnails and search indexes go to Qt's test locations instead of the user's
+QStandardPaths.setTestModeEnabled(True)
+
+SIZES = [10, 30, 100, 300, 1000, 3000, 10000]
+
+PATHS = ["load_windows", "save_all_windows", "zone_open", "overlay_paint", "update_connections"]
+
+# Write a campaign of count entities to directory/saved and return the file names, zones last
+def make_campaign(directory, count):
+    saved = os.path.join(directory, "saved")
+    os.makedirs(saved, exist_ok=True)
+    zone_count = max(1, count // 10)
+    obstacle_count = max(1, count * 3 // 10)
+    character_count = max(1, count - zone_count - obstacle_count)
+    entities = []
+    for i in range(character_count):
+        entities.append(CharacterEntity(name=f"Character {i}", high_concept="Hero", careful="2", quick="1",
+                                        aspects=[f"Aspect {j}" for j in range(5)], stunts=[f"Stunt {j}" for j in range(3)]))
+    for i in range(obstacle_count):
+        entities.append(ObstacleEntity(name=f"Obstacle {i}", rows=[[f"Agent {j}", str(j)] for j in range(4)]))
+    for i in range(zone_count):
+        members = [f"Character {(i * 5 + j) % character_count}" for j in range(5)] + [f"Obstacle {i % obstacle_count}"]
+        entities.append(ZoneEntity(name=f"Zone {i}", notes="A place", members=members))
+    file_names = []
+    for entity in entities:
+        file_name = os.path.join(saved, f"{entity.name}.txt")
+        write_entity(entity, file_name)
+        file_names.append(file_name)
+    return file_names
+
+# Median of the timings of calling function repeat times, in milliseconds
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+# Time every path that is still within the budget on a campaign of count entities.
+# Returns {path: result} and {path: seconds the path took in all}.
+def run_size(count, paths, repeat, lazy=False):
+    from main_window import MainWindow
+    from default_window import DefaultWindow
+    from campaign_store import TextFileStore
+    results = {}
+    spent = {}
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = make_campaign(directory, count)
+        zone_names = [os.path.splitext(os.path.basename(file_name))[0] for file_name in file_names if os.path.basename(file_name).startswith("Zone ")]
+        # Saves stay in the campaign directory
+        os.chdir(directory)
+        DefaultWindow.store = TextFileStore(os.path.join(directory, "saved"))
+        main_window = MainWindow()
+        main_window.set_lazy_load(lazy)
+        main_window.show()
+        QCoreApplication.processEvents()
+
+        # Every other path works on the windows the load opened, so it runs whenever they do
+        if paths:
+            start = time.perf_counter()
+            main_window.load_files(file_names)
+            main_window.thumbnail_loader.wait()
+            QCoreApplication.processEvents()
+            spent["load_windows"] = time.perf_counter() - start
+            results["load_windows"] = {"ms": spent["load_windows"] * 1000, "windows": len(main_window.registry.sub_windows()),
+                                      "unopened": len(main_window.unopened)}
+
+        if "save_all_windows" in paths:
+            for name, sub_window in main_window.registry.named_windows():
+                sub_window.widget().dirty = True
+            start = time.perf_counter()
+            main_window.save_all_windows()
+            main_window.save_pipeline.wait()
+            QCoreApplication.processEvents()
+            spent["save_all_windows"] = time.perf_counter() - start
+            results["save_all_windows"] = {"ms": spent["save_all_windows"] * 1000, "entities": len(main_window.registry.named_windows())}
+
+        if "zone_open" in paths:
+            for name in zone_names:
+                sub_window = main_window.registry.find(name)
+                if sub_window is not None:
+                    sub_window.close()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+            start = time.perf_counter()
+            main_window.open_planned(DefaultWindow.store.load_entities(zone_names), lazy=False)
+            QCoreApplication.processEvents()
+            spent["zone_open"] = time.perf_counter() - start
+            results["zone_open"] = {"ms": spent["zone_open"] * 1000 / len(zone_names), "zones": len(zone_names)}
+
+        if "update_connections" in paths:
+            results["update_connections"] = {"ms": median_ms(main_window.update_connections, repeat),
+                                             "edges": main_window.overlay.edge_count()}
+            spent["update_connections"] = results["update_connections"]["ms"] * repeat / 1000
+
+        if "overlay_paint" in paths:
+            main_window.update_connections()
+            QCoreApplication.processEvents()
+            results["overlay_paint"] = {"ms": median_ms(main_window.overlay.repaint, repeat),
+                                        "edges": main_window.overlay.edge_count()}
+            spent["overlay_paint"] = results["overlay_paint"]["ms"] * repeat / 1000
+
+        main_window.close_all_windows()
+        main_window.close()
+        main_window.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        os.chdir(REPO)
+    return results, spent
+
+# Milliseconds per window to build each window type and show an entity in it
+def time_construction(count):
+    from character_window import CharacterWindow
+    from obstacle_window import ObstacleWindow
+    results = {}
+    for label, make_window, entity in [
+        ("CharacterWindow", CharacterWindow, CharacterEntity(name="Character", aspects=["Aspect"] * 5, stunts=["Stunt"] * 3)),
+        ("ObstacleWindow", lambda: ObstacleWindow(add_default_rows=False), ObstacleEntity(name="Obstacle", rows=[["Agent", "1"]] * 4)),
+    ]:
+        best = None
+        for _ in range(3):
+            windows = []
+            start = time.perf_counter()
+            for _ in range(count):
+                window = make_window()
+                window.set_entity(entity.copy())
+                windows.append(window)
+            elapsed = (time.perf_counter() - start) * 1000 / count
+            best = elapsed if best is None else min(best, elapsed)
+            for window in windows:
+                window.deleteLater()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        results[label] = {"ms": best, "windows": count}
+    return results
+
+# Commit the results were measured at, if the tree is a git checkout
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Print how each timing compares with an earlier run
+def compare(results, old_results):
+    print(f"\n{'path':>20} {'size':>6} {'before':>10} {'after':>10} {'ratio':>7}")
+    for path, runs in results["paths"].items():
+        old_runs = {run["size"]: run for run in old_results.get("paths", {}).get(path, [])}
+        for run in runs:
+            old_run = old_runs.get(run["size"])
+            if old_run is None or run.get("ms") is None or old_run.get("ms") is None:
+                continue
+            print(f"{path:>20} {run['size']:>6} {old_run['ms']:10.2f} {run['ms']:10.2f} {run['ms'] / old_run['ms']:7.2f}")
+    for label, result in results["construction"].items():
+        old_result = old_results.get("construction", {}).get(label)
+        if old_result:
+            print(f"{label:>20} {'':>6} {old_result['ms']:10.3f} {result['ms']:10.3f} {result['ms'] / old_result['ms']:7.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time load, save, paint and refresh paths on synthetic campaigns.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="entities per campaign")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=PATHS)
+    parser.add_argument("--repeat", type=int, default=20, help="runs of the paint and connection paths, median reported")
+    parser.add_argument("--budget", type=float, default=60, help="seconds a path may take before larger sizes skip it; 0 for no limit")
+    parser.add_argument("--lazy", action="store_true", help="list entities as unopened instead of building their editors")
+    parser.add_argument("--construction", type=int, default=200, help="windows built per type")
+    parser.add_argument("--output", default=os.path.join(REPO, "benchmarks", "benchmark_results.json"))
+    parser.add_argument("--compare", help="earlier results to compare with")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from theme import apply_theme, DEFAULT_THEME
+    apply_theme(DEFAULT_THEME)
+
+    results = {
+        "revision": git_revision(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "lazy": args.lazy,
+        "budget": args.budget or None,
+        "paths": {path: [] for path in args.paths},
+        "construction": {},
+    }
+    paths = set(args.paths)
+    print(f"{'size':>6} " + " ".join(f"{path:>20}" for path in args.paths) + "   (ms)")
+    for count in sorted(args.sizes):
+        size_results, spent = run_size(count, paths, args.repeat, args.lazy)
+        for path in args.paths:
+            result = size_results.get(path)
+            if result is None:
+                results["paths"][path].append({"size": count, "ms": None, "skipped": "over budget at a smaller size"})
+                continue
+            results["paths"][path].append({"size": count, **result})
+            if args.budget and spent[path] > args.budget:
+                paths.discard(path)
+        # The other paths need the windows the load opens, which is run for them even when it is not reported
+        if args.budget and spent.get("load_windows", 0) > args.budget:
+            paths.clear()
+        print(f"{count:>6} " + " ".join(f"{size_results[path]['ms']:20.2f}" if path in size_results else f"{'-':>20}" for path in args.paths), flush=True)
+    results["construction"] = time_construction(args.construction)
+    for label, result in results["construction"].items():
+        print(f"{label} construction: {result['ms']:.3f} ms per window")
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# Time opening and closing windows, with the window pool disabled and enabled.
+# Run with: python benchmarks/bench_window_pool.py [cycles per type]
+import os
+import sys
+import time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QCoreApplication, QEvent, QStandardPaths
+# Sessions, thumbnails and search indexes go to Qt's test locations instead of the user's
+QStandardPaths.setTestModeEnabled(True)
+
+WINDOW_TYPES = ["DefaultWindow", "CharacterWindow", "ObstacleWindow", "ZoneWindow"]
+
+# Open and close count windows of a type, and return the milliseconds per open/close cycle
+def time_cycles(main_window, window_type, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        sub_window = main_window.open_window(window_type)
+        QApplication.processEvents()
+        sub_window.close()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    return (time.perf_counter() - start) * 1000 / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    app = QApplication(sys.argv)
+    from main_window import MainWindow
+    main_window = MainWindow()
+    main_window.show()
+    print(f"{'window type':>16} {'no pool':>10} {'pool':>10}  (ms per open/close cycle, {count} cycles)")
+    for window_type in WINDOW_TYPES:
+        main_window.window_pool.set_cap(0)
+        unpooled = time_cycles(main_window, window_type, count)
+        main_window.window_pool.set_cap(MainWindow.WINDOW_POOL_CAP)
+        pooled = time_cycles(main_window, window_type, count)
+        print(f"{window_type:>16} {unpooled:10.3f} {pooled:10.3f}")
+    print(main_window.window_pool.stats())
+    main_window.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from PyQt5.QtWidgets import QDockWidget, QWidget, QVBoxLayout, QLineEdit, QListView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+
+# Entities of a lazy load that have no window yet.
+# They are rows of a list model rather than sub-windows, so listing thousands costs about as much as listing ten;
+# a window is only built when one is opened.
+class UnopenedEntities(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entities = []  # in the order they were listed
+        self.by_name = {}   # name -> entity
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entities)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entity = self.entities[index.row()]
+        if role == Qt.DisplayRole:
+            return f'{entity.name}  ({entity.window_type.replace("Window", "") or "Default"})'
+        if role == Qt.UserRole:
+            return entity.name
+        return None
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def __len__(self):
+        return len(self.entities)
+
+    # Names of every listed entity
+    def names(self):
+        return [entity.name for entity in self.entities]
+
+    # List entities that are not listed yet, in one insertion
+    def add(self, entities):
+        entities = [entity for entity in {entity.name: entity for entity in entities if entity.name not in self.by_name}.values()]
+        if not entities:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.entities), len(self.entities) + len(entities) - 1)
+        self.entities.extend(entities)
+        self.by_name.update((entity.name, entity) for entity in entities)
+        self.endInsertRows()
+
+    # Remove the named entities from the list and return them
+    def take(self, names):
+        taken = [self.by_name.pop(name) for name in dict.fromkeys(names) if name in self.by_name]
+        if len(taken) == 1:
+            row = self.entities.index(taken[0])
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.entities[row]
+            self.endRemoveRows()
+        elif taken:
+            self.beginResetModel()
+            self.entities = [entity for entity in self.entities if entity.name in self.by_name]
+            self.endResetModel()
+        return taken
+
+    # Forget every listed entity, e.g. when another store is opened
+    def clear(self):
+        self.beginResetModel()
+        self.entities = []
+        self.by_name = {}
+        self.endResetModel()
+
+# Dock listing the unopened entities, with a filter; activating rows asks to open them
+class CampaignListDock(QDockWidget):
+    # Names of the entities to open
+    open_requested = pyqtSignal(list)
+
+    def __init__(self, model, parent=None):
+        super().__init__('Unopened', parent)
+        self.setObjectName('campaignList')
+        self.filter = QSortFilterProxyModel(self)
+        self.filter.setSourceModel(model)
+        self.filter.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+        panel = QWidget()
+        layout = QVBoxLayout(panel)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText('Filter')
+        self.filter_input.textChanged.connect(self.filter.setFilterFixedString)
+        layout.addWidget(self.filter_input)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.filter)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Every row has the same height, so long lists are laid out without measuring each row
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.activated.connect(self.open_selected)
+        layout.addWidget(self.list_view)
+        self.setWidget(panel)
+
+    # Open the selected entities, or the activated one if it is not selected
+    def open_selected(self, index):
+        indexes = self.list_view.selectionModel().selectedRows()
+        if index not in indexes:
+            indexes = [index]
+        self.open_requested.emit([index.data(Qt.UserRole) for index in indexes])
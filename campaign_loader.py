@@ -0,0 +1,63 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from entities import ZoneEntity, read_entity
+
+# Entities to open, members before the zones that reference them, plus the reference cycles
+# found and the member names that could not be read
+LoadPlan = namedtuple('LoadPlan', 'entities cycles missing')
+
+# Read saved files in parallel, keeping their order
+def read_entities(file_paths, max_workers=None):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_entity, file_paths))
+
+# Names a zone references; other entity types reference nothing
+def references(entity):
+    return entity.members if isinstance(entity, ZoneEntity) else []
+
+# Build the zone reference graph of a load up front.
+# Members that are neither open nor among the given entities are read from the store one level
+# of the graph at a time, so every entity is read exactly once whatever the nesting.
+def plan_load(entities, store, is_open):
+    cache = {entity.name: entity for entity in entities}
+    missing = set()
+    frontier = {name for entity in entities for name in references(entity) if name not in cache and not is_open(name)}
+    while frontier:
+        loaded = store.load_entities(sorted(frontier))
+        for entity in loaded:
+            cache[entity.name] = entity
+        missing |= frontier - {entity.name for entity in loaded}
+        frontier = {name for entity in loaded for name in references(entity)
+                    if name not in cache and name not in missing and not is_open(name)}
+    order, cycles = topological_order(cache)
+    return LoadPlan([cache[name] for name in order], cycles, sorted(missing))
+
+# Order the entities so members come before the zones that reference them.
+# Uses an iterative depth-first search, so deep hierarchies cannot hit the recursion limit.
+# Returns the order and every reference cycle found, each as a list of names ending where it started.
+def topological_order(entities):
+    visiting, done = set(), set()
+    order, cycles = [], []
+    for root in entities:
+        if root in done:
+            continue
+        visiting.add(root)
+        stack = [(root, iter(references(entities[root])))]
+        while stack:
+            name, children = stack[-1]
+            for child in children:
+                if child not in entities or child in done:
+                    continue
+                if child in visiting:
+                    path = [entry[0] for entry in stack]
+                    cycles.append(path[path.index(child):] + [child])
+                    continue
+                visiting.add(child)
+                stack.append((child, iter(references(entities[child]))))
+                break
+            else:
+                stack.pop()
+                visiting.discard(name)
+                done.add(name)
+                order.append(name)
+    return order, cycles
@@ -0,0 +1,225 @@
+import os
+import glob
+import sqlite3
+import threading
+from entities import APPROACHES, ENTITY_TYPES, DefaultEntity, CharacterEntity, ObstacleEntity, ZoneEntity, read_entity, write_entity
+
+# Store keeping one saved/<name>.txt file per entity (the original layout)
+class TextFileStore:
+    def __init__(self, directory="saved"):
+        self.directory = directory
+
+    # Path of the file holding the named entity
+    def path_for(self, name):
+        return os.path.join(self.directory, f"{name}.txt")
+
+    # Where the named entity is saved, for messages
+    def location(self, name):
+        return f"{name}.txt"
+
+    # Write the given entities
+    def save_entities(self, entities):
+        os.makedirs(self.directory, exist_ok=True)
+        for entity in entities:
+            write_entity(entity, self.path_for(entity.name))
+
+    # Read the named entity, or None if it was never saved
+    def load_entity(self, name):
+        file_path = self.path_for(name)
+        if not os.path.exists(file_path):
+            return None
+        return read_entity(file_path)
+
+    # Stamp of every saved entity, or of the named ones, which changes whenever its file is written
+    def stamps(self, names=None):
+        stamps = {}
+        if names is not None:
+            for name in names:
+                try:
+                    stat = os.stat(self.path_for(name))
+                except OSError:
+                    continue
+                stamps[name] = (stat.st_mtime_ns, stat.st_size)
+            return stamps
+        try:
+            entries = os.scandir(self.directory)
+        except OSError:
+            return stamps
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    stat = entry.stat()
+                    stamps[entry.name[:-4]] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    # Read the named entities, or every saved entity
+    def load_entities(self, names=None):
+        if names is None:
+            return [read_entity(file_path) for file_path in sorted(glob.glob(os.path.join(self.directory, "*.txt")))]
+        return [entity for entity in (self.load_entity(name) for name in names) if entity is not None]
+
+# Columns of the entities table that only characters use
+CHARACTER_COLUMNS = ('fate_points', 'refresh') + APPROACHES + ('high_concept', 'trouble')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    window_type TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0,
+    notes TEXT NOT NULL DEFAULT '',
+    image_path TEXT NOT NULL DEFAULT '',
+    {', '.join(f'{column} TEXT' for column in CHARACTER_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS entities_window_type ON entities (window_type);
+CREATE TABLE IF NOT EXISTS zone_members (
+    zone_id INTEGER NOT NULL REFERENCES entities (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    member_name TEXT NOT NULL,
+    PRIMARY KEY (zone_id, position)
+);
+CREATE INDEX IF NOT EXISTS zone_members_member_name ON zone_members (member_name);
+CREATE TABLE IF NOT EXISTS obstacle_rows (
+    obstacle_id INTEGER NOT NULL REFERENCES entities (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    agent TEXT NOT NULL,
+    score TEXT NOT NULL,
+    PRIMARY KEY (obstacle_id, position)
+);
+CREATE TABLE IF NOT EXISTS character_entries (
+    character_id INTEGER NOT NULL REFERENCES entities (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL CHECK (kind IN ('aspect', 'stunt')),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (character_id, kind, position)
+);
+"""
+
+# Store keeping a whole campaign in one indexed SQLite file
+class CampaignStore:
+    def __init__(self, path):
+        self.path = path
+        # Saves run on worker threads, so the connection is shared and every use goes through the lock
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        # Campaigns created before entities had revisions
+        if 'revision' not in [column[1] for column in self.connection.execute("PRAGMA table_info(entities)")]:
+            self.connection.execute("ALTER TABLE entities ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    # Where the named entity is saved, for messages
+    def location(self, name):
+        return os.path.basename(self.path)
+
+    # Names of every entity in the campaign
+    def names(self):
+        with self.lock:
+            return [name for (name,) in self.connection.execute("SELECT name FROM entities ORDER BY name")]
+
+    # Revision of every entity, or of the named ones, which changes whenever it is written
+    def stamps(self, names=None):
+        with self.lock:
+            if names is None:
+                return dict(self.connection.execute("SELECT name, revision FROM entities"))
+            names = list(names)
+            stamps = {}
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                stamps.update(self.connection.execute(f"SELECT name, revision FROM entities WHERE name IN ({', '.join('?' * len(chunk))})", chunk))
+            return stamps
+
+    # Write the given entities in a single transaction
+    def save_entities(self, entities):
+        with self.lock, self.connection:
+            for entity in entities:
+                self.write(entity)
+
+    # Insert or replace one entity and its child rows
+    def write(self, entity):
+        character_values = [getattr(entity, column) if isinstance(entity, CharacterEntity) else None for column in CHARACTER_COLUMNS]
+        self.connection.execute(
+            f"""INSERT INTO entities (name, window_type, notes, image_path, {', '.join(CHARACTER_COLUMNS)}, revision)
+                VALUES ({', '.join('?' * (4 + len(CHARACTER_COLUMNS)))}, (SELECT COALESCE(MAX(revision), 0) + 1 FROM entities))
+                ON CONFLICT (name) DO UPDATE SET
+                    window_type = excluded.window_type, notes = excluded.notes, image_path = excluded.image_path,
+                    revision = excluded.revision,
+                    {', '.join(f'{column} = excluded.{column}' for column in CHARACTER_COLUMNS)}""",
+            [entity.name, entity.window_type, entity.notes, entity.image_path] + character_values)
+        entity_id = self.connection.execute("SELECT id FROM entities WHERE name = ?", (entity.name,)).fetchone()[0]
+
+        for table, key in (("zone_members", "zone_id"), ("obstacle_rows", "obstacle_id"), ("character_entries", "character_id")):
+            self.connection.execute(f"DELETE FROM {table} WHERE {key} = ?", (entity_id,))
+
+        if isinstance(entity, ZoneEntity):
+            self.connection.executemany("INSERT INTO zone_members VALUES (?, ?, ?)",
+                                        [(entity_id, position, name) for position, name in enumerate(entity.members)])
+        elif isinstance(entity, ObstacleEntity):
+            self.connection.executemany("INSERT INTO obstacle_rows VALUES (?, ?, ?, ?)",
+                                        [(entity_id, position, agent, score) for position, (agent, score) in enumerate(entity.rows)])
+        elif isinstance(entity, CharacterEntity):
+            entries = [(entity_id, 'aspect', position, text) for position, text in enumerate(entity.aspects)]
+            entries += [(entity_id, 'stunt', position, text) for position, text in enumerate(entity.stunts)]
+            self.connection.executemany("INSERT INTO character_entries VALUES (?, ?, ?, ?)", entries)
+
+    # Remove an entity and its child rows
+    def delete_entity(self, name):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entities WHERE name = ?", (name,))
+
+    # Read the named entity, or None if it is not in the campaign
+    def load_entity(self, name):
+        entities = self.load_entities([name])
+        return entities[0] if entities else None
+
+    # Read the named entities, or the whole campaign, with one query per table
+    def load_entities(self, names=None):
+        with self.lock, self.connection:
+            if names is None:
+                rows = self.connection.execute("SELECT * FROM entities ORDER BY name").fetchall()
+            else:
+                names = list(names)
+                rows = []
+                # Stay below SQLite's limit on bound parameters
+                for start in range(0, len(names), 500):
+                    chunk = names[start:start + 500]
+                    rows += self.connection.execute(f"SELECT * FROM entities WHERE name IN ({', '.join('?' * len(chunk))})", chunk).fetchall()
+
+            columns = [description[0] for description in self.connection.execute("SELECT * FROM entities LIMIT 0").description]
+            entities = {}
+            for row in rows:
+                values = dict(zip(columns, row))
+                entity = ENTITY_TYPES.get(values['window_type'], DefaultEntity)()
+                entity.name, entity.notes, entity.image_path = values['name'], values['notes'], values['image_path']
+                if isinstance(entity, CharacterEntity):
+                    for column in CHARACTER_COLUMNS:
+                        setattr(entity, column, values[column] or "")
+                entities[values['id']] = entity
+
+            if entities:
+                ids = ", ".join(str(entity_id) for entity_id in entities)
+                for zone_id, name in self.connection.execute(f"SELECT zone_id, member_name FROM zone_members WHERE zone_id IN ({ids}) ORDER BY zone_id, position"):
+                    entities[zone_id].members.append(name)
+                for obstacle_id, agent, score in self.connection.execute(f"SELECT obstacle_id, agent, score FROM obstacle_rows WHERE obstacle_id IN ({ids}) ORDER BY obstacle_id, position"):
+                    entities[obstacle_id].rows.append([agent, score])
+                for character_id, kind, text in self.connection.execute(f"SELECT character_id, kind, text FROM character_entries WHERE character_id IN ({ids}) ORDER BY character_id, kind, position"):
+                    entity = entities[character_id]
+                    (entity.aspects if kind == 'aspect' else entity.stunts).append(text)
+        return list(entities.values())
+
+    # Copy every saved/<name>.txt file into the campaign, returning how many were imported
+    def import_txt(self, directory="saved"):
+        entities = TextFileStore(directory).load_entities()
+        self.save_entities(entities)
+        return len(entities)
+
+    # Write every entity of the campaign out as saved/<name>.txt files, returning how many were exported
+    def export_txt(self, directory="saved"):
+        entities = self.load_entities()
+        TextFileStore(directory).save_entities(entities)
+        return len(entities)
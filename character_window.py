@@ -1,33 +1,83 @@
-import os 
-from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QMessageBox, QFileDialog
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, pyqtSlot
-from default_window import DefaultWindow, button_style
+from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QListView, QAbstractItemView, QSpinBox
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from default_window import DefaultWindow, RowRemovalMixin
+from theme import button_style
+from entities import APPROACHES, CharacterEntity
+from fate_dice import OUTCOMES, outcome_odds
+
+# List model over a list of strings, such as a character's aspects or stunts.
+# It edits the entity's list in place, so saving reads exactly what the list shows.
+class EntryListModel(RowRemovalMixin, QAbstractListModel):
+    def __init__(self, entries=None, parent=None):
+        super().__init__(parent)
+        self.entries = entries if entries is not None else []
+
+    # Show a different list of entries
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = entries
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.entries[index.row()]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or self.entries[index.row()] == value:
+            return False
+        self.entries[index.row()] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    # Append many entries with a single notification
+    def append_entries(self, entries):
+        if not entries:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.entries), len(self.entries) + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self.entries):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.entries[row:row + count]
+        self.endRemoveRows()
+        return True
 
 class CharacterWindow(DefaultWindow):
+    entity_class = CharacterEntity
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Character Window')
 
         # Layout for Fate Points and Refresh
         fate_refresh_layout = QHBoxLayout()
-        self.layout.addLayout(fate_refresh_layout)
+        self.body_layout.addLayout(fate_refresh_layout)
         
         # Fate Points input
         fate_refresh_layout.addWidget(QLabel('Fate Points'))
         self.fate_points_input = QLineEdit(self)
-        self.fate_points_input.setText('3')
+        self.bind_line_edit(self.fate_points_input, 'fate_points')
         fate_refresh_layout.addWidget(self.fate_points_input)
         
         # Refresh input
         fate_refresh_layout.addWidget(QLabel('Refresh'))
         self.refresh_input = QLineEdit(self)
-        self.refresh_input.setText('3')
+        self.bind_line_edit(self.refresh_input, 'refresh')
         fate_refresh_layout.addWidget(self.refresh_input)
         
         # Layout for Approaches
         skills_layout = QVBoxLayout()
-        self.layout.addLayout(skills_layout)
+        self.body_layout.addLayout(skills_layout)
         
         # Header for Approaches
         skills_header_layout = QHBoxLayout()
@@ -45,32 +95,59 @@ class CharacterWindow(DefaultWindow):
         skills_layout.addLayout(skills_inputs_layout)
         
         self.careful_input = QLineEdit(self)
-        self.careful_input.setText('0')
+        self.bind_line_edit(self.careful_input, 'careful')
         skills_inputs_layout.addWidget(self.careful_input)
         
         self.clever_input = QLineEdit(self)
-        self.clever_input.setText('0')
+        self.bind_line_edit(self.clever_input, 'clever')
         skills_inputs_layout.addWidget(self.clever_input)
         
         self.flashy_input = QLineEdit(self)
-        self.flashy_input.setText('0')
+        self.bind_line_edit(self.flashy_input, 'flashy')
         skills_inputs_layout.addWidget(self.flashy_input)
         
         self.forceful_input = QLineEdit(self)
-        self.forceful_input.setText('0')
+        self.bind_line_edit(self.forceful_input, 'forceful')
         skills_inputs_layout.addWidget(self.forceful_input)
         
         self.quick_input = QLineEdit(self)
-        self.quick_input.setText('0')
+        self.bind_line_edit(self.quick_input, 'quick')
         skills_inputs_layout.addWidget(self.quick_input)
         
         self.sneaky_input = QLineEdit(self)
-        self.sneaky_input.setText('0')
+        self.bind_line_edit(self.sneaky_input, 'sneaky')
         skills_inputs_layout.addWidget(self.sneaky_input)
         
+        # Odds of each approach, plus a bonus such as a stunt's, against an opposition
+        skills_odds_layout = QHBoxLayout()
+        skills_layout.addLayout(skills_odds_layout)
+        self.odds_labels = {}
+        for approach in APPROACHES:
+            odds_label = QLabel(self)
+            odds_label.setToolTip('Chance in percent to Fail / Tie / Succeed / Succeed with Style')
+            skills_odds_layout.addWidget(odds_label, 1)
+            self.odds_labels[approach] = odds_label
+            getattr(self, f'{approach}_input').textChanged.connect(lambda text, approach=approach: self.update_odds(approach))
+        
+        odds_settings_layout = QHBoxLayout()
+        skills_layout.addLayout(odds_settings_layout)
+        odds_settings_layout.addWidget(QLabel('Odds with bonus'))
+        self.bonus_input = QSpinBox(self)
+        self.bonus_input.setRange(-10, 10)
+        self.bonus_input.valueChanged.connect(self.update_all_odds)
+        odds_settings_layout.addWidget(self.bonus_input)
+        odds_settings_layout.addWidget(QLabel('against opposition'))
+        self.opposition_input = QSpinBox(self)
+        self.opposition_input.setRange(-10, 20)
+        self.opposition_input.setValue(2)
+        self.opposition_input.valueChanged.connect(self.update_all_odds)
+        odds_settings_layout.addWidget(self.opposition_input)
+        odds_settings_layout.addStretch()
+        self.update_all_odds()
+        
         # Layout for Aspects
         aspects_layout = QVBoxLayout()
-        self.layout.addLayout(aspects_layout)
+        self.body_layout.addLayout(aspects_layout)
         
         aspects_layout.addWidget(QLabel('Aspects:'))
         
@@ -79,6 +156,7 @@ class CharacterWindow(DefaultWindow):
         aspects_layout.addLayout(high_concept_layout)
         high_concept_layout.addWidget(QLabel('High Concept'))
         self.high_concept_input = QLineEdit(self)
+        self.bind_line_edit(self.high_concept_input, 'high_concept')
         high_concept_layout.addWidget(self.high_concept_input)
         
         # Trouble input
@@ -86,219 +164,125 @@ class CharacterWindow(DefaultWindow):
         aspects_layout.addLayout(trouble_layout)
         trouble_layout.addWidget(QLabel('Trouble'))
         self.trouble_input = QLineEdit(self)
+        self.bind_line_edit(self.trouble_input, 'trouble')
         trouble_layout.addWidget(self.trouble_input)
 
-        # Additional Aspects
-        self.aspects_list_layout = QVBoxLayout()
-        aspects_layout.addLayout(self.aspects_list_layout)
-        
-        # Button to add a new aspect
+        # Additional Aspects, shown in one editable list over the entity's aspects
+        self.aspects_model = EntryListModel(self.entity.aspects, self)
+        self.aspects_view = self.create_list_view(self.aspects_model)
+        aspects_layout.addWidget(self.aspects_view)
+        
+        # Buttons to add a new aspect and remove the selected ones
+        aspect_buttons_layout = QHBoxLayout()
+        aspects_layout.addLayout(aspect_buttons_layout)
         self.add_aspect_button = QPushButton('New Aspect', self)
         button_style(self.add_aspect_button)
         self.add_aspect_button.clicked.connect(self.add_aspect)
-        aspects_layout.addWidget(self.add_aspect_button)
+        aspect_buttons_layout.addWidget(self.add_aspect_button)
+        self.remove_aspect_button = QPushButton('Remove Aspect', self)
+        button_style(self.remove_aspect_button)
+        self.remove_aspect_button.clicked.connect(lambda: self.remove_selected(self.aspects_view))
+        aspect_buttons_layout.addWidget(self.remove_aspect_button)
         
         # Layout for Stunts
         stunts_layout = QVBoxLayout()
-        self.layout.addLayout(stunts_layout)
+        self.body_layout.addLayout(stunts_layout)
         
         stunts_layout.addWidget(QLabel('Stunts:'))
         
-        # List of Stunts
-        self.stunts_list_layout = QVBoxLayout()
-        stunts_layout.addLayout(self.stunts_list_layout)
+        # List of Stunts, shown in one editable list over the entity's stunts
+        self.stunts_model = EntryListModel(self.entity.stunts, self)
+        self.stunts_view = self.create_list_view(self.stunts_model)
+        stunts_layout.addWidget(self.stunts_view)
         
-        # Button to add a new stunt
+        # Buttons to add a new stunt and remove the selected ones
+        stunt_buttons_layout = QHBoxLayout()
+        stunts_layout.addLayout(stunt_buttons_layout)
         self.add_stunt_button = QPushButton('New Stunt', self)
         button_style(self.add_stunt_button)
         self.add_stunt_button.clicked.connect(self.add_stunt)
-        stunts_layout.addWidget(self.add_stunt_button)
-        
-        # Re-add the toggle button and notes/image layout
-        self.notes_toggle_button.setParent(None)
-        self.notes_image_layout.setParent(None)
-
-        self.layout.addWidget(self.notes_toggle_button)
-        self.layout.addLayout(self.notes_image_layout)
-
-        # Show the notes and image by default
-        self.notes_input.setVisible(True)
-        self.image_label.setVisible(True)
-        self.choose_image_button.setVisible(True)
-        self.notes_toggle_button.setText('Hide Notes and Image')
+        stunt_buttons_layout.addWidget(self.add_stunt_button)
+        self.remove_stunt_button = QPushButton('Remove Stunt', self)
+        button_style(self.remove_stunt_button)
+        self.remove_stunt_button.clicked.connect(lambda: self.remove_selected(self.stunts_view))
+        stunt_buttons_layout.addWidget(self.remove_stunt_button)
 
-    # Add a new aspect
+    # Add a new aspect and start editing it
     def add_aspect(self):
-        aspect_layout = QHBoxLayout()
-        
-        aspect_input = QLineEdit(self)
-        aspect_layout.addWidget(aspect_input)
-        
-        remove_button = QPushButton('Remove', self)
-        button_style(remove_button)
-        remove_button.clicked.connect(lambda: self.remove_aspect(aspect_layout))
-        aspect_layout.addWidget(remove_button)
-        
-        self.aspects_list_layout.addLayout(aspect_layout)
+        self.add_aspect_with_text("")
+        self.edit_last(self.aspects_view)
     
     # Remove an aspect
-    def remove_aspect(self, aspect_layout):
-        for i in reversed(range(aspect_layout.count())):
-            widget = aspect_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        self.aspects_list_layout.removeItem(aspect_layout)
+    def remove_aspect(self, row):
+        self.aspects_model.removeRows(row, 1)
     
-    # Add a new stunt
+    # Add a new stunt and start editing it
     def add_stunt(self):
-        stunt_layout = QHBoxLayout()
-        
-        stunt_input = QLineEdit(self)
-        stunt_layout.addWidget(stunt_input)
-        
-        remove_button = QPushButton('Remove', self)
-        button_style(remove_button)
-        remove_button.clicked.connect(lambda: self.remove_stunt(stunt_layout))
-        stunt_layout.addWidget(remove_button)
-        
-        self.stunts_list_layout.addLayout(stunt_layout)
+        self.add_stunt_with_text("")
+        self.edit_last(self.stunts_view)
     
     # Remove a stunt
-    def remove_stunt(self, stunt_layout):
-        for i in reversed(range(stunt_layout.count())):
-            widget = stunt_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        self.stunts_list_layout.removeItem(stunt_layout)
-
-    # Toggle visibility of notes and image section
-    def toggle_notes(self):
-        visible = not self.notes_input.isVisible()
-        self.notes_input.setVisible(visible)
-        self.image_label.setVisible(visible)
-        self.choose_image_button.setVisible(visible)
-        self.notes_toggle_button.setText('Hide Notes and Image' if visible else 'Show Notes and Image')
+    def remove_stunt(self, row):
+        self.stunts_model.removeRows(row, 1)
 
-    # Choose an image
-    @pyqtSlot()
-    def choose_image(self):
-        options = QFileDialog.Options()
-        options |= QFileDialog.DontUseNativeDialog
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "pictures", "Image Files (*.png *.jpg *.bmp);;All Files (*)", options=options)
-        if file_path:
-            self.image_path = file_path
-            pixmap = QPixmap(file_path)
-            self.image_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
-
-    # Save contents to a file
-    def save_contents(self, suppress_message=False):
-        name = self.name_input.text()
-        if not name:
-            QMessageBox.warning(self, 'Warning', 'Name cannot be empty!')
+    # Fill the widgets from the character
+    def show_entity(self, entity):
+        super().show_entity(entity)
+        self.fate_points_input.setText(entity.fate_points)
+        self.refresh_input.setText(entity.refresh)
+        self.careful_input.setText(entity.careful)
+        self.clever_input.setText(entity.clever)
+        self.flashy_input.setText(entity.flashy)
+        self.forceful_input.setText(entity.forceful)
+        self.quick_input.setText(entity.quick)
+        self.sneaky_input.setText(entity.sneaky)
+        self.high_concept_input.setText(entity.high_concept)
+        self.trouble_input.setText(entity.trouble)
+        
+        self.aspects_model.set_entries(entity.aspects)
+        self.stunts_model.set_entries(entity.stunts)
+    
+    # Show the odds of an approach as Fail/Tie/Succeed/Succeed with Style percentages
+    def update_odds(self, approach):
+        try:
+            modifier = int(getattr(self.entity, approach)) + self.bonus_input.value()
+        except ValueError:
+            self.odds_labels[approach].setText('-')
             return
-        
-        os.makedirs("saved", exist_ok=True)
-        file_path = os.path.join("saved", f"{name}.txt")
-        
-        with open(file_path, 'w') as file:
-            file.write(f"WindowType: CharacterWindow\n")
-            file.write(f"Name: {name}\n")
-            file.write(f"Fate Points: {self.fate_points_input.text()}\n")
-            file.write(f"Refresh: {self.refresh_input.text()}\n")
-            file.write(f"Careful: {self.careful_input.text()}\n")
-            file.write(f"Clever: {self.clever_input.text()}\n")
-            file.write(f"Flashy: {self.flashy_input.text()}\n")
-            file.write(f"Forceful: {self.forceful_input.text()}\n")
-            file.write(f"Quick: {self.quick_input.text()}\n")
-            file.write(f"Sneaky: {self.sneaky_input.text()}\n")
-            
-            file.write(f"High Concept: {self.high_concept_input.text()}\n")
-            file.write(f"Trouble: {self.trouble_input.text()}\n")
-            
-            for i in range(self.aspects_list_layout.count()):
-                aspect_layout = self.aspects_list_layout.itemAt(i).layout()
-                if aspect_layout:
-                    aspect_input = aspect_layout.itemAt(0).widget()
-                    file.write(f"Aspect: {aspect_input.text()}\n")
-            
-            for i in range(self.stunts_list_layout.count()):
-                stunt_layout = self.stunts_list_layout.itemAt(i).layout()
-                if stunt_layout:
-                    stunt_input = stunt_layout.itemAt(0).widget()
-                    file.write(f"Stunt: {stunt_input.text()}\n")
+        odds = outcome_odds(modifier, self.opposition_input.value())
+        self.odds_labels[approach].setText('/'.join(f'{float(odds[outcome]) * 100:.0f}' for outcome in OUTCOMES))
 
-            file.write(f"Notes: {self.notes_input.toPlainText()}\n")
-            file.write(f"ImagePath: {self.image_path}\n")
-        
-        if not suppress_message:
-            QMessageBox.information(self, 'Info', f'Contents saved to {name}.txt')
-
-    # Load contents from a file
-    def load_contents(self, file_path):
-        self.clear_layout(self.aspects_list_layout)
-        self.clear_layout(self.stunts_list_layout)
-        
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-            self.name_input.setText(lines[1].split(": ")[1].strip())
-            self.fate_points_input.setText(lines[2].split(": ")[1].strip())
-            self.refresh_input.setText(lines[3].split(": ")[1].strip())
-            self.careful_input.setText(lines[4].split(": ")[1].strip())
-            self.clever_input.setText(lines[5].split(": ")[1].strip())
-            self.flashy_input.setText(lines[6].split(": ")[1].strip())
-            self.forceful_input.setText(lines[7].split(": ")[1].strip())
-            self.quick_input.setText(lines[8].split(": ")[1].strip())
-            self.sneaky_input.setText(lines[9].split(": ")[1].strip())
-            self.high_concept_input.setText(lines[10].split(": ")[1].strip())
-            self.trouble_input.setText(lines[11].split(": ")[1].strip())
-            
-            for line in lines[12:-2]:
-                if line.startswith("Aspect:"):
-                    aspect_text = line.split(": ")[1].strip()
-                    self.add_aspect_with_text(aspect_text)
-                elif line.startswith("Stunt:"):
-                    stunt_text = line.split(": ")[1].strip()
-                    self.add_stunt_with_text(stunt_text)
+    # Show the odds of every approach, after the bonus or the opposition changed
+    def update_all_odds(self):
+        for approach in APPROACHES:
+            self.update_odds(approach)
 
-            self.notes_input.setPlainText(lines[-2].split(": ", 1)[1].strip())
-            self.image_path = lines[-1].split(": ", 1)[1].strip()
-            if self.image_path:
-                pixmap = QPixmap(self.image_path)
-                self.image_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
-
-    # Clear a layout
-    def clear_layout(self, layout):
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    # Create an editable list view over a model of entries; edits mark the character as changed
+    def create_list_view(self, model):
+        for signal in (model.dataChanged, model.rowsInserted, model.rowsRemoved):
+            signal.connect(self.mark_dirty)
+        view = QListView(self)
+        view.setModel(model)
+        view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        view.setUniformItemSizes(True)
+        return view
     
     # Add an aspect with text
     def add_aspect_with_text(self, text):
-        aspect_layout = QHBoxLayout()
-        
-        aspect_input = QLineEdit(self)
-        aspect_input.setText(text)
-        aspect_layout.addWidget(aspect_input)
-        
-        remove_button = QPushButton('Remove', self)
-        button_style(remove_button)
-        remove_button.clicked.connect(lambda: self.remove_aspect(aspect_layout))
-        aspect_layout.addWidget(remove_button)
-        
-        self.aspects_list_layout.addLayout(aspect_layout)
+        self.aspects_model.append_entries([text])
 
     # Add a stunt with text
     def add_stunt_with_text(self, text):
-        stunt_layout = QHBoxLayout()
-        
-        stunt_input = QLineEdit(self)
-        stunt_input.setText(text)
-        stunt_layout.addWidget(stunt_input)
-        
-        remove_button = QPushButton('Remove', self)
-        button_style(remove_button)
-        remove_button.clicked.connect(lambda: self.remove_stunt(stunt_layout))
-        stunt_layout.addWidget(remove_button)
-        
-        self.stunts_list_layout.addLayout(stunt_layout)
+        self.stunts_model.append_entries([text])
+
+    # Start editing the last entry of a list view
+    def edit_last(self, view):
+        if view.isVisible():
+            index = view.model().index(view.model().rowCount() - 1)
+            view.scrollTo(index)
+            view.edit(index)
+
+    # Remove the entries selected in a list view
+    def remove_selected(self, view):
+        view.model().remove_row_numbers(index.row() for index in view.selectionModel().selectedIndexes())
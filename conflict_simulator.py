@@ -0,0 +1,278 @@
+# Monte Carlo simulator for the scene a zone describes: its characters against its obstacles.
+# Runs headless on the saved entities, spreading the trials over a process pool.
+# Run with: python conflict_simulator.py <zone name> [--mode conflict|challenge] [--trials N] [--workers N] [--seed S]
+import os
+import random
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from entities import APPROACHES, CharacterEntity, ObstacleEntity, ZoneEntity
+from campaign_store import TextFileStore
+from fate_dice import DICE, total_counts
+
+# Every total of 4dF, once per equally likely combination of faces; a roll is one pick from it
+ROLLS = tuple(total for total, count in zip(range(-DICE, DICE + 1), total_counts(DICE)) for _ in range(count))
+
+# Trials below this are not worth starting worker processes for
+MIN_PARALLEL_TRIALS = 2000
+
+# Shifts a character's stress boxes and mild, moderate and severe consequences absorb (Fate Accelerated)
+STRESS_BOXES = (1, 2, 3)
+CONSEQUENCES = (2, 4, 6)
+
+# One side's participant in a simulated scene.
+# Characters act with their best approach; obstacle agents act and resist with their score, and are
+# taken out once they have taken more shifts than their score.
+@dataclass(slots=True)
+class Combatant:
+    name: str
+    skill: int
+    fate_points: int = 0
+    is_character: bool = True
+
+# Convert a whole number field, or use the default if it is not one
+def to_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+# Build the two sides from a zone's member entities: characters, and an agent per obstacle row with a score
+def combatants(entities):
+    characters = []
+    opposition = []
+    for entity in entities:
+        if isinstance(entity, CharacterEntity):
+            skill = max(to_int(getattr(entity, approach)) for approach in APPROACHES)
+            # Fate points are topped up to the refresh at the start of a session
+            fate_points = max(to_int(entity.fate_points), to_int(entity.refresh))
+            characters.append(Combatant(entity.name, skill, fate_points))
+        elif isinstance(entity, ObstacleEntity):
+            for agent, score in entity.rows:
+                if agent.strip() and to_int(score, None) is not None:
+                    opposition.append(Combatant(agent.strip(), int(score), is_character=False))
+    return characters, opposition
+
+# Read a zone and its members from a store and build the two sides
+def load_scene(zone_name, store=None):
+    store = store or TextFileStore()
+    zone = store.load_entity(zone_name)
+    if not isinstance(zone, ZoneEntity):
+        raise ValueError(f"{zone_name} is not a saved zone")
+    return combatants(store.load_entities(zone.members))
+
+# Results of many simulated scenes; reports from different workers add up with merge
+@dataclass(slots=True)
+class SimulationReport:
+    mode: str
+    trials: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    fate_points_spent: int = 0
+    rounds: int = 0
+    round_counts: Counter = field(default_factory=Counter)  # rounds a scene took -> scenes
+
+    # Add the results of another report of the same scene
+    def merge(self, other):
+        self.trials += other.trials
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        self.fate_points_spent += other.fate_points_spent
+        self.rounds += other.rounds
+        self.round_counts.update(other.round_counts)
+
+    def win_rate(self):
+        return self.wins / self.trials if self.trials else 0.0
+
+    def loss_rate(self):
+        return self.losses / self.trials if self.trials else 0.0
+
+    def draw_rate(self):
+        return self.draws / self.trials if self.trials else 0.0
+
+    def mean_fate_points(self):
+        return self.fate_points_spent / self.trials if self.trials else 0.0
+
+    def mean_rounds(self):
+        return self.rounds / self.trials if self.trials else 0.0
+
+    # Smallest round count that at least the given fraction of scenes finished within
+    def rounds_percentile(self, fraction):
+        needed = fraction * self.trials
+        seen = 0
+        for rounds in sorted(self.round_counts):
+            seen += self.round_counts[rounds]
+            if seen >= needed:
+                return rounds
+        return 0
+
+    # Human-readable summary
+    def summary(self):
+        lines = [
+            f"{self.mode}: {self.trials} trials",
+            f"  characters win    {self.win_rate():7.1%}",
+            f"  opposition wins   {self.loss_rate():7.1%}",
+        ]
+        if self.mode == "conflict":
+            lines.append(f"  unresolved        {self.draw_rate():7.1%}")
+        lines += [
+            f"  fate points spent {self.mean_fate_points():7.2f} per scene",
+            f"  rounds            {self.mean_rounds():7.2f} on average, median {self.rounds_percentile(0.5)}, 90% within {self.rounds_percentile(0.9)}",
+        ]
+        return "\n".join(lines)
+
+# Check a free stress box or consequences big enough for a hit; returns False if the character is taken out
+def absorb(shifts, boxes, consequences):
+    for index, value in enumerate(STRESS_BOXES):
+        if not boxes[index] and value >= shifts:
+            boxes[index] = True
+            return True
+    for index, value in enumerate(CONSEQUENCES):
+        if not consequences[index] and value >= shifts:
+            consequences[index] = True
+            return True
+    # Take the biggest free consequence together with the biggest free stress box
+    free_boxes = [index for index in range(len(STRESS_BOXES)) if not boxes[index]]
+    free_consequences = [index for index in range(len(CONSEQUENCES)) if not consequences[index]]
+    if free_boxes and free_consequences and STRESS_BOXES[free_boxes[-1]] + CONSEQUENCES[free_consequences[-1]] >= shifts:
+        boxes[free_boxes[-1]] = True
+        consequences[free_consequences[-1]] = True
+        return True
+    return False
+
+# Simulate one conflict: characters attack, then every standing obstacle agent attacks a character.
+# A character spends a fate point (invoking an aspect for +2) when it turns a miss into a hit, or a hit on them into none.
+# Returns (1 win, -1 loss or 0 unresolved, rounds, fate points spent).
+def run_conflict(characters, opposition, rng, max_rounds):
+    choice = rng.choice
+    fate_points = [character.fate_points for character in characters]
+    boxes = [[False] * len(STRESS_BOXES) for _ in characters]
+    consequences = [[False] * len(CONSEQUENCES) for _ in characters]
+    taken = [0] * len(opposition)
+    standing_characters = list(range(len(characters)))
+    standing_opposition = list(range(len(opposition)))
+    spent = 0
+    for round_number in range(1, max_rounds + 1):
+        for attacker in list(standing_characters):
+            if not standing_opposition:
+                break
+            target = choice(standing_opposition)
+            shifts = choice(ROLLS) + characters[attacker].skill - choice(ROLLS) - opposition[target].skill
+            if -2 < shifts <= 0 and fate_points[attacker]:
+                fate_points[attacker] -= 1
+                spent += 1
+                shifts += 2
+            if shifts > 0:
+                taken[target] += shifts
+                if taken[target] > opposition[target].skill:
+                    standing_opposition.remove(target)
+        if not standing_opposition:
+            return 1, round_number, spent
+        for attacker in standing_opposition:
+            if not standing_characters:
+                break
+            target = choice(standing_characters)
+            shifts = choice(ROLLS) + opposition[attacker].skill - choice(ROLLS) - characters[target].skill
+            if 1 <= shifts <= 2 and fate_points[target]:
+                fate_points[target] -= 1
+                spent += 1
+                shifts -= 2
+            if shifts > 0 and not absorb(shifts, boxes[target], consequences[target]):
+                standing_characters.remove(target)
+        if not standing_characters:
+            return -1, round_number, spent
+    return 0, max_rounds, spent
+
+# Simulate one challenge: every obstacle agent is a task overcome against its score.
+# Each round every character takes on one open task, the most skilled the hardest; a tie overcomes it at a cost.
+# Returns (1 if every task was overcome, -1 if not within max_rounds, rounds, fate points spent).
+def run_challenge(characters, opposition, rng, max_rounds):
+    choice = rng.choice
+    fate_points = [character.fate_points for character in characters]
+    actors = sorted(range(len(characters)), key=lambda index: -characters[index].skill)
+    tasks = sorted((agent.skill for agent in opposition), reverse=True)
+    spent = 0
+    if not tasks:
+        return 1, 0, 0
+    for round_number in range(1, max_rounds + 1):
+        remaining = []
+        for index, difficulty in enumerate(tasks):
+            if index >= len(actors):
+                remaining.append(difficulty)
+                continue
+            actor = actors[index]
+            shifts = choice(ROLLS) + characters[actor].skill - difficulty
+            if -2 <= shifts < 0 and fate_points[actor]:
+                fate_points[actor] -= 1
+                spent += 1
+                shifts += 2
+            if shifts < 0:
+                remaining.append(difficulty)
+        tasks = remaining
+        if not tasks:
+            return 1, round_number, spent
+    return -1, max_rounds, spent
+
+SCENES = {"conflict": run_conflict, "challenge": run_challenge}
+
+# Run some of the trials in this process
+def simulate_chunk(mode, characters, opposition, trials, seed, max_rounds):
+    run_scene = SCENES[mode]
+    rng = random.Random(seed)
+    report = SimulationReport(mode)
+    for _ in range(trials):
+        result, rounds, spent = run_scene(characters, opposition, rng, max_rounds) if characters else (-1, 0, 0)
+        report.trials += 1
+        if result > 0:
+            report.wins += 1
+        elif result < 0:
+            report.losses += 1
+        else:
+            report.draws += 1
+        report.fate_points_spent += spent
+        report.rounds += rounds
+        report.round_counts[rounds] += 1
+    return report
+
+# Simulate a scene many times, split into chunks over a pool of worker processes (one per core by default).
+# Chunks get their own seeds from the given seed, so a seeded run repeats exactly with the same number of workers.
+def simulate(characters, opposition, trials=10000, mode="conflict", workers=None, seed=None, max_rounds=20):
+    if mode not in SCENES:
+        raise ValueError(f"Unknown mode {mode}, expected one of {', '.join(SCENES)}")
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed)
+    if workers == 1 or trials < MIN_PARALLEL_TRIALS:
+        return simulate_chunk(mode, characters, opposition, trials, seeds.getrandbits(64), max_rounds)
+    chunk_count = workers * 4
+    chunk_sizes = [trials // chunk_count + (1 if index < trials % chunk_count else 0) for index in range(chunk_count)]
+    report = SimulationReport(mode)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(simulate_chunk, mode, characters, opposition, size, seeds.getrandbits(64), max_rounds) for size in chunk_sizes if size]
+        for future in futures:
+            report.merge(future.result())
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the scene a saved zone describes.")
+    parser.add_argument("zone", help="name of a zone saved in the saved/ directory")
+    parser.add_argument("--mode", choices=sorted(SCENES), default="conflict")
+    parser.add_argument("--trials", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-rounds", type=int, default=20)
+    parser.add_argument("--saved", default="saved", help="directory of saved entities")
+    args = parser.parse_args()
+
+    try:
+        characters, opposition = load_scene(args.zone, TextFileStore(args.saved))
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    print(f"{len(characters)} characters against {len(opposition)} opposing agents")
+    report = simulate(characters, opposition, args.trials, args.mode, args.workers, args.seed, args.max_rounds)
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,50 @@
-import os
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QMessageBox, QTextEdit, QLabel, QFileDialog
-from PyQt5.QtCore import pyqtSlot, Qt
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import pyqtSlot, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage
+from entities import DefaultEntity
+from campaign_store import TextFileStore
+from thumbnail_cache import ThumbnailCache
+from theme import button_style
 
-# Apply a consistent button style
-def button_style(button):
-    button.setStyleSheet("background-color: #888888; color: white;")
+# Mixin for the editors' item models: removes scattered rows through the model's removeRows,
+# one notification per contiguous run, last run first so earlier row numbers stay valid
+class RowRemovalMixin:
+    def remove_row_numbers(self, row_numbers):
+        rows = sorted(set(row_numbers), reverse=True)
+        run_start = 0
+        for position in range(1, len(rows) + 1):
+            if position == len(rows) or rows[position] != rows[position - 1] - 1:
+                self.removeRows(rows[position - 1], position - run_start)
+                run_start = position
 
 class DefaultWindow(QWidget):
+    # Sent whenever the entity is edited
+    edited = pyqtSignal()
+
+    # Entity type the window edits
+    entity_class = DefaultEntity
+
+    # Where every window saves and loads entities; replaced when a campaign database is opened
+    store = TextFileStore()
+    
+    # Image thumbnails shared by every window
+    thumbnails = ThumbnailCache()
+    
+    # Background writer used for saves when the main window provides one
+    save_pipeline = None
+    
+    # Background thumbnail decoder used when the main window provides one
+    thumbnail_loader = None
+
     def __init__(self):
         super().__init__()
         
+        # Data shown by the window; widgets write their edits straight into it
+        self.entity = self.entity_class()
+        
+        # Whether the entity has edits that were not saved yet; new windows have never been saved
+        self.dirty = True
+        
         self.setWindowTitle('Default Window')
         self.setGeometry(100, 100, 400, 200)
         
@@ -22,9 +56,14 @@ class DefaultWindow(QWidget):
         self.name_layout = QHBoxLayout()
         self.layout.addLayout(self.name_layout)
         
+        # Layout subclasses fill with their own widgets, above the notes and image section
+        self.body_layout = QVBoxLayout()
+        self.layout.addLayout(self.body_layout)
+        
         # Name input field
         self.name_input = QLineEdit(self)
         self.name_input.setPlaceholderText('Name')
+        self.bind_line_edit(self.name_input, 'name')
         self.name_layout.addWidget(self.name_input)
         
         # Save button
@@ -39,13 +78,60 @@ class DefaultWindow(QWidget):
         self.notes_toggle_button.clicked.connect(self.toggle_notes)
         self.layout.addWidget(self.notes_toggle_button)
         
-        # Layout for notes and image section
+        # Layout for notes and image section.
+        # Its widgets are built the first time it is shown, on toggle or for an entity with notes or an image.
         self.notes_image_layout = QHBoxLayout()
-        
+        self.layout.addLayout(self.notes_image_layout)
+        self.notes_input = None
+        self.image_label = None
+        self.choose_image_button = None
+
+    # Return to the state of a newly built window, for reuse from the window pool
+    def reset(self):
+        self.set_entity(self.entity_class())
+        self.set_notes_visible(False)
+        self.dirty = True
+
+    # Show an entity field in a line edit and keep the field updated from it
+    def bind_line_edit(self, line_edit, field):
+        line_edit.setText(getattr(self.entity, field))
+        line_edit.textChanged.connect(lambda text: self.set_field(field, text))
+
+    # Store an edited entity field
+    def set_field(self, field, value):
+        setattr(self.entity, field, value)
+        self.mark_dirty()
+
+    # Flag the entity as edited since it was last saved or loaded
+    def mark_dirty(self):
+        self.dirty = True
+        self.edited.emit()
+
+    # Show the given entity in the window; it starts out clean.
+    # A thumbnail the caller already has saves looking the image up again.
+    def set_entity(self, entity, thumbnail=None):
+        self.entity = entity
+        self.show_entity(entity)
+        self.show_image(entity.image_path, thumbnail)
+        self.dirty = False
+
+    # Fill the widgets from the entity
+    def show_entity(self, entity):
+        self.name_input.setText(entity.name)
+        if self.notes_input is None and (entity.notes or entity.image_path):
+            self.set_notes_visible(True)
+        elif self.notes_input is not None:
+            self.notes_input.setPlainText(entity.notes)
+            # A window reused from the pool may have the panel hidden from its last entity
+            self.set_notes_visible(bool(entity.notes or entity.image_path))
+
+    # Build the notes and image widgets and fill them from the entity
+    def build_notes_panel(self):
         # Notes input field
         self.notes_input = QTextEdit(self)
         self.notes_input.setPlaceholderText('Notes')
-        self.notes_input.setVisible(False)  # Initially hidden
+        self.notes_input.setPlainText(self.entity.notes)
+        self.notes_input.textChanged.connect(lambda: self.set_field('notes', self.notes_input.toPlainText()))
         self.notes_image_layout.addWidget(self.notes_input)
 
         # Layout for image and button
@@ -53,30 +139,57 @@ class DefaultWindow(QWidget):
         
         # Image label
         self.image_label = QLabel(self)
-        self.image_label.setVisible(False)  # Initially hidden
         self.image_button_layout.addWidget(self.image_label)
 
         # Button to choose an image
         self.choose_image_button = QPushButton('Choose Image', self)
         button_style(self.choose_image_button)
         self.choose_image_button.clicked.connect(self.choose_image)
-        self.choose_image_button.setVisible(False)  # Initially hidden
         self.image_button_layout.addWidget(self.choose_image_button)
         
         # Add image button layout to the notes and image layout
         self.notes_image_layout.addLayout(self.image_button_layout)
-        self.layout.addLayout(self.notes_image_layout)
+        self.show_image(self.entity.image_path)
 
-        # Path to the selected image
-        self.image_path = ""
-
-    # Toggle visibility of notes and image section
-    def toggle_notes(self):
-        visible = not self.notes_input.isVisible()
+    # Show or hide the notes and image section, building it on first use
+    def set_notes_visible(self, visible):
+        if self.notes_input is None:
+            if not visible:
+                return
+            self.build_notes_panel()
         self.notes_input.setVisible(visible)
         self.image_label.setVisible(visible)
         self.choose_image_button.setVisible(visible)
         self.notes_toggle_button.setText('Hide Notes and Image' if visible else 'Show Notes and Image')
+
+    # Show the image at the given path, if any, from the shared thumbnail cache.
+    # Thumbnails that are not in memory yet are decoded in the background; a placeholder shows meanwhile.
+    # Nothing is decoded until the notes and image section has been built.
+    def show_image(self, image_path, thumbnail=None):
+        if self.image_label is None:
+            return
+        if thumbnail is None and image_path:
+            thumbnail = self.thumbnails.peek(image_path)
+            if thumbnail is None and self.thumbnail_loader is not None:
+                self.image_label.setText('Loading image...')
+                self.thumbnail_loader.request(image_path, self.image_loaded)
+                return
+            if thumbnail is None:
+                thumbnail = self.thumbnails.get(image_path)
+        if thumbnail is not None and not thumbnail.isNull():
+            self.image_label.setPixmap(QPixmap.fromImage(thumbnail))
+        else:
+            self.image_label.clear()
+
+    # Swap in a thumbnail decoded in the background, unless the entity's image changed meanwhile
+    @pyqtSlot(str, QImage)
+    def image_loaded(self, image_path, thumbnail):
+        if image_path == self.entity.image_path:
+            self.show_image(image_path, thumbnail)
+
+    # Toggle visibility of notes and image section
+    def toggle_notes(self):
+        self.set_notes_visible(self.notes_input is None or not self.notes_input.isVisibleTo(self))
         
     # Slot to choose an image
     @pyqtSlot()
@@ -85,36 +198,30 @@ class DefaultWindow(QWidget):
         options |= QFileDialog.DontUseNativeDialog
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "pictures", "Image Files (*.png *.jpg *.bmp);;All Files (*)", options=options)
         if file_path:
-            self.image_path = file_path
-            pixmap = QPixmap(file_path)
-            self.image_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+            self.set_field('image_path', file_path)
+            self.show_image(file_path)
     
     # Slot to save contents to a file
     @pyqtSlot()
     def save_contents(self, suppress_message=False):
-        name = self.name_input.text()
+        name = self.entity.name
         if not name:
             QMessageBox.warning(self, 'Warning', 'Name cannot be empty!')
             return
         
-        os.makedirs("saved", exist_ok=True)
-        file_path = os.path.join("saved", f"{name}.txt")
+        if self.save_pipeline is not None:
+            # The main window reports completion and errors in its status bar
+            self.save_pipeline.save([self.entity], self.store)
+            self.dirty = False
+            return
         
-        with open(file_path, 'w') as file:
-            file.write(f"Name: {name}\n")
-            file.write(f"Notes: {self.notes_input.toPlainText()}\n")
-            file.write(f"ImagePath: {self.image_path}\n")
+        self.store.save_entities([self.entity])
+        self.dirty = False
         
         if not suppress_message:
-            QMessageBox.information(self, 'Info', f'Contents saved to {name}.txt')
+            QMessageBox.information(self, 'Info', f'Contents saved to {self.store.location(name)}')
     
     # Load contents from a file
     def load_contents(self, file_path):
         with open(file_path, 'r') as file:
-            lines = file.readlines()
-            self.name_input.setText(lines[0].split(": ")[1].strip())
-            self.notes_input.setPlainText(lines[1].split(": ", 1)[1].strip())
-            self.image_path = lines[2].split(": ", 1)[1].strip()
-            if self.image_path:
-                pixmap = QPixmap(self.image_path)
-                self.image_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+            self.set_entity(self.entity_class.from_lines(file.read().splitlines()))
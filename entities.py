@@ -0,0 +1,189 @@
+import os
+import copy
+import threading
+from dataclasses import dataclass, field
+
+# The six Fate Accelerated approaches, in the order they are saved
+APPROACHES = ('careful', 'clever', 'flashy', 'forceful', 'quick', 'sneaky')
+
+# Get the value of a "Label: value" line
+def line_value(line):
+    return line.partition(": ")[2].strip()
+
+# Plain records holding the data behind each window type.
+# They know the saved .txt layout, so they can be read and written without any widgets.
+# slots=True needs Python 3.10 or newer (see readme.md).
+@dataclass(slots=True)
+class DefaultEntity:
+    window_type = "DefaultWindow"
+
+    name: str = ""
+    notes: str = ""
+    image_path: str = ""
+
+    # Lines written before the body
+    def header_lines(self):
+        return [f"Name: {self.name}"]
+
+    # Read the header and return how many lines it used
+    def read_header(self, lines):
+        self.name = line_value(lines[0])
+        return 1
+
+    # Lines written between the header and the notes
+    def body_lines(self):
+        return []
+
+    # Read the lines between the header and the notes
+    def read_body(self, lines):
+        pass
+
+    # Serialize to the saved .txt layout
+    def to_lines(self):
+        return self.header_lines() + self.body_lines() + [f"Notes: {self.notes}", f"ImagePath: {self.image_path}"]
+
+    def to_text(self):
+        return "\n".join(self.to_lines()) + "\n"
+
+    # Parse the saved .txt layout
+    @classmethod
+    def from_lines(cls, lines):
+        entity = cls()
+        body_start = entity.read_header(lines)
+        body_end = len(lines)
+        if body_end > body_start and lines[-1].startswith("ImagePath:"):
+            body_end -= 1
+            entity.image_path = line_value(lines[-1])
+        notes_start = next((i for i in range(body_start, body_end) if lines[i].startswith("Notes:")), body_end)
+        entity.read_body(lines[body_start:notes_start])
+        if notes_start < body_end:
+            # Notes may span several lines
+            notes = [lines[notes_start].partition(": ")[2]] + lines[notes_start + 1:body_end]
+            entity.notes = "\n".join(notes).strip()
+        return entity
+
+    # Independent copy, safe to hand to another thread
+    def copy(self):
+        return copy.deepcopy(self)
+
+@dataclass(slots=True)
+class CharacterEntity(DefaultEntity):
+    window_type = "CharacterWindow"
+
+    fate_points: str = "3"
+    refresh: str = "3"
+    careful: str = "0"
+    clever: str = "0"
+    flashy: str = "0"
+    forceful: str = "0"
+    quick: str = "0"
+    sneaky: str = "0"
+    high_concept: str = ""
+    trouble: str = ""
+    aspects: list = field(default_factory=list)
+    stunts: list = field(default_factory=list)
+
+    def header_lines(self):
+        lines = [f"WindowType: {self.window_type}", f"Name: {self.name}", f"Fate Points: {self.fate_points}", f"Refresh: {self.refresh}"]
+        lines += [f"{approach.capitalize()}: {getattr(self, approach)}" for approach in APPROACHES]
+        lines += [f"High Concept: {self.high_concept}", f"Trouble: {self.trouble}"]
+        return lines
+
+    def read_header(self, lines):
+        values = [line_value(line) for line in lines[1:12]]
+        self.name, self.fate_points, self.refresh = values[0:3]
+        for approach, value in zip(APPROACHES, values[3:9]):
+            setattr(self, approach, value)
+        self.high_concept, self.trouble = values[9:11]
+        return 12
+
+    def body_lines(self):
+        return [f"Aspect: {aspect}" for aspect in self.aspects] + [f"Stunt: {stunt}" for stunt in self.stunts]
+
+    def read_body(self, lines):
+        for line in lines:
+            if line.startswith("Aspect:"):
+                self.aspects.append(line_value(line))
+            elif line.startswith("Stunt:"):
+                self.stunts.append(line_value(line))
+
+@dataclass(slots=True)
+class ObstacleEntity(DefaultEntity):
+    window_type = "ObstacleWindow"
+
+    # [agent, score] pairs
+    rows: list = field(default_factory=list)
+
+    def header_lines(self):
+        return [f"WindowType: {self.window_type}", f"Name: {self.name}"]
+
+    def read_header(self, lines):
+        self.name = line_value(lines[1])
+        return 2
+
+    def body_lines(self):
+        return [f"{agent}:{score}" for agent, score in self.rows]
+
+    def read_body(self, lines):
+        for line in lines:
+            if line.strip():
+                agent, _, score = line.strip().rpartition(':')
+                self.rows.append([agent, score])
+
+@dataclass(slots=True)
+class ZoneEntity(DefaultEntity):
+    window_type = "ZoneWindow"
+
+    # Names of the windows in the zone
+    members: list = field(default_factory=list)
+
+    def header_lines(self):
+        return [f"WindowType: {self.window_type}", f"Name: {self.name}"]
+
+    def read_header(self, lines):
+        self.name = line_value(lines[1])
+        return 2
+
+    def body_lines(self):
+        return list(self.members)
+
+    def read_body(self, lines):
+        self.members.extend(line.strip() for line in lines if line.strip())
+
+ENTITY_TYPES = {entity_class.window_type: entity_class for entity_class in (DefaultEntity, CharacterEntity, ObstacleEntity, ZoneEntity)}
+
+# Parse saved lines into the matching entity type
+def entity_from_lines(lines):
+    if lines and lines[0].startswith("WindowType:"):
+        return ENTITY_TYPES.get(line_value(lines[0]), DefaultEntity).from_lines(lines)
+    return DefaultEntity.from_lines(lines)
+
+# Read a saved .txt file into the matching entity type
+def read_entity(file_path):
+    with open(file_path, 'r') as file:
+        return entity_from_lines(file.read().splitlines())
+
+# Write a file atomically: a crash leaves either the old or the new file, never a truncated one.
+# write fills a temporary file next to the target, which then replaces it unless write returned False.
+def write_atomic(file_path, write):
+    temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if write(temp_path) is not False:
+            os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+# Write text to a file atomically; with sync it is also on disk before the file is replaced
+def write_text_atomic(file_path, text, sync=False):
+    def write(temp_path):
+        with open(temp_path, 'w') as file:
+            file.write(text)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+    write_atomic(file_path, write)
+
+# Write an entity to a .txt file atomically
+def write_entity(entity, file_path):
+    write_text_atomic(file_path, entity.to_text(), sync=True)
@@ -0,0 +1,78 @@
+from fractions import Fraction
+from functools import lru_cache
+
+# Dice rolled for an action: four Fate dice, each showing -1, 0 or +1
+DICE = 4
+
+# Outcomes of an action, from fewest to most shifts
+FAIL = "Fail"
+TIE = "Tie"
+SUCCEED = "Succeed"
+SUCCEED_WITH_STYLE = "Succeed with Style"
+OUTCOMES = (FAIL, TIE, SUCCEED, SUCCEED_WITH_STYLE)
+
+# Outcome of an action that beat the opposition by the given number of shifts
+def outcome(shifts):
+    if shifts < 0:
+        return FAIL
+    if shifts == 0:
+        return TIE
+    if shifts < 3:
+        return SUCCEED
+    return SUCCEED_WITH_STYLE
+
+# Number of ways to roll each total of the dice, from -dice to +dice.
+# Built by convolving the faces of one die at a time: 1 1 1, then 1 2 3 2 1, ...
+@lru_cache(maxsize=None)
+def total_counts(dice=DICE):
+    counts = (1,)
+    for _ in range(dice):
+        convolved = [0] * (len(counts) + 2)
+        for total, count in enumerate(counts):
+            for face in range(3):
+                convolved[total + face] += count
+        counts = tuple(convolved)
+    return counts
+
+# Exact distribution of the dice plus a modifier, as {result: probability}, cached per modifier
+@lru_cache(maxsize=None)
+def distribution(modifier=0, dice=DICE):
+    rolls = 3 ** dice
+    return {total - dice + modifier: Fraction(count, rolls) for total, count in enumerate(total_counts(dice))}
+
+# Exact probability of each outcome for an approach plus bonus (the modifier) against an opposition
+def outcome_odds(modifier, opposition=0, dice=DICE):
+    return shift_odds(modifier - opposition, dice)
+
+# Outcome probabilities depend only on how far the modifier is above the opposition
+@lru_cache(maxsize=None)
+def shift_odds(advantage, dice=DICE):
+    odds = dict.fromkeys(OUTCOMES, Fraction(0))
+    for result, probability in distribution(advantage, dice).items():
+        odds[outcome(result)] += probability
+    return odds
+
+# Every total of the dice, once per equally likely combination of faces
+@lru_cache(maxsize=None)
+def roll_table(dice=DICE):
+    import numpy as np
+    table = np.repeat(np.arange(-dice, dice + 1, dtype=np.int16), total_counts(dice))
+    table.flags.writeable = False
+    return table
+
+# Roll the dice count times at once and return the results plus the modifier as a NumPy array.
+# Each roll draws one of the 3**dice face combinations and looks its total up, so there is one random
+# number per roll rather than one per die. NumPy is only imported when rolling.
+def roll(count, modifier=0, dice=DICE, rng=None):
+    import numpy as np
+    rng = rng if rng is not None else np.random.default_rng()
+    table = roll_table(dice) + np.int16(modifier)
+    return table[rng.integers(0, len(table), size=count, dtype=np.uint8 if len(table) <= 256 else np.int64)]
+
+# Roll an action count times against an opposition and count each outcome
+def roll_outcomes(count, modifier, opposition=0, dice=DICE, rng=None):
+    import numpy as np
+    shifts = roll(count, modifier - opposition, dice, rng)
+    # 0 for shifts below 0, 1 for 0, 2 for 1 and 2, 3 for 3 and more
+    outcome_indexes = np.searchsorted(np.array([0, 1, 3], dtype=np.int16), shifts, side='right')
+    return dict(zip(OUTCOMES, np.bincount(outcome_indexes, minlength=len(OUTCOMES)).tolist()))
@@ -1,10 +1,37 @@
 # %% 
 import sys
+import time
+started = time.perf_counter()
 from PyQt5.QtWidgets import QApplication
-from main_window import MainWindow
+from startup_profile import StartupProfile
+
+# Run with --profile-startup to print how long each phase takes up to the first paint
+profile = StartupProfile("--profile-startup" in sys.argv, started)
+profile.mark("import Qt")
 
 app = QApplication(sys.argv)
+# Names the directory the session and caches are kept in
+app.setApplicationName("Welcome to Mars")
+profile.mark("create application")
+
+# Window types are imported when a window of that type is first opened
+from main_window import MainWindow
+from theme import DEFAULT_THEME, apply_theme
+profile.mark("import main window")
+
+apply_theme(DEFAULT_THEME, app)
+profile.mark("apply theme")
+
 mainWin = MainWindow()
+profile.mark("build main window")
+
 mainWin.show()
+profile.mark("show")
+
+# The last session is restored only once the empty main window is on screen.
+# Run with --no-restore to start with an empty workspace this time.
+if "--no-restore" not in sys.argv:
+    profile.first_paint.connect(mainWin.restore_session)
+profile.watch(mainWin)
 sys.exit(app.exec_())
 # %%
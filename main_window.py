@@ -1,63 +1,277 @@
 import os
-from PyQt5.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QAction, QMdiArea, QMdiSubWindow, QWidget
-from PyQt5.QtCore import Qt, QTimer, QPoint
-from PyQt5.QtGui import QPainter, QPen, QColor
+import time
+import importlib
+from dataclasses import dataclass, field
+from PyQt5.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QInputDialog, QAction, QMdiArea, QMdiSubWindow, QWidget, QProgressBar, QActionGroup, QDockWidget, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout
+from PyQt5.QtCore import Qt, QEvent, QEventLoop, QCoreApplication, QPoint, QPointF, QRect, QLineF, QTimer, QThreadPool
+from PyQt5.QtGui import QPainter, QPainterPath, QPen, QColor, QRegion
 from default_window import DefaultWindow
-from character_window import CharacterWindow
-from obstacle_window import ObstacleWindow
-from zone_window import ZoneWindow
+from placeholder_window import PlaceholderWindow
+from campaign_list import UnopenedEntities, CampaignListDock
+from entities import CharacterEntity, ObstacleEntity, ZoneEntity
+from window_registry import WindowRegistry
+from window_pool import WindowPool
+from member_picker import MemberCandidates
+from theme import THEMES, DEFAULT_THEME, apply_theme
+from campaign_store import CampaignStore
+from save_pipeline import SavePipeline
+from campaign_loader import read_entities, plan_load
+from thumbnail_cache import ThumbnailLoader
+from session import SessionTask, app_settings, read_session, write_session
+from search_index import SearchIndex, index_path
 
-# Overlay class to draw connections between windows
+# Modules defining the editors of each window type, imported the first time a window of that type is built
+WINDOW_MODULES = {
+    "CharacterWindow": "character_window",
+    "ObstacleWindow": "obstacle_window",
+    "ZoneWindow": "zone_window",
+}
+
+# Check if a widget is a full zone editor (not a placeholder of a zone)
+def is_zone_editor(widget):
+    return isinstance(widget, DefaultWindow) and isinstance(widget.entity, ZoneEntity)
+
+# Retained geometry of one shape the overlay draws: a zone's marker, or the line from a zone to a member
+@dataclass(slots=True)
+class ConnectionEdge:
+    member: object  # member sub-window, or None for the zone's own marker
+    pen: QPen
+    brush: QColor
+    path: QPainterPath = field(default_factory=QPainterPath)
+    rect: QRect = field(default_factory=QRect)  # repaint area; empty while the edge is not drawn
+    line: QLineF = field(default_factory=QLineF)
+    key: tuple = ()  # endpoints rounded to 4 pixels, to draw overlapping lines once
+
+# Overlay class to draw connections between windows.
+# Every marker and line is kept as a QPainterPath; when a window moves only the edges attached to it
+# are rebuilt, and only the rectangles they covered before and after are repainted.
 class ConnectionOverlay(QWidget):
-    def __init__(self, mdi_area, parent=None):
+    # Lines drawn before switching to the cheaper level of detail
+    LOD_EDGE_THRESHOLD = 500
+
+    def __init__(self, mdi_area, registry, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.mdi_area = mdi_area
+        self.registry = registry
         self.connections = {}
+        self.edges = {}            # zone sub-window -> [marker, edge to each open member]
+        self.attached = {}         # member sub-window -> zone sub-windows with an edge to it
+        self.zones_by_member = {}  # member name -> zone sub-windows listing it
+        self.centers = {}          # sub-window -> center in overlay coordinates
+        
+        # Edges follow the windows their member names resolve to
+        self.registry.window_added.connect(lambda sub_window: self.resolve_member_name(self.registry.name_of(sub_window)))
+        self.registry.window_removed.connect(self.window_removed)
+        self.registry.window_renamed.connect(self.window_renamed)
 
-    # Update the connections to be drawn
+    # Replace every connection to be drawn
     def update_connections(self, connections):
-        self.connections = connections
+        self.connections = dict(connections)
+        self.edges.clear()
+        self.attached.clear()
+        self.zones_by_member.clear()
+        for zone_window, connected_window_names in connections.items():
+            for name in connected_window_names:
+                self.zones_by_member.setdefault(name, set()).add(zone_window)
+            self.resolve_zone(zone_window, repaint=False)
+        self.update()
+
+    # Replace the connections of a single zone
+    def set_zone(self, zone_window, connected_window_names):
+        self.forget_zone_names(zone_window)
+        self.connections[zone_window] = connected_window_names
+        for name in connected_window_names:
+            self.zones_by_member.setdefault(name, set()).add(zone_window)
+        self.resolve_zone(zone_window)
+
+    # Stop drawing the connections of a zone
+    def remove_zone(self, zone_window):
+        self.forget_zone_names(zone_window)
+        self.connections.pop(zone_window, None)
+        self.repaint_edges(self.drop_edges(zone_window))
+        self.edges.pop(zone_window, None)
+
+    # Remove a zone from the member name index
+    def forget_zone_names(self, zone_window):
+        for name in self.connections.get(zone_window, []):
+            zone_windows = self.zones_by_member.get(name)
+            if zone_windows:
+                zone_windows.discard(zone_window)
+                if not zone_windows:
+                    del self.zones_by_member[name]
+
+    # Unlink the edges of a zone from their members, returning them so the area they covered can be repainted
+    def drop_edges(self, zone_window):
+        edges = self.edges.get(zone_window, [])
+        for edge in edges[1:]:
+            zone_windows = self.attached.get(edge.member)
+            if zone_windows:
+                zone_windows.discard(zone_window)
+                if not zone_windows:
+                    del self.attached[edge.member]
+        return edges
+
+    # Resolve the member names of a zone to open windows and rebuild its edges
+    def resolve_zone(self, zone_window, repaint=True):
+        old_edges = self.drop_edges(zone_window)
+        edges = [ConnectionEdge(None, QPen(Qt.black, 1), QColor(255, 0, 0, 127))]
+        for connected_window_name in self.connections.get(zone_window, []):
+            connected_window = self.registry.find(connected_window_name)
+            if connected_window is None:
+                continue
+            
+            # Set the pen color based on the type of connected window, which may be a placeholder
+            if isinstance(connected_window.widget().entity, CharacterEntity):
+                pen = QPen(Qt.black, 2)
+            elif isinstance(connected_window.widget().entity, ObstacleEntity):
+                pen = QPen(Qt.white, 2)
+            else:
+                pen = QPen(Qt.black, 2)
+            
+            edges.append(ConnectionEdge(connected_window, pen, QColor(0, 0, 255, 127)))
+            self.attached.setdefault(connected_window, set()).add(zone_window)
+        self.edges[zone_window] = edges
+        
+        for edge in edges:
+            self.layout_edge(edge, zone_window)
+        if repaint:
+            self.repaint_edges(old_edges + edges)
+
+    # Re-resolve the zones listing a member name
+    def resolve_member_name(self, name):
+        for zone_window in list(self.zones_by_member.get(name, ())):
+            self.resolve_zone(zone_window)
+
+    # Forget a closed window as a zone and as a member
+    def window_removed(self, sub_window, name):
+        self.centers.pop(sub_window, None)
+        self.remove_zone(sub_window)
+        self.resolve_member_name(name)
+
+    # Move the edges of a renamed window to its new name
+    def window_renamed(self, sub_window, old_name, new_name):
+        self.resolve_member_name(old_name)
+        self.resolve_member_name(new_name)
+
+    # Rebuild the edges attached to a window that moved, resized, or was shown, hidden or minimized
+    def window_moved(self, sub_window):
+        self.centers.pop(sub_window, None)
+        region = QRegion()
+        if sub_window in self.edges:
+            for edge in self.edges[sub_window]:
+                region = region.united(edge.rect)
+                self.layout_edge(edge, sub_window)
+                region = region.united(edge.rect)
+        for zone_window in self.attached.get(sub_window, ()):
+            for edge in self.edges[zone_window][1:]:
+                if edge.member is sub_window:
+                    region = region.united(edge.rect)
+                    self.layout_edge(edge, zone_window)
+                    region = region.united(edge.rect)
+        if not region.isEmpty():
+            self.update(region)
+
+    # Rebuild every edge, e.g. after the overlay itself moved or resized
+    def layout_all(self):
+        self.centers.clear()
+        for zone_window, edges in self.edges.items():
+            for edge in edges:
+                self.layout_edge(edge, zone_window)
         self.update()
 
-    # Paint event to draw the connections
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.layout_all()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.layout_all()
+
+    # Rebuild the path of an edge.
+    # It is empty while either end is hidden or minimized, or when it lies entirely outside the overlay.
+    def layout_edge(self, edge, zone_window):
+        edge.path = QPainterPath()
+        edge.rect = QRect()
+        if not self.is_valid_window(zone_window):
+            return
+        zone_center = QPointF(self._get_center_point(zone_window))
+        if edge.member is None:
+            edge.path.addEllipse(zone_center, 5, 5)
+        elif self.is_valid_window(edge.member):
+            connected_center = QPointF(self._get_center_point(edge.member))
+            edge.line = QLineF(zone_center, connected_center)
+            edge.key = (int(zone_center.x()) >> 2, int(zone_center.y()) >> 2, int(connected_center.x()) >> 2, int(connected_center.y()) >> 2)
+            edge.path.moveTo(zone_center)
+            edge.path.lineTo(connected_center)
+            edge.path.addEllipse(connected_center, 5, 5)
+        else:
+            return
+        margin = edge.pen.width() + 1
+        rect = edge.path.boundingRect().toAlignedRect().adjusted(-margin, -margin, margin, margin)
+        if rect.intersects(self.rect()):
+            edge.rect = rect
+        else:
+            edge.path = QPainterPath()
+
+    # Repaint the area covered by the given edges
+    def repaint_edges(self, edges):
+        region = QRegion()
+        for edge in edges:
+            region = region.united(edge.rect)
+        if not region.isEmpty():
+            self.update(region)
+
+    # Number of zone-to-member lines
+    def edge_count(self):
+        return sum(len(edges) - 1 for edges in self.edges.values())
+
+    # Paint event to draw the connections that cross the area being repainted.
+    # Past LOD_EDGE_THRESHOLD lines, member markers are dropped, lines that would overlap are drawn once,
+    # and the lines of each colour are drawn in a single call.
     def paintEvent(self, event):
         painter = QPainter(self)
+        dirty_rect = event.rect()
         
-        valid_windows = {sub_window.widget().name_input.text(): sub_window for sub_window in self.mdi_area.subWindowList() if self.is_valid_window(sub_window)}
-        
-        for zone_window, connected_window_names in self.connections.items():
-            if zone_window in valid_windows.values():
-                zone_center = self._get_center_point(zone_window)
-                painter.setBrush(QColor(255, 0, 0, 127)) 
-                painter.drawEllipse(zone_center, 5, 5) 
-                for connected_window_name in connected_window_names:
-                    if connected_window_name in valid_windows:
-                        connected_window = valid_windows[connected_window_name]
-                        connected_center = self._get_center_point(connected_window)
-                        
-                        # Set the pen color based on the type of connected window
-                        if isinstance(connected_window.widget(), CharacterWindow):
-                            pen = QPen(Qt.black, 2)
-                        elif isinstance(connected_window.widget(), ObstacleWindow):
-                            pen = QPen(Qt.white, 2)
-                        else:
-                            pen = QPen(Qt.black, 2)
-                        
-                        painter.setPen(pen)
-                        painter.setBrush(QColor(0, 0, 255, 127))  
-                        painter.drawEllipse(connected_center, 5, 5)  
-                        painter.drawLine(zone_center, connected_center)
+        if self.edge_count() <= self.LOD_EDGE_THRESHOLD:
+            for edges in self.edges.values():
+                for edge in edges:
+                    if edge.rect.intersects(dirty_rect):
+                        painter.setPen(edge.pen)
+                        painter.setBrush(edge.brush)
+                        painter.drawPath(edge.path)
+        else:
+            pens, lines = {}, {}  # pen colour -> pen, lines
+            drawn = set()
+            for edges in self.edges.values():
+                marker = edges[0]
+                if marker.rect.intersects(dirty_rect):
+                    painter.setPen(marker.pen)
+                    painter.setBrush(marker.brush)
+                    painter.drawPath(marker.path)
+                for edge in edges[1:]:
+                    if edge.key not in drawn and edge.rect.intersects(dirty_rect):
+                        drawn.add(edge.key)
+                        rgba = edge.pen.color().rgba()
+                        pens.setdefault(rgba, edge.pen)
+                        lines.setdefault(rgba, []).append(edge.line)
+            for rgba, color_lines in lines.items():
+                painter.setPen(pens[rgba])
+                painter.drawLines(color_lines)
         
         painter.end()
 
-    # Get the center point of a sub-window
+    # Get the center point of a sub-window in overlay coordinates.
+    # Sub-windows and the overlay share the MDI viewport as parent, so no global round trip is needed;
+    # the result is cached until the sub-window's own geometry events invalidate it.
     def _get_center_point(self, sub_window):
-        if not self.is_valid_window(sub_window):
-            return QPoint(0, 0)
-        global_center = sub_window.mapToGlobal(sub_window.rect().center())
-        local_center = self.mapFromGlobal(global_center)
-        return local_center
+        center = self.centers.get(sub_window)
+        if center is None:
+            if not self.is_valid_window(sub_window):
+                return QPoint(0, 0)
+            center = sub_window.geometry().center() - self.pos()
+            self.centers[sub_window] = center
+        return center
 
     # Check if a sub-window is valid for drawing connections
     def is_valid_window(self, sub_window):
@@ -68,6 +282,15 @@ class ConnectionOverlay(QWidget):
 
 # Main application window class
 class MainWindow(QMainWindow):
+    # Windows built between chances for the event loop to run during a bulk load
+    LOAD_BATCH_SIZE = 50
+    
+    # Seconds a lazily opened editor may stay unused before it is swapped back for its placeholder
+    LAZY_IDLE_SECONDS = 120
+    
+    # Closed windows kept for reuse, per window type, unless the user chose another size
+    WINDOW_POOL_CAP = 8
+
     def __init__(self):
         super().__init__()
         
@@ -75,24 +298,71 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
         
         self.mdi_area = QMdiArea()
+        self.mdi_area.setObjectName('campaignArea')
         self.setCentralWidget(self.mdi_area)
         
-        self.overlay = ConnectionOverlay(self.mdi_area, self.mdi_area.viewport())
+        self.registry = WindowRegistry(self)
+        self.window_pool = WindowPool(app_settings().value('window_pool_cap', self.WINDOW_POOL_CAP, type=int))
+        # Names zones can add as members, shared by every zone window; built with the first zone window
+        self.member_candidates = None
+        
+        self.overlay = ConnectionOverlay(self.mdi_area, self.registry, self.mdi_area.viewport())
         self.overlay.setGeometry(self.mdi_area.viewport().geometry())
         self.overlay.show()
         
         self.create_menu()
         
+        # Saves are written on a thread pool; progress and results show in the status bar
+        self.save_pipeline = SavePipeline(self)
+        self.save_pipeline.progress.connect(self.save_progress)
+        self.save_pipeline.failed.connect(self.save_failed)
+        self.save_pipeline.finished.connect(self.save_finished)
+        DefaultWindow.save_pipeline = self.save_pipeline
+        
+        # Thumbnails are decoded on a thread pool and swapped into their windows when ready
+        self.thumbnail_loader = ThumbnailLoader(DefaultWindow.thumbnails, self)
+        DefaultWindow.thumbnail_loader = self.thumbnail_loader
+        self.save_progress_bar = QProgressBar()
+        self.save_progress_bar.setMaximumWidth(200)
+        self.save_progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.save_progress_bar)
+        
+        # Connections are kept up to date by change notifications rather than polling
         self.zone_connections = {}
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_connections)
-        self.timer.start(100)  # Update every 100 ms
+        self.mdi_area.viewport().installEventFilter(self)
+        
+        # In lazy mode entities load into the unopened list; editors are built on open and released to
+        # placeholders when closed or idle
+        self.lazy_load = False
+        self.unopened = UnopenedEntities(self)
+        self.campaign_dock = None
+        self.active_sub_window = None
+        self.idle_since = {}  # lazily opened sub-window -> time it was last deactivated
+        self.mdi_area.subWindowActivated.connect(self.sub_window_activated)
+        # Started when the first unopened entity or placeholder is opened, as only lazily opened editors go idle
+        self.idle_timer = QTimer(self)
+        self.idle_timer.timeout.connect(self.release_idle_editors)
+        
+        # Entities of the last session, read in the background after startup
+        self.session_task = None
+        
+        # Full-text search over every entity of the store.
+        # The index and its panel are only loaded when the panel is first shown; saves and edits update it from then on.
+        self.search_index = None
+        self.search_index_changed = False
+        self.search_dock = None
+        self.index_pending = set()   # sub-windows edited since the index last caught up with them
+        self.indexed_names = {}      # sub-window -> name its unsaved edits were last indexed under
+        self.index_timer = QTimer(self)
+        self.index_timer.setSingleShot(True)
+        self.index_timer.setInterval(300)
+        self.index_timer.timeout.connect(self.index_edits)
+        self.save_pipeline.saved.connect(self.index_saved)
 
     # Update the overlay geometry on resize
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.overlay.setGeometry(self.mdi_area.viewport().geometry())
-        self.update_connections()
 
     # Create the menu bar and actions
     def create_menu(self):
@@ -101,124 +371,606 @@ class MainWindow(QMainWindow):
         file_menu = menubar.addMenu('File')
         
         new_character_action = QAction('New Character Window', self)
-        new_character_action.triggered.connect(lambda: self.new_window(CharacterWindow))
+        new_character_action.triggered.connect(lambda: self.new_window("CharacterWindow"))
         file_menu.addAction(new_character_action)
         
         new_obstacle_action = QAction('New Obstacle Window', self)
-        new_obstacle_action.triggered.connect(lambda: self.new_window(ObstacleWindow))
+        new_obstacle_action.triggered.connect(lambda: self.new_window("ObstacleWindow"))
         file_menu.addAction(new_obstacle_action)
         
         new_zone_action = QAction('New Zone Window', self)
-        new_zone_action.triggered.connect(lambda: self.new_window(lambda: ZoneWindow(self.mdi_area)))
+        new_zone_action.triggered.connect(lambda: self.new_window("ZoneWindow"))
         file_menu.addAction(new_zone_action)
         
         load_action = QAction('Load', self)
         load_action.triggered.connect(self.load_windows)
         file_menu.addAction(load_action)
 
+        self.lazy_load_action = QAction('Load Without Opening', self)
+        self.lazy_load_action.setCheckable(True)
+        self.lazy_load_action.toggled.connect(self.set_lazy_load)
+        file_menu.addAction(self.lazy_load_action)
+
         save_all_action = QAction('Save All', self)
         save_all_action.triggered.connect(self.save_all_windows)
         file_menu.addAction(save_all_action)
         
+        search_action = QAction('Search...', self)
+        search_action.setShortcut('Ctrl+F')
+        search_action.triggered.connect(self.show_search_panel)
+        file_menu.addAction(search_action)
+        
+        file_menu.addSeparator()
+        
+        open_campaign_action = QAction('Open Campaign Database...', self)
+        open_campaign_action.triggered.connect(self.open_campaign)
+        file_menu.addAction(open_campaign_action)
+        
+        import_campaign_action = QAction('Import Saved Files into Campaign', self)
+        import_campaign_action.triggered.connect(self.import_campaign)
+        file_menu.addAction(import_campaign_action)
+        
+        export_campaign_action = QAction('Export Campaign to Saved Files', self)
+        export_campaign_action.triggered.connect(self.export_campaign)
+        file_menu.addAction(export_campaign_action)
+        
+        file_menu.addSeparator()
+        
         close_all_action = QAction('Close All', self)
         close_all_action.triggered.connect(self.close_all_windows)
         file_menu.addAction(close_all_action)
+
+        window_pool_action = QAction('Window Pool Size...', self)
+        window_pool_action.triggered.connect(self.choose_window_pool_cap)
+        file_menu.addAction(window_pool_action)
+
+        self.restore_session_action = QAction('Restore Last Session at Startup', self)
+        self.restore_session_action.setCheckable(True)
+        self.restore_session_action.setChecked(app_settings().value('restore_session', True, type=bool))
+        self.restore_session_action.toggled.connect(lambda checked: app_settings().setValue('restore_session', checked))
+        file_menu.addAction(self.restore_session_action)
+        
+        # One checkable action per theme; switching restyles every open window at once
+        theme_menu = menubar.addMenu('Theme')
+        theme_group = QActionGroup(self)
+        for theme_name in THEMES:
+            theme_action = QAction(theme_name, self, checkable=True)
+            theme_action.setChecked(theme_name == DEFAULT_THEME)
+            theme_action.triggered.connect(lambda checked, theme_name=theme_name: apply_theme(theme_name))
+            theme_group.addAction(theme_action)
+            theme_menu.addAction(theme_action)
     
-    # Create a new window of the specified class
-    def new_window(self, window_class):
+    # Open a new, empty window of the specified type
+    def new_window(self, window_type):
+        self.open_window(window_type)
+
+    # Open a window of the given type showing the entity, or a new empty one.
+    # A closed window of the same type is reused from the pool when there is one.
+    def open_window(self, window_type, entity=None):
+        sub_window = self.window_pool.acquire(window_type)
+        window_instance = sub_window.widget() if sub_window is not None else self.create_window(window_type)
+        if entity is None:
+            window_instance.reset()
+        else:
+            window_instance.set_entity(entity)
+        if sub_window is None:
+            return self.add_sub_window(window_instance)
+        self.mdi_area.addSubWindow(sub_window)
+        sub_window.show()
+        return sub_window
+
+    # Show a window in a new sub-window of the MDI area
+    def add_sub_window(self, window_instance):
         sub_window = QMdiSubWindow()
-        window_instance = window_class()
         sub_window.setWidget(window_instance)
         sub_window.setAttribute(Qt.WA_DeleteOnClose)
         self.mdi_area.addSubWindow(sub_window)
         sub_window.show()
-        
-        self.update_zone_window_dropdowns()
-        self.update_connections()
-        
-        sub_window.moveEvent = self.update_connections_event
-        sub_window.resizeEvent = self.update_connections_event
-        sub_window.closeEvent = self.close_event
+        return sub_window
+
+    # Create an empty window for the given window type
+    def create_window(self, window_type):
+        module_name = WINDOW_MODULES.get(window_type)
+        if module_name is None:
+            return DefaultWindow()
+        window_class = getattr(importlib.import_module(module_name), window_type)
+        if window_type == "ObstacleWindow":
+            return window_class(add_default_rows=False)
+        elif window_type == "ZoneWindow":
+            if self.member_candidates is None:
+                self.member_candidates = MemberCandidates(self.registry, self)
+            return window_class(self.registry, self.member_candidates)
+        return window_class()
 
     # Load windows from saved files
     def load_windows(self):
         options = QFileDialog.Options()
         file_names, _ = QFileDialog.getOpenFileNames(self, "Load Files", "saved", "Text Files (*.txt);;All Files (*)", options=options)
         if file_names:
-            for file_name in file_names:
-                with open(file_name, 'r') as file:
-                    first_line = file.readline()
-                    window_type = first_line.split(": ")[1].strip()
-                    
-                    sub_window = QMdiSubWindow()
+            self.load_files(file_names)
+
+    # Load saved files together with every member their zones reference
+    def load_files(self, file_names):
+        self.open_planned(read_entities(file_names))
+
+    # Open entities in dependency order, reading the members they reference from the store once each
+    def open_planned(self, entities, lazy=None):
+        plan = plan_load(entities, DefaultWindow.store, lambda name: name in self.registry)
+        warnings = []
+        if plan.cycles:
+            cycles_str = "\n".join(" -> ".join(cycle) for cycle in plan.cycles)
+            warnings.append(f'Zones that contain themselves were each opened once:\n{cycles_str}')
+        if plan.missing:
+            # Listed before opening, which drops these rows from the zones
+            missing = set(plan.missing)
+            missing_str = "\n".join(f"{entity.name}: {', '.join(name for name in entity.members if name in missing)}"
+                                    for entity in plan.entities if isinstance(entity, ZoneEntity) and missing.intersection(entity.members))
+            warnings.append(f'Members that are not saved were removed from their zones:\n{missing_str}')
+        self.open_entities(plan.entities, lazy)
+        if warnings:
+            QMessageBox.warning(self, 'Warning', "\n\n".join(warnings))
+
+    # Build windows for parsed entities.
+    # Windows are built in batches with repaints and change notifications suspended,
+    # then the zone member pickers and connections are refreshed once at the end.
+    # Images are decoded in the background and appear in their windows as they become ready.
+    # In lazy mode the entities are listed as unopened instead.
+    def open_entities(self, entities, lazy=None):
+        if self.lazy_load if lazy is None else lazy:
+            self.unopened.add(entity for entity in entities if entity.name not in self.registry)
+            if len(self.unopened):
+                self.show_campaign_list()
+            return
+        # Entities opened directly are no longer unopened
+        self.unopened.take(entity.name for entity in entities)
+        self.mdi_area.setUpdatesEnabled(False)
+        self.registry.blockSignals(True)
+        try:
+            for start in range(0, len(entities), self.LOAD_BATCH_SIZE):
+                for entity in entities[start:start + self.LOAD_BATCH_SIZE]:
+                    # Bring an already open window to the front instead of opening it twice
+                    existing = self.registry.find(entity.name)
+                    if existing is not None:
+                        self.mdi_area.setActiveSubWindow(existing)
+                        continue
                     
-                    if window_type == "ObstacleWindow":
-                        window_instance = ObstacleWindow(add_default_rows=False)
-                    elif window_type == "CharacterWindow":
-                        window_instance = CharacterWindow()
-                    elif window_type == "ZoneWindow":
-                        window_instance = ZoneWindow(self.mdi_area)
-                    else:
-                        window_instance = DefaultWindow()
-
-                    window_instance.load_contents(file_name)
-                    sub_window.setWidget(window_instance)
-                    sub_window.setAttribute(Qt.WA_DeleteOnClose)
-                    self.mdi_area.addSubWindow(sub_window)
-                    sub_window.show()
-        
-        self.update_zone_window_dropdowns()
+                    self.open_window(entity.window_type, entity)
+                QCoreApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+        finally:
+            self.registry.blockSignals(False)
+            self.mdi_area.setUpdatesEnabled(True)
+        
+        # Also drops zone rows whose members could not be opened
+        self.update_zone_member_pickers()
         self.update_connections()
 
-    # Save all open windows
+    # Save the open windows that have unsaved edits
     def save_all_windows(self):
-        saved_files = []
-        for sub_window in self.mdi_area.subWindowList():
+        widgets = [sub_window.widget() for name, sub_window in self.registry.named_windows() if sub_window.widget().dirty]
+        if not widgets:
+            self.statusBar().showMessage('Nothing to save, no window has unsaved changes', 5000)
+            return
+        self.save_pipeline.save([widget.entity for widget in widgets], DefaultWindow.store)
+        for widget in widgets:
+            widget.dirty = False
+
+    # Show how far the background saves have got
+    def save_progress(self, done, total):
+        self.save_progress_bar.setRange(0, total)
+        self.save_progress_bar.setValue(done)
+        self.save_progress_bar.setVisible(done < total)
+
+    # Report a save that could not be written and keep its window marked as unsaved
+    def save_failed(self, name, message):
+        sub_window = self.registry.find(name)
+        if sub_window is not None:
+            sub_window.widget().mark_dirty()
+        QMessageBox.warning(self, 'Warning', f'Could not save {name}: {message}')
+
+    # Report the saves written since the pipeline went busy
+    def save_finished(self, count, elapsed):
+        self.save_progress_bar.setVisible(False)
+        if count:
+            self.statusBar().showMessage(f'Saved {count} entities in {elapsed * 1000:.0f} ms', 5000)
+
+    # Finish writing queued saves before the application quits
+    def closeEvent(self, event):
+        self.save_pipeline.wait()
+        self.save_session()
+        self.save_search_index()
+        self.window_pool.clear()
+        super().closeEvent(event)
+
+    # Remember the open campaign and windows for the next start
+    def save_session(self):
+        campaign_path = DefaultWindow.store.path if isinstance(DefaultWindow.store, CampaignStore) else None
+        names = [self.registry.name_of(sub_window) for sub_window in self.registry.sub_windows()]
+        write_session([name for name in names if name], campaign_path, self.lazy_load, self.unopened.names())
+
+    # Reopen the windows of the last session, unless that was turned off in the File menu.
+    # Entities are read on a pool thread, then opened in batches like any other load:
+    # windows that were open are opened again and entities that were only listed are listed again.
+    def restore_session(self):
+        if not self.restore_session_action.isChecked():
+            return
+        session = read_session()
+        if session is None or not (session["names"] or session["unopened"]):
+            return
+        campaign_path = session.get("campaign")
+        if campaign_path:
+            if not os.path.exists(campaign_path):
+                return
+            self.save_search_index()
+            DefaultWindow.store = CampaignStore(campaign_path)
+            self.unopened.clear()
+            self.switch_search_index()
+            self.setWindowTitle(f'Main Window - {os.path.basename(campaign_path)}')
+        self.lazy_load_action.setChecked(bool(session.get("lazy_load")))
+        self.statusBar().showMessage('Restoring the last session...')
+        self.session_task = SessionTask(DefaultWindow.store, session["names"] + session["unopened"])
+        self.session_task.setAutoDelete(False)
+        self.session_task.signals.finished.connect(lambda entities: self.session_read(entities, set(session["unopened"])))
+        QThreadPool.globalInstance().start(self.session_task)
+
+    # Open the entities of the last session once they have been read.
+    # The unopened ones are listed first, so the members of reopened zones are taken back out of the list.
+    def session_read(self, entities, unopened):
+        self.session_task = None
+        listed = [entity for entity in entities if entity.name in unopened]
+        if listed:
+            self.open_entities(listed, lazy=True)
+        self.open_planned([entity for entity in entities if entity.name not in unopened], lazy=False)
+        self.statusBar().showMessage(f'Restored {len(entities)} windows from the last session', 5000)
+
+    # Show the search panel, building it and reading the index the first time
+    def show_search_panel(self):
+        if self.search_dock is None:
+            self.search_dock = QDockWidget('Search', self)
+            self.search_dock.setObjectName('searchPanel')
+            panel = QWidget()
+            panel_layout = QVBoxLayout(panel)
+            self.search_input = QLineEdit()
+            self.search_input.setPlaceholderText('Names, aspects, stunts, notes, agents...')
+            self.search_input.textChanged.connect(self.run_search)
+            self.search_input.returnPressed.connect(lambda: self.open_search_result(self.search_results.item(0)))
+            panel_layout.addWidget(self.search_input)
+            self.search_results = QListWidget()
+            self.search_results.itemActivated.connect(self.open_search_result)
+            panel_layout.addWidget(self.search_results)
+            self.search_dock.setWidget(panel)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.search_dock)
+        self.load_search_index()
+        self.search_dock.show()
+        self.search_dock.raise_()
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+
+    # Read the index of the current store and bring it up to date, the first time it is needed
+    def load_search_index(self):
+        if self.search_index is not None:
+            return self.search_index
+        store = DefaultWindow.store
+        self.search_index = SearchIndex.load(index_path(store))
+        self.search_index_changed = self.search_index.sync(store) > 0
+        # Unsaved edits of open windows are searchable too
+        for sub_window in self.registry.sub_windows():
             widget = sub_window.widget()
-            if isinstance(widget, DefaultWindow):
-                name = widget.name_input.text()
-                if name:
-                    widget.save_contents(suppress_message=True)
-                    saved_files.append(f"{name}.txt")
-        
-        if saved_files:
-            saved_files_str = ", ".join(saved_files)
-            QMessageBox.information(self, 'Info', f'Contents saved to {saved_files_str}')
-                
+            if isinstance(widget, DefaultWindow) and widget.dirty:
+                self.index_pending.add(sub_window)
+        self.index_edits()
+        return self.search_index
+
+    # Write the index next to the store, if it changed since it was read
+    def save_search_index(self):
+        if self.search_index is not None and self.search_index_changed:
+            self.search_index.save(index_path(DefaultWindow.store))
+            self.search_index_changed = False
+
+    # Forget the index of the previous store; the new store's index is read when the panel needs it
+    def switch_search_index(self):
+        self.search_index = None
+        self.index_pending.clear()
+        self.indexed_names.clear()
+        if self.search_dock is not None and self.search_dock.isVisible():
+            self.load_search_index()
+            self.run_search(self.search_input.text())
+
+    # Show the entities matching the query, best first
+    def run_search(self, query):
+        index = self.load_search_index()
+        started = time.perf_counter()
+        results = index.search(query)
+        elapsed = time.perf_counter() - started
+        self.search_results.clear()
+        for score, name, window_type in results:
+            item = QListWidgetItem(f'{name}  ({window_type.replace("Window", "") or "Default"})')
+            item.setData(Qt.UserRole, name)
+            self.search_results.addItem(item)
+        if query.strip():
+            self.statusBar().showMessage(f'{len(results)} results in {elapsed * 1000:.1f} ms', 5000)
+
+    # Bring the window of a search result to the front, opening it if needed
+    def open_search_result(self, item):
+        if item is None:
+            return
+        name = item.data(Qt.UserRole)
+        if name in self.unopened:
+            self.open_unopened([name])
+        sub_window = self.registry.find(name)
+        if sub_window is None:
+            entities = DefaultWindow.store.load_entities([name])
+            if not entities:
+                self.statusBar().showMessage(f'{name} has not been saved', 5000)
+                return
+            self.open_planned(entities, lazy=False)
+            sub_window = self.registry.find(name)
+        if sub_window is not None:
+            self.mdi_area.setActiveSubWindow(sub_window)
+
+    # Index the entities a save wrote, with the stamps they now have in the store
+    def index_saved(self, entities):
+        if self.search_index is None:
+            return
+        for entity in entities:
+            self.search_index.update(entity)
+        self.search_index.restamp([entity.name for entity in entities], DefaultWindow.store)
+        self.search_index_changed = True
+
+    # Re-index an edited window shortly after the edits stop
+    def queue_index_update(self, sub_window):
+        # Pooled windows are filled with their next entity before they are registered again
+        if self.search_index is None or self.registry.entity_id(sub_window) is None:
+            return
+        self.index_pending.add(sub_window)
+        self.index_timer.start()
+
+    # Index the unsaved edits of the windows edited since the last update
+    def index_edits(self):
+        if self.search_index is None:
+            return
+        for sub_window in self.index_pending:
+            widget = sub_window.widget()
+            # Windows only marked edited while an entity was being shown are clean again by now
+            if not isinstance(widget, DefaultWindow) or not widget.dirty:
+                continue
+            name = widget.entity.name
+            old_name = self.indexed_names.get(sub_window)
+            if old_name is not None and old_name != name:
+                self.revert_search_entry(old_name)
+            if name:
+                self.search_index.update(widget.entity)
+                self.indexed_names[sub_window] = name
+            self.search_index_changed = True
+        self.index_pending.clear()
+        if self.search_dock is not None and self.search_dock.isVisible() and self.search_input.text().strip():
+            self.run_search(self.search_input.text())
+
+    # Index the saved version of an entity again in place of unsaved edits, or drop it if it was never saved
+    def revert_search_entry(self, name):
+        if self.search_index is None or name not in self.search_index or self.search_index.stamps.get(name) is not None:
+            return
+        entity = DefaultWindow.store.load_entity(name)
+        if entity is None:
+            self.search_index.remove(name)
+        else:
+            self.search_index.update(entity)
+            self.search_index.restamp([name], DefaultWindow.store)
+        self.search_index_changed = True
+
+    # Switch every window to a campaign database and open the entities it holds
+    def open_campaign(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Open Campaign Database", "campaign.sqlite", "Campaign Databases (*.sqlite);;All Files (*)", options=QFileDialog.DontConfirmOverwrite)
+        if not file_name:
+            return
+        # Queued saves belong to the store being replaced
+        self.save_pipeline.wait()
+        self.save_search_index()
+        if isinstance(DefaultWindow.store, CampaignStore):
+            DefaultWindow.store.close()
+        DefaultWindow.store = CampaignStore(file_name)
+        # Entities listed from the previous store cannot be opened from this one
+        self.unopened.clear()
+        self.switch_search_index()
+        
+        self.open_planned(DefaultWindow.store.load_entities())
+        self.setWindowTitle(f'Main Window - {os.path.basename(file_name)}')
+
+    # Copy the saved .txt files into the open campaign database
+    def import_campaign(self):
+        if not isinstance(DefaultWindow.store, CampaignStore):
+            QMessageBox.warning(self, 'Warning', 'Open a campaign database first!')
+            return
+        count = DefaultWindow.store.import_txt()
+        QMessageBox.information(self, 'Info', f'Imported {count} saved files into {os.path.basename(DefaultWindow.store.path)}')
+
+    # Write the open campaign database out as saved .txt files
+    def export_campaign(self):
+        if not isinstance(DefaultWindow.store, CampaignStore):
+            QMessageBox.warning(self, 'Warning', 'Open a campaign database first!')
+            return
+        count = DefaultWindow.store.export_txt()
+        QMessageBox.information(self, 'Info', f'Exported {count} entities to saved files')
+
     # Close all open windows
     def close_all_windows(self):
         for sub_window in self.mdi_area.subWindowList():
+            # Really close lazily opened editors instead of releasing them to placeholders
+            sub_window.setProperty('lazy', False)
             sub_window.close()
-        
-        self.update_zone_window_dropdowns()
-        self.update_connections()
 
-    # Update the dropdowns in all zone windows
-    def update_zone_window_dropdowns(self):
-        for sub_window in self.mdi_area.subWindowList():
-            if isinstance(sub_window.widget(), ZoneWindow):
-                sub_window.widget().update_dropdown()
+    # Ask how many closed windows of each type to keep for reuse, showing how well the pool has done so far
+    def choose_window_pool_cap(self):
+        stats = self.window_pool.stats()
+        cap, accepted = QInputDialog.getInt(
+            self, 'Window Pool Size',
+            f"Closed windows kept for reuse, per window type (0 turns the pool off).\n"
+            f"Reused: {stats['hits']}, built: {stats['misses']}, discarded: {stats['evictions']}, kept now: {stats['pooled']}",
+            self.window_pool.cap, 0, 100)
+        if accepted:
+            self.window_pool.set_cap(cap)
+            app_settings().setValue('window_pool_cap', cap)
+
+    # Choose whether loads list entities as unopened instead of building their editors
+    def set_lazy_load(self, lazy_load):
+        self.lazy_load = lazy_load
+
+    # Show the list of entities loaded without opening them
+    def show_campaign_list(self):
+        if self.campaign_dock is None:
+            self.campaign_dock = CampaignListDock(self.unopened, self)
+            self.campaign_dock.open_requested.connect(self.open_unopened)
+            self.addDockWidget(Qt.LeftDockWidgetArea, self.campaign_dock)
+        self.campaign_dock.show()
+
+    # Build the editors of listed entities, together with the listed members of the zones among them
+    def open_unopened(self, names):
+        names = list(names)
+        for name in names:
+            entity = self.unopened.by_name.get(name)
+            if isinstance(entity, ZoneEntity):
+                names.extend(member for member in entity.members if member in self.unopened and member not in names)
+        self.open_planned(self.unopened.take(names), lazy=False)
+        for name in names:
+            sub_window = self.registry.find(name)
+            if sub_window is not None:
+                sub_window.setProperty('lazy', True)
+        sub_window = self.registry.find(names[0]) if names else None
+        if sub_window is not None:
+            self.mdi_area.setActiveSubWindow(sub_window)
+        if not self.idle_timer.isActive():
+            self.idle_timer.start(30000)
+
+    # Build the full editor of a placeholder
+    def open_placeholder(self, sub_window):
+        placeholder = sub_window.widget()
+        window_instance = self.create_window(placeholder.entity.window_type)
+        window_instance.set_entity(placeholder.entity)
+        window_instance.dirty = placeholder.dirty
+        self.swap_widget(sub_window, window_instance)
+        if is_zone_editor(window_instance):
+            # Drops rows whose members are not open, as a full load does
+            window_instance.update_member_picker()
+        self.mdi_area.setActiveSubWindow(sub_window)
+        if not self.idle_timer.isActive():
+            self.idle_timer.start(30000)
+
+    # Swap a lazily opened editor back for a placeholder; its edits stay in the entity until saved
+    def release_editor(self, sub_window):
+        self.idle_since.pop(sub_window, None)
+        window_instance = sub_window.widget()
+        self.swap_widget(sub_window, PlaceholderWindow(window_instance.entity, window_instance.dirty))
+
+    # Show a different widget in a tracked sub-window and free the old one
+    def swap_widget(self, sub_window, window_instance):
+        old_widget = sub_window.widget()
+        sub_window.setWidget(window_instance)
+        self.registry.rebind(sub_window, old_widget)
+        old_widget.deleteLater()
+        self.watch_widget(sub_window)
+        sub_window.adjustSize()
+
+    # Remember when lazily opened editors stop being used
+    def sub_window_activated(self, sub_window):
+        if self.active_sub_window is not None and self.active_sub_window.property('lazy'):
+            self.idle_since[self.active_sub_window] = time.monotonic()
+        self.idle_since.pop(sub_window, None)
+        self.active_sub_window = sub_window
+
+    # Release the lazily opened editors that have not been used for a while
+    def release_idle_editors(self):
+        now = time.monotonic()
+        for sub_window, since in list(self.idle_since.items()):
+            if now - since >= self.LAZY_IDLE_SECONDS and not isinstance(sub_window.widget(), PlaceholderWindow):
+                self.release_editor(sub_window)
+
+    # Update the member pickers in all zone windows, after changes the registry did not report
+    def update_zone_member_pickers(self):
+        if self.member_candidates is not None:
+            self.member_candidates.refresh()
+        for sub_window in self.registry.sub_windows():
+            if is_zone_editor(sub_window.widget()):
+                sub_window.widget().update_member_picker()
         
-    # Event handler to update connections on move/resize
-    def update_connections_event(self, event):
-        self.update_connections()
-        super(QMdiSubWindow, self).moveEvent(event)
+    # Watch sub-windows as they are added to the MDI area and repaint the overlay when they change
+    def eventFilter(self, obj, event):
+        if isinstance(obj, QMdiSubWindow):
+            if event.type() == QEvent.Close:
+                if obj.property('lazy') and not isinstance(obj.widget(), PlaceholderWindow):
+                    # Closing a lazily opened editor only releases it back to its placeholder
+                    event.ignore()
+                    self.release_editor(obj)
+                    return True
+                self.registry.remove(obj)
+                self.forget_sub_window(obj)
+                widget = obj.widget()
+                if isinstance(widget, DefaultWindow) and widget.dirty:
+                    # Edits closed without saving no longer belong in the index
+                    self.revert_search_entry(widget.entity.name)
+                if isinstance(widget, DefaultWindow) and self.window_pool.release(widget.entity.window_type, obj):
+                    # Keep the sub-window and its editor for the next window of the same type.
+                    # Unparenting (rather than removeSubWindow) leaves the editor owned by its sub-window.
+                    event.ignore()
+                    obj.setParent(None)
+                    return True
+            elif event.type() in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+                self.overlay.window_moved(obj)
+        elif event.type() == QEvent.ChildAdded and isinstance(event.child(), QMdiSubWindow):
+            self.watch_sub_window(event.child())
+        return super().eventFilter(obj, event)
 
-    # Event handler to update connections on close
-    def close_event(self, event):
-        sub_window = self.sender()
-        if isinstance(sub_window, QMdiSubWindow):
-            sub_window.deleteLater()
-        self.update_connections()
-        event.accept()
+    # Hook the change signals of a newly added sub-window
+    def watch_sub_window(self, sub_window):
+        tracked = isinstance(sub_window.widget(), (DefaultWindow, PlaceholderWindow))
+        if sub_window.property('watched'):
+            # A sub-window back from the window pool keeps its hooks and only needs registering again
+            if tracked:
+                self.registry.add(sub_window)
+                if is_zone_editor(sub_window.widget()):
+                    self.update_zone_connections(sub_window)
+            return
+        sub_window.setProperty('watched', True)
+        sub_window.installEventFilter(self)
+        if tracked:
+            self.registry.add(sub_window)
+            self.watch_widget(sub_window)
+
+    # Hook the change signals of the widget a sub-window shows
+    def watch_widget(self, sub_window):
+        widget = sub_window.widget()
+        if isinstance(widget, PlaceholderWindow):
+            widget.open_requested.connect(lambda sub_window=sub_window: self.open_placeholder(sub_window))
+        if isinstance(widget, DefaultWindow):
+            widget.edited.connect(lambda sub_window=sub_window: self.queue_index_update(sub_window))
+        if is_zone_editor(widget):
+            widget.rows_changed.connect(lambda sub_window=sub_window: self.update_zone_connections(sub_window))
+        if isinstance(widget.entity, ZoneEntity):
+            self.update_zone_connections(sub_window)
+
+    # Drop a closed sub-window from the connections
+    def forget_sub_window(self, sub_window):
+        self.idle_since.pop(sub_window, None)
+        self.index_pending.discard(sub_window)
+        self.indexed_names.pop(sub_window, None)
+        if sub_window is self.active_sub_window:
+            self.active_sub_window = None
+        if self.zone_connections.pop(sub_window, None) is not None:
+            self.overlay.remove_zone(sub_window)
 
-    # Update the connections for the overlay
+    # Recompute the connections of a single zone
+    def update_zone_connections(self, sub_window):
+        # Pooled zones are not drawn; they are connected again when reopened
+        if self.registry.entity_id(sub_window) is None:
+            return
+        self.zone_connections[sub_window] = sub_window.widget().get_all_row_names()
+        self.overlay.set_zone(sub_window, self.zone_connections[sub_window])
+
+    # Rebuild the connections of every zone for the overlay
     def update_connections(self):
         self.zone_connections.clear()
-        for sub_window in self.mdi_area.subWindowList():
-            if isinstance(sub_window.widget(), ZoneWindow):
+        for sub_window in self.registry.sub_windows():
+            # Placeholders of zones read their members from the entity
+            if isinstance(sub_window.widget().entity, ZoneEntity):
                 zone_window = sub_window.widget()
                 connected_windows = zone_window.get_all_row_names()
                 self.zone_connections[sub_window] = connected_windows
         self.overlay.update_connections(self.zone_connections)
-        self.update()
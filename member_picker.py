@@ -0,0 +1,203 @@
+import re
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QListView, QPushButton, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+from entities import ZoneEntity
+from theme import button_style
+
+# Open windows that can be added to a zone: every window except zones, in the order they were opened.
+# The rows are the registry's sub-windows and their names are read from the registry, so no second copy
+# of the names is kept. One model is shared by every zone window; it is patched from the registry's
+# change notifications and rebuilt with refresh after loads that suspend them.
+class MemberCandidates(QAbstractListModel):
+    def __init__(self, registry, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.windows = []  # sub-windows, one per row
+        self.refresh()
+        registry.window_added.connect(self.window_added)
+        registry.window_removed.connect(self.window_removed)
+        registry.window_renamed.connect(self.window_renamed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.windows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.registry.name_of(self.windows[index.row()])
+
+    # The sub-window shown in a row
+    def sub_window(self, row):
+        return self.windows[row]
+
+    # Rebuild the rows from the registry, if they changed
+    def refresh(self):
+        windows = [sub_window for sub_window in self.registry.sub_windows() if self.is_candidate(sub_window)]
+        if windows != self.windows:
+            self.beginResetModel()
+            self.windows = windows
+            self.endResetModel()
+
+    # Whether an open window can be a member of a zone (open or as a placeholder)
+    def is_candidate(self, sub_window):
+        return not isinstance(sub_window.widget().entity, ZoneEntity)
+
+    def window_added(self, sub_window):
+        if not self.is_candidate(sub_window) or sub_window in self.windows:
+            return
+        row = len(self.windows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.windows.append(sub_window)
+        self.endInsertRows()
+
+    def window_removed(self, sub_window, name):
+        if sub_window in self.windows:
+            row = self.windows.index(sub_window)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.windows[row]
+            self.endRemoveRows()
+        self.name_changed(name)
+
+    def window_renamed(self, sub_window, old_name, new_name):
+        if sub_window in self.windows:
+            self.changed(self.windows.index(sub_window))
+        self.name_changed(old_name)
+        self.name_changed(new_name)
+
+    # Report a change to the window that now holds a name, which may have been hidden behind another with it
+    def name_changed(self, name):
+        sub_window = self.registry.find(name) if name else None
+        if sub_window in self.windows:
+            self.changed(self.windows.index(sub_window))
+
+    def changed(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+# One zone's view of the shared candidates: hides unnamed windows, the later windows of a repeated name
+# and the zone's members, sorts by name and fuzzy-matches what is typed.
+# Matches are ranked: names starting with the text first, then names containing it, then names
+# containing its letters in order, tightest first.
+class MemberFilter(QSortFilterProxyModel):
+    def __init__(self, candidates, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(candidates)
+        self.candidates = candidates
+        self.registry = candidates.registry
+        self.members = set()
+        self.pattern = ""
+        self.fuzzy = None
+        self.keys = {}    # name -> case-folded name
+        self.scores = {}  # name -> rank of its match with the current pattern
+        self.sort(0)
+
+    # Hide the names of a zone's members
+    def set_members(self, members):
+        self.members = set(members)
+        self.invalidateFilter()
+
+    # Filter and rank the names by what was typed
+    def set_pattern(self, pattern):
+        pattern = pattern.strip().casefold()
+        if pattern == self.pattern:
+            return
+        self.pattern = pattern
+        # Each letter is matched at its first place after the previous one, which needs no backtracking
+        self.fuzzy = re.compile(re.escape(pattern[0]) + "".join(f"[^{re.escape(char)}]*{re.escape(char)}" for char in pattern[1:])) if pattern else None
+        self.scores.clear()
+        self.invalidate()
+
+    # Case-folded name, for sorting and matching
+    def key(self, name):
+        key = self.keys.get(name)
+        if key is None:
+            # Names left behind by renames are dropped now and then
+            if len(self.keys) > 2 * self.candidates.rowCount() + 64:
+                self.keys.clear()
+            key = self.keys[name] = name.casefold()
+        return key
+
+    # Rank of a case-folded name's match with the pattern, or None if it does not match
+    def score(self, folded):
+        position = folded.find(self.pattern)
+        if position == 0:
+            return (0, len(folded))
+        if position > 0:
+            return (1, position)
+        match = self.fuzzy.search(folded)
+        if match is None:
+            return None
+        return (2, match.end() - match.start(), match.start())
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        sub_window = self.candidates.sub_window(source_row)
+        name = self.registry.name_of(sub_window)
+        if not name or name in self.members or self.registry.find(name) is not sub_window:
+            return False
+        if not self.pattern:
+            return True
+        score = self.score(self.key(name))
+        if score is None:
+            return False
+        self.scores[name] = score
+        return True
+
+    def lessThan(self, left, right):
+        left_name = self.registry.name_of(self.candidates.sub_window(left.row()))
+        right_name = self.registry.name_of(self.candidates.sub_window(right.row()))
+        return (self.scores.get(left_name, ()), self.key(left_name), left.row()) < (self.scores.get(right_name, ()), self.key(right_name), right.row())
+
+# Type-ahead list for adding members to a zone.
+# Typing filters the list; Enter adds the selected names, or the best match if none is selected.
+class MemberPicker(QWidget):
+    # Names picked to add, in list order
+    picked = pyqtSignal(list)
+
+    def __init__(self, candidates, parent=None):
+        super().__init__(parent)
+        self.filter = MemberFilter(candidates, self)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.search_input = QLineEdit(self)
+        self.search_input.setPlaceholderText('Add members: type to filter')
+        self.search_input.textChanged.connect(self.filter.set_pattern)
+        self.search_input.returnPressed.connect(self.pick_selected_or_first)
+        layout.addWidget(self.search_input)
+
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.filter)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Every row has the same height, so long lists are laid out without measuring each row
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMaximumHeight(150)
+        self.list_view.doubleClicked.connect(lambda index: self.picked.emit([index.data()]))
+        layout.addWidget(self.list_view)
+
+        button_layout = QHBoxLayout()
+        layout.addLayout(button_layout)
+        self.add_button = QPushButton('Add Selected', self)
+        button_style(self.add_button)
+        self.add_button.clicked.connect(self.pick_selected)
+        button_layout.addWidget(self.add_button)
+
+    # Hide the names of a zone's members
+    def set_members(self, members):
+        self.filter.set_members(members)
+
+    # Add every selected name
+    def pick_selected(self):
+        rows = sorted(index.row() for index in self.list_view.selectionModel().selectedRows())
+        names = [self.filter.index(row, 0).data() for row in rows]
+        if names:
+            self.picked.emit(names)
+
+    # Add the selected names, or the best match for what was typed
+    def pick_selected_or_first(self):
+        if self.list_view.selectionModel().hasSelection():
+            self.pick_selected()
+        elif self.search_input.text().strip() and self.filter.rowCount():
+            self.picked.emit([self.filter.index(0, 0).data()])
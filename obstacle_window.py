@@ -1,132 +1,211 @@
-import os
-from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QWidget, QMessageBox, QFileDialog, QLabel
-from PyQt5.QtCore import Qt, pyqtSlot
-from PyQt5.QtGui import QPixmap
-from default_window import DefaultWindow, button_style
+from PyQt5.QtWidgets import QApplication, QPushButton, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView, QStyledItemDelegate, QSpinBox, QAction
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QKeySequence
+from default_window import DefaultWindow, RowRemovalMixin
+from theme import button_style
+from entities import ObstacleEntity
+
+# Sort key for a score: numbers by value, anything else after them by text
+def score_key(score):
+    try:
+        return (0, int(score), "")
+    except ValueError:
+        return (1, 0, score)
+
+# Table model over an obstacle's [agent, score] rows.
+# It edits the entity's list in place, so saving reads exactly what the table shows.
+class ObstacleRowsModel(RowRemovalMixin, QAbstractTableModel):
+    HEADERS = ("Agent", "Score")
+
+    def __init__(self, rows=None, parent=None):
+        super().__init__(parent)
+        self.rows = rows if rows is not None else []
+
+    # Show a different list of rows
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.rows[index.row()][index.column()]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        value = str(value)
+        if self.rows[index.row()][index.column()] == value:
+            return False
+        self.rows[index.row()][index.column()] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    # Append many rows with a single notification
+    def append_rows(self, rows):
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend([list(row) for row in rows])
+        self.endInsertRows()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self.rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    # Sort by agent or by score (numerically); the entity's rows are reordered in place
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_rows = [self.rows[index.row()] for index in old_indexes]
+        key = (lambda row: score_key(row[1])) if column == 1 else (lambda row: row[0].lower())
+        self.rows.sort(key=key, reverse=order == Qt.DescendingOrder)
+        # Keep selections and the current cell on the same rows
+        positions = {id(row): position for position, row in enumerate(self.rows)}
+        self.changePersistentIndexList(old_indexes, [self.index(positions[id(row)], index.column()) for row, index in zip(old_rows, old_indexes)])
+        self.layoutChanged.emit()
+
+# Edits scores with a spin box; scores that are not whole numbers keep the plain text editor
+class ScoreDelegate(QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        if score_key(index.data(Qt.EditRole))[0] != 0:
+            return super().createEditor(parent, option, index)
+        editor = QSpinBox(parent)
+        editor.setRange(-99, 99)
+        return editor
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QSpinBox):
+            editor.setValue(int(index.data(Qt.EditRole)))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QSpinBox):
+            editor.interpretText()
+            model.setData(index, str(editor.value()))
+        else:
+            super().setModelData(editor, model, index)
+
+# Parse pasted text into [agent, score] rows: one row per line, "agent<TAB>score" or "agent:score"
+def parse_rows(text):
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if "\t" in line:
+            agent, _, score = line.partition("\t")
+        else:
+            agent, _, score = line.rpartition(":") if ":" in line else (line, "", "0")
+        rows.append([agent.strip(), score.strip() or "0"])
+    return rows
 
 class ObstacleWindow(DefaultWindow):
+    entity_class = ObstacleEntity
+
     def __init__(self, add_default_rows=True):
         super().__init__()
         self.setWindowTitle('Obstacle Window')
 
-        # Header layout for columns: Agent, Score, and Remove button
-        header_layout = QHBoxLayout()
-        header_layout.addWidget(QLabel("Agent"))
-        header_layout.addWidget(QLabel("Score"))
-        header_layout.addWidget(QLabel(""))
-        self.layout.addLayout(header_layout)
-
-        # Layout for rows of obstacles
-        self.rows_layout = QVBoxLayout()
-        self.layout.addLayout(self.rows_layout)
+        # Table of agent and score rows, backed by the entity's rows
+        self.rows_model = ObstacleRowsModel(self.entity.rows, self)
+        for signal in (self.rows_model.dataChanged, self.rows_model.rowsInserted, self.rows_model.rowsRemoved, self.rows_model.layoutChanged):
+            signal.connect(self.mark_dirty)
+        self.rows_view = QTableView(self)
+        self.rows_view.setModel(self.rows_model)
+        self.rows_view.setItemDelegateForColumn(1, ScoreDelegate(self.rows_view))
+        # Clicking a header sorts once; rows are not kept sorted while they are edited
+        self.rows_view.horizontalHeader().setSectionsClickable(True)
+        self.rows_view.horizontalHeader().sectionClicked.connect(self.sort_rows)
+        self.rows_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.rows_view.verticalHeader().setVisible(False)
+        self.rows_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.rows_view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        self.body_layout.addWidget(self.rows_view)
+
+        # Paste rows copied from a spreadsheet or a saved file
+        paste_action = QAction('Paste Rows', self.rows_view)
+        paste_action.setShortcut(QKeySequence.Paste)
+        paste_action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+        paste_action.triggered.connect(self.paste_rows)
+        self.rows_view.addAction(paste_action)
 
         # Add default rows if specified
         if add_default_rows:
             self.add_row("Obstacle", "0")
             self.add_row("", "0")
-        
-        # Button to add a new row
+
+        # Buttons to add a new row and remove the selected ones
+        buttons_layout = QHBoxLayout()
         self.new_row_button = QPushButton('New Row', self)
         button_style(self.new_row_button)
         self.new_row_button.clicked.connect(lambda: self.add_row("", "0"))
-        self.layout.addWidget(self.new_row_button)
+        buttons_layout.addWidget(self.new_row_button)
 
-        # Re-add the toggle button and notes/image layout
-        self.notes_toggle_button.setParent(None)
-        self.notes_image_layout.setParent(None)
+        self.remove_rows_button = QPushButton('Remove Selected', self)
+        button_style(self.remove_rows_button)
+        self.remove_rows_button.clicked.connect(self.remove_selected_rows)
+        buttons_layout.addWidget(self.remove_rows_button)
+        self.body_layout.addLayout(buttons_layout)
 
-        self.layout.addWidget(self.notes_toggle_button)
-        self.layout.addLayout(self.notes_image_layout)
-
-        # Show the notes and image by default
-        self.notes_input.setVisible(True)
-        self.image_label.setVisible(True)
-        self.choose_image_button.setVisible(True)
-        self.notes_toggle_button.setText('Hide Notes and Image')
+    # Return to the state of a new obstacle, with its default rows
+    def reset(self):
+        super().reset()
+        self.rows_view.horizontalHeader().setSortIndicatorShown(False)
+        self.add_row("Obstacle", "0")
+        self.add_row("", "0")
 
     # Add a new row with agent and score
     def add_row(self, agent="Obstacle", score="0"):
-        row_widget = QWidget()
-        row_layout = QHBoxLayout()
-        row_widget.setLayout(row_layout)
-
-        # Agent input
-        agent_input = QLineEdit(self)
-        agent_input.setText(agent)
-        row_layout.addWidget(agent_input)
+        self.rows_model.append_rows([[agent, score]])
 
-        # Score input
-        score_input = QLineEdit(self)
-        score_input.setText(score)
-        row_layout.addWidget(score_input)
+    # Add many rows at once
+    def add_rows(self, rows):
+        self.rows_model.append_rows(rows)
 
-        # Remove button for the row
-        remove_button = QPushButton('Remove', self)
-        button_style(remove_button)
-        remove_button.clicked.connect(lambda: self.remove_row(row_widget))
-        row_layout.addWidget(remove_button)
-
-        self.rows_layout.addWidget(row_widget)
+    # Append the rows on the clipboard
+    def paste_rows(self):
+        self.add_rows(parse_rows(QApplication.clipboard().text()))
 
     # Remove a row
-    def remove_row(self, row_widget):
-        self.rows_layout.removeWidget(row_widget)
-        row_widget.deleteLater()
-
-    # Toggle visibility of notes and image section
-    def toggle_notes(self):
-        visible = not self.notes_input.isVisible()
-        self.notes_input.setVisible(visible)
-        self.image_label.setVisible(visible)
-        self.choose_image_button.setVisible(visible)
-        self.notes_toggle_button.setText('Hide Notes and Image' if visible else 'Show Notes and Image')
-
-    # Choose an image
-    @pyqtSlot()
-    def choose_image(self):
-        options = QFileDialog.Options()
-        options |= QFileDialog.DontUseNativeDialog
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "pictures", "Image Files (*.png *.jpg *.bmp);;All Files (*)", options=options)
-        if file_path:
-            self.image_path = file_path
-            pixmap = QPixmap(file_path)
-            self.image_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
-
-    # Save contents to a file
-    def save_contents(self, suppress_message=False):
-        name = self.name_input.text()
-        if not name:
-            QMessageBox.warning(self, 'Warning', 'Name cannot be empty!')
-            return
-        
-        os.makedirs("saved", exist_ok=True)
-        file_path = os.path.join("saved", f"{name}.txt")
-        
-        with open(file_path, 'w') as file:
-            file.write(f"WindowType: ObstacleWindow\n")
-            file.write(f"Name: {name}\n")
-            for i in range(self.rows_layout.count()):
-                row_widget = self.rows_layout.itemAt(i).widget()
-                if row_widget:
-                    agent_input = row_widget.layout().itemAt(0).widget()
-                    score_input = row_widget.layout().itemAt(1).widget()
-                    file.write(f"{agent_input.text()}:{score_input.text()}\n")
-            file.write(f"Notes: {self.notes_input.toPlainText()}\n")
-            file.write(f"ImagePath: {self.image_path}\n")
-        
-        if not suppress_message:
-            QMessageBox.information(self, 'Info', f'Contents saved to {name}.txt')
-
-    # Load contents from a file
-    def load_contents(self, file_path):
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-            self.name_input.setText(lines[1].split(": ")[1].strip())
-            for line in lines[2:-2]:
-                agent, score = line.strip().split(':')
-                self.add_row(agent, score)
-            self.notes_input.setPlainText(lines[-2].split(": ", 1)[1].strip())
-            self.image_path = lines[-1].split(": ", 1)[1].strip()
-            if self.image_path:
-                pixmap = QPixmap(self.image_path)
-                self.image_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+    def remove_row(self, row):
+        self.rows_model.removeRows(row, 1)
+
+    # Sort by a column, reversing the order when the same column is clicked again
+    def sort_rows(self, column):
+        header = self.rows_view.horizontalHeader()
+        order = Qt.AscendingOrder
+        if header.isSortIndicatorShown() and header.sortIndicatorSection() == column and header.sortIndicatorOrder() == Qt.AscendingOrder:
+            order = Qt.DescendingOrder
+        header.setSortIndicator(column, order)
+        header.setSortIndicatorShown(True)
+        self.rows_model.sort(column, order)
+
+    # Remove the rows selected in the table
+    def remove_selected_rows(self):
+        self.rows_model.remove_row_numbers(index.row() for index in self.rows_view.selectionModel().selectedRows())
+
+    # Fill the widgets from the obstacle
+    def show_entity(self, entity):
+        super().show_entity(entity)
+        self.rows_model.set_rows(entity.rows)
@@ -0,0 +1,39 @@
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QPushButton, QLabel
+from PyQt5.QtCore import pyqtSignal
+from theme import button_style
+
+# Lightweight stand-in for an entity's editor.
+# It holds the entity as a plain record and shows only its name and type; the main window swaps in
+# the full editor when it is opened and swaps the placeholder back when the editor is released.
+class PlaceholderWindow(QWidget):
+    # Emitted when the user asks for the full editor
+    open_requested = pyqtSignal()
+
+    def __init__(self, entity, dirty=False):
+        super().__init__()
+        self.entity = entity
+        self.dirty = dirty
+        self.setWindowTitle(entity.name)
+
+        layout = QHBoxLayout()
+        self.setLayout(layout)
+
+        # Read-only name field; the registry follows it like an editor's name input
+        self.name_input = QLineEdit(entity.name, self)
+        self.name_input.setReadOnly(True)
+        layout.addWidget(self.name_input)
+
+        layout.addWidget(QLabel(entity.window_type.replace("Window", ""), self))
+
+        self.open_button = QPushButton('Open', self)
+        button_style(self.open_button)
+        self.open_button.clicked.connect(self.open_requested)
+        layout.addWidget(self.open_button)
+
+    # Flag the entity as edited since it was last saved, e.g. after a failed save
+    def mark_dirty(self):
+        self.dirty = True
+
+    # Names the entity references, read straight from the record
+    def get_all_row_names(self):
+        return list(getattr(self.entity, 'members', []))
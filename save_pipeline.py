@@ -0,0 +1,119 @@
+import time
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+
+# Signals a save task sends back to the GUI thread
+class SaveTaskSignals(QObject):
+    finished = pyqtSignal(list, list)  # names written, [(name, error message)] for the ones that failed
+
+# Writes a batch of entity snapshots on a pool thread
+class SaveTask(QRunnable):
+    def __init__(self, store, entities):
+        super().__init__()
+        self.store = store
+        self.entities = entities
+        self.written = []  # snapshots that reached the store
+        self.signals = SaveTaskSignals()
+
+    # Write the batch in one call; if that fails, write the entities one at a time,
+    # so only the ones that cannot be written are reported as failed
+    def run(self):
+        errors = []
+        try:
+            self.store.save_entities(self.entities)
+            self.written = list(self.entities)
+        except Exception:
+            for entity in self.entities:
+                try:
+                    self.store.save_entities([entity])
+                    self.written.append(entity)
+                except Exception as error:
+                    errors.append((entity.name, str(error)))
+        self.signals.finished.emit([entity.name for entity in self.written], errors)
+
+# Saves entities off the GUI thread.
+# Entities are copied on the GUI thread, then serialized and written on a thread pool.
+# At most one write per entity is in flight; newer saves of the same entity wait and replace each other.
+class SavePipeline(QObject):
+    progress = pyqtSignal(int, int)           # entities written so far, entities queued in total
+    failed = pyqtSignal(str, str)             # entity name, error message
+    saved = pyqtSignal(list)                  # snapshots of the entities a batch wrote
+    finished = pyqtSignal(int, float)         # entities written, elapsed seconds since the pipeline went busy
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.in_flight = set()   # names being written right now
+        self.waiting = {}        # name -> (store, snapshot) to write once the in-flight write is done
+        self.tasks = {}          # signals object -> running task, kept alive until it reports back
+        self.total = 0
+        self.done = 0
+        self.written = 0
+        self.started = 0.0
+
+    # Snapshot the entities and queue them for writing to the store
+    def save(self, entities, store):
+        if not entities:
+            return
+        if not self.in_flight and not self.waiting:
+            self.total = self.done = self.written = 0
+            self.started = time.perf_counter()
+        batch = []
+        for entity in entities:
+            snapshot = entity.copy()
+            if snapshot.name in self.in_flight:
+                if snapshot.name not in self.waiting:
+                    self.total += 1
+                self.waiting[snapshot.name] = (store, snapshot)
+            else:
+                self.total += 1
+                self.in_flight.add(snapshot.name)
+                batch.append(snapshot)
+        self.submit(store, batch)
+        self.progress.emit(self.done, self.total)
+
+    # Hand a batch of snapshots to the pool
+    def submit(self, store, batch):
+        if not batch:
+            return
+        task = SaveTask(store, batch)
+        task.setAutoDelete(False)
+        task.signals.finished.connect(self.task_finished)
+        self.tasks[task.signals] = task
+        self.pool.start(task)
+
+    # Record a finished batch and start the saves that were waiting on it
+    def task_finished(self, names, errors):
+        task = self.tasks.pop(self.sender(), None)
+        for name in names:
+            self.in_flight.discard(name)
+        if names and task is not None:
+            self.saved.emit(task.written)
+        for name, message in errors:
+            self.in_flight.discard(name)
+            self.failed.emit(name, message)
+        self.done += len(names) + len(errors)
+        self.written += len(names)
+
+        batches = {}
+        for name in names + [name for name, message in errors]:
+            if name in self.waiting:
+                store, snapshot = self.waiting.pop(name)
+                self.in_flight.add(name)
+                batches.setdefault(id(store), (store, []))[1].append(snapshot)
+        for store, batch in batches.values():
+            self.submit(store, batch)
+
+        self.progress.emit(self.done, self.total)
+        if not self.in_flight and not self.waiting:
+            self.finished.emit(self.written, time.perf_counter() - self.started)
+
+    # Whether any save is still queued or running
+    def busy(self):
+        return bool(self.in_flight or self.waiting)
+
+    # Block until every queued save has been written
+    def wait(self):
+        while self.busy():
+            self.pool.waitForDone()
+            # Deliver the finished signals, which may start the saves that were waiting
+            QCoreApplication.processEvents()
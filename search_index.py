@@ -0,0 +1,214 @@
+import os
+import re
+import json
+import math
+import bisect
+import heapq
+import hashlib
+from entities import CharacterEntity, ObstacleEntity, write_text_atomic
+from campaign_store import CampaignStore
+from session import app_data_path
+
+# Weight of a word by the field it appears in
+FIELD_WEIGHTS = {
+    'name': 5.0,
+    'high_concept': 3.0,
+    'trouble': 3.0,
+    'aspects': 2.0,
+    'agents': 2.0,
+    'stunts': 1.0,
+    'notes': 1.0,
+}
+
+WORD = re.compile(r"\w+")
+
+# Lower-case words of a text
+def tokenize(text):
+    return WORD.findall(text.lower())
+
+# Searchable text of an entity, by field
+def entity_fields(entity):
+    fields = {'name': [entity.name], 'notes': [entity.notes]}
+    if isinstance(entity, CharacterEntity):
+        fields['high_concept'] = [entity.high_concept]
+        fields['trouble'] = [entity.trouble]
+        fields['aspects'] = entity.aspects
+        fields['stunts'] = entity.stunts
+    elif isinstance(entity, ObstacleEntity):
+        fields['agents'] = [agent for agent, score in entity.rows]
+    return fields
+
+# Weighted count of each word of an entity
+def entity_terms(entity):
+    terms = {}
+    for field, texts in entity_fields(entity).items():
+        weight = FIELD_WEIGHTS[field]
+        for text in texts:
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+# Where the index of a store is kept: next to the campaign database, or for saved files in the application data
+def index_path(store):
+    if isinstance(store, CampaignStore):
+        return f"{store.path}.search.json"
+    digest = hashlib.sha1(os.path.abspath(store.directory).encode()).hexdigest()
+    return app_data_path("search", f"{digest}.json")
+
+# Inverted index over the names, notes, aspects, stunts, high concepts, troubles and obstacle agents of entities.
+# Entities are indexed one at a time, so saves and edits update it incrementally.
+# It is persisted with the stamp each entity had in the store when it was indexed; on the next start only
+# entities whose stamp changed are read again. Entities indexed from unsaved edits have no stamp.
+class SearchIndex:
+    VERSION = 1
+
+    def __init__(self):
+        self.documents = {}   # name -> (window type, {token: weight})
+        self.postings = {}    # token -> {name: weight}
+        self.tokens = []      # every token, sorted, for prefix matches; brought up to date by the next search
+        self.added_tokens = set()    # tokens indexed since the list was last sorted
+        self.removed_tokens = set()  # tokens still in the list that no entity uses any more
+        self.stamps = {}      # name -> store stamp of the indexed version, or None for unsaved edits
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, name):
+        return name in self.documents
+
+    # Index an entity, replacing what was indexed under its name
+    def update(self, entity, stamp=None):
+        self.remove(entity.name)
+        terms = entity_terms(entity)
+        self.documents[entity.name] = (entity.window_type, terms)
+        self.stamps[entity.name] = stamp
+        for token, weight in terms.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                if token in self.removed_tokens:
+                    self.removed_tokens.discard(token)
+                else:
+                    self.added_tokens.add(token)
+            postings[entity.name] = weight
+
+    # Drop an entity from the index
+    def remove(self, name):
+        document = self.documents.pop(name, None)
+        self.stamps.pop(name, None)
+        if document is None:
+            return
+        for token in document[1]:
+            postings = self.postings[token]
+            del postings[name]
+            if not postings:
+                del self.postings[token]
+                if token in self.added_tokens:
+                    self.added_tokens.discard(token)
+                else:
+                    self.removed_tokens.add(token)
+
+    # Bring the sorted token list up to date.
+    # The few tokens of an edit are inserted in place; after a build or a large sync it is sorted again,
+    # so indexing many entities costs one sort rather than one list insertion per new token.
+    def sort_tokens(self):
+        if len(self.added_tokens) > 64 or len(self.removed_tokens) > len(self.tokens) // 4:
+            self.tokens = sorted(self.postings)
+            self.removed_tokens.clear()
+        else:
+            for token in self.added_tokens:
+                bisect.insort(self.tokens, token)
+        self.added_tokens.clear()
+
+    # Tokens starting with a prefix
+    def expand(self, prefix):
+        if self.added_tokens or self.removed_tokens:
+            self.sort_tokens()
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_left(self.tokens, prefix + "\uffff")
+        # Removed tokens stay in the list until it is sorted again
+        return [token for token in self.tokens[start:end] if token in self.postings]
+
+    # Entities matching every word of a query, best first, as (score, name, window type).
+    # The last word also matches longer words it starts, so results follow the query as it is typed.
+    def search(self, query, limit=50):
+        words = tokenize(query)
+        if not words:
+            return []
+        count = len(self.documents)
+        scores = None
+        for position, word in enumerate(words):
+            candidates = self.expand(word) if position == len(words) - 1 else [word]
+            word_scores = {}
+            for token in candidates:
+                postings = self.postings.get(token)
+                if not postings:
+                    continue
+                # Rare words count for more
+                idf = math.log(1 + count / len(postings))
+                for name, weight in postings.items():
+                    score = weight * idf
+                    if score > word_scores.get(name, 0.0):
+                        word_scores[name] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {name: score + word_scores[name] for name, score in scores.items() if name in word_scores}
+            if not scores:
+                return []
+        # Only the best results are sorted, so common words stay fast
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, name, self.documents[name][0]) for name, score in best]
+
+    # Bring the index up to date with a store: index new and changed entities and drop deleted ones
+    def sync(self, store):
+        stamps = store.stamps()
+        for name in [name for name in self.documents if name not in stamps]:
+            self.remove(name)
+        stale = [name for name, stamp in stamps.items() if name not in self.stamps or self.stamps[name] != stamp]
+        for entity in store.load_entities(stale):
+            self.update(entity, stamps.get(entity.name))
+        return len(stale)
+
+    # Record the stamps entities have after being written to a store; only their own stamps are read
+    def restamp(self, names, store):
+        stamps = store.stamps(names)
+        for name in names:
+            if name in self.documents and name in stamps:
+                self.stamps[name] = stamps[name]
+
+    # Write the index to a file atomically
+    def save(self, path):
+        data = {
+            'version': self.VERSION,
+            'entities': {
+                name: [window_type, self.stamps.get(name), terms]
+                for name, (window_type, terms) in self.documents.items()
+            },
+        }
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            write_text_atomic(path, json.dumps(data, separators=(',', ':')))
+        except OSError:
+            # A lost index is rebuilt from the store next time
+            pass
+
+    # Read an index written by save; a missing or unreadable file gives an empty index
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            return index
+        postings = index.postings
+        for name, (window_type, stamp, terms) in data['entities'].items():
+            index.documents[name] = (window_type, terms)
+            index.stamps[name] = tuple(stamp) if isinstance(stamp, list) else stamp
+            for token, weight in terms.items():
+                postings.setdefault(token, {})[name] = weight
+        index.tokens = sorted(postings)
+        return index
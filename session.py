@@ -0,0 +1,62 @@
+import os
+import json
+from PyQt5.QtCore import QObject, QRunnable, QSettings, QStandardPaths, pyqtSignal
+from entities import write_text_atomic
+
+# File recording what was open when the application last closed, in the application's data directory
+SESSION_FILE = "session.json"
+
+# Path of a file in the per-user application data directory, which keeps the application's own state
+# (session, thumbnails, search indexes of saved files) out of the campaign and the working directory.
+# Resolved on use, as the directory depends on the application name.
+def app_data_path(*parts):
+    directory = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.path.abspath(".")
+    return os.path.join(directory, *parts)
+
+# Preferences that outlast sessions, kept next to the session file
+def app_settings():
+    return QSettings(app_data_path("settings.ini"), QSettings.IniFormat)
+
+# Record the open campaign database (None for saved files), the names of the open windows,
+# the load mode and the names of the entities listed without a window
+def write_session(names, campaign_path=None, lazy_load=False, unopened=(), path=None):
+    path = path or app_data_path(SESSION_FILE)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        write_text_atomic(path, json.dumps({"campaign": campaign_path, "names": names, "lazy_load": lazy_load, "unopened": list(unopened)}))
+    except OSError:
+        # Losing the session only means starting with an empty workspace
+        pass
+
+# Read the last session, or None if there is none or it cannot be read
+def read_session(path=None):
+    try:
+        with open(path or app_data_path(SESSION_FILE)) as file:
+            session = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(session, dict) or not isinstance(session.get("names"), list):
+        return None
+    # Sessions written before unopened entities were recorded list them with the open windows
+    if not isinstance(session.get("unopened"), list):
+        session["unopened"] = []
+    return session
+
+# Signals a session task sends back to the GUI thread
+class SessionTaskSignals(QObject):
+    finished = pyqtSignal(list)  # entities read, in session order
+
+# Reads the entities of the last session on a pool thread
+class SessionTask(QRunnable):
+    def __init__(self, store, names):
+        super().__init__()
+        self.store = store
+        self.names = names
+        self.signals = SessionTaskSignals()
+
+    def run(self):
+        try:
+            entities = self.store.load_entities(self.names)
+        except Exception:
+            entities = []
+        self.signals.finished.emit(entities)
@@ -0,0 +1,48 @@
+import time
+from PyQt5.QtCore import QObject, QEvent, QTimer, QCoreApplication, pyqtSignal
+
+# Times the phases of starting the application up to the first paint of the main window.
+# first_paint is sent once the first frame has been drawn, so later work does not delay it.
+class StartupProfile(QObject):
+    first_paint = pyqtSignal()
+
+    def __init__(self, enabled=False, started=None):
+        super().__init__()
+        self.enabled = enabled
+        self.started = started if started is not None else time.perf_counter()
+        self.last = self.started
+        self.phases = []  # (phase, seconds it took)
+        self.window = None
+
+    # End the current phase
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    # Wait for the first paint of a window
+    def watch(self, window):
+        self.window = window
+        QCoreApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.window is not None and obj.isWidgetType() and obj.window() is self.window:
+            QCoreApplication.instance().removeEventFilter(self)
+            self.window = None
+            # Let the rest of the frame finish painting first
+            QTimer.singleShot(0, self.painted)
+        return False
+
+    # The first frame is on screen
+    def painted(self):
+        self.mark("first paint")
+        if self.enabled:
+            self.report()
+        self.first_paint.emit()
+
+    # Print the time each phase took and the total
+    def report(self):
+        width = max(len(phase) for phase, _ in self.phases + [("time to first paint", 0)])
+        for phase, seconds in self.phases:
+            print(f"{phase:<{width}} {seconds * 1000:8.1f} ms", flush=True)
+        print(f"{'time to first paint':<{width}} {(self.last - self.started) * 1000:8.1f} ms", flush=True)
@@ -0,0 +1,16 @@
+# Small campaigns shared by the tests
+from entities import CharacterEntity, ObstacleEntity, ZoneEntity
+
+# Entities of a small campaign: two characters, an obstacle, a zone holding them and a zone holding that zone
+def campaign():
+    return [
+        CharacterEntity(name="Ada", high_concept="Rebel pilot", careful="2", aspects=["Red dust", "Oxygen debt"], stunts=["Ace"]),
+        CharacterEntity(name="Bo", trouble="Wanted in the dome", notes="Knows the airlock codes"),
+        ObstacleEntity(name="Storm", rows=[["Wind", "3"], ["Dust", "2"]], notes="Rolls in at dusk"),
+        ZoneEntity(name="Crater", members=["Ada", "Storm"]),
+        ZoneEntity(name="Colony", members=["Crater", "Bo"], notes="Under the dome"),
+    ]
+
+# Entities keyed by name, to compare campaigns whatever their order
+def by_name(entities):
+    return {entity.name: entity for entity in entities}
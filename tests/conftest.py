@@ -0,0 +1,16 @@
+import os
+import sys
+import pytest
+
+# The modules live at the top of the repository, as the benchmarks expect too
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# One application for every test that needs Qt
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QStandardPaths
+    # Sessions, settings and caches go to Qt's test locations instead of the user's
+    QStandardPaths.setTestModeEnabled(True)
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,38 @@
+# Tests of atomic file writes: a write that fails leaves the old file whole and no temporary file behind.
+# Run with: python -m pytest tests
+import os
+import pytest
+
+from entities import CharacterEntity, read_entity, write_atomic, write_entity, write_text_atomic
+
+def test_text_replaces_the_file(tmp_path):
+    path = str(tmp_path / "notes.txt")
+    write_text_atomic(path, "old")
+    write_text_atomic(path, "new", sync=True)
+    assert open(path).read() == "new"
+    assert os.listdir(tmp_path) == ["notes.txt"]
+
+def test_a_failing_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / "notes.txt")
+    write_text_atomic(path, "old")
+    def fail(temp_path):
+        with open(temp_path, "w") as file:
+            file.write("half writ")
+        raise OSError("disk full")
+    with pytest.raises(OSError):
+        write_atomic(path, fail)
+    assert open(path).read() == "old"
+    assert os.listdir(tmp_path) == ["notes.txt"]
+
+def test_a_declined_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / "thumbnail.png")
+    write_text_atomic(path, "old")
+    write_atomic(path, lambda temp_path: open(temp_path, "w").close() or False)
+    assert open(path).read() == "old"
+    assert os.listdir(tmp_path) == ["thumbnail.png"]
+
+def test_entities_round_trip_through_their_files(tmp_path):
+    path = str(tmp_path / "Ada.txt")
+    entity = CharacterEntity(name="Ada", high_concept="Rebel pilot", careful="2", aspects=["Red dust"], stunts=["Ace"], notes="Line one\nLine two")
+    write_entity(entity, path)
+    assert read_entity(path) == entity
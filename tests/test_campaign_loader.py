@@ -0,0 +1,60 @@
+# Tests of load planning: member ordering, nested members read from the store, cycles and missing members.
+# Run with: python -m pytest tests
+from entities import CharacterEntity, ZoneEntity
+from campaign_loader import plan_load, topological_order
+from campaign_store import TextFileStore
+from campaigns import campaign, by_name
+
+def test_topological_order_puts_members_first():
+    order, cycles = topological_order(by_name(campaign()))
+    assert cycles == []
+    assert sorted(order) == ["Ada", "Bo", "Colony", "Crater", "Storm"]
+    assert order.index("Ada") < order.index("Crater") < order.index("Colony")
+    assert order.index("Storm") < order.index("Crater")
+    assert order.index("Bo") < order.index("Colony")
+
+def test_topological_order_reports_cycles_once_each():
+    entities = by_name([ZoneEntity(name="A", members=["B"]), ZoneEntity(name="B", members=["A"]), ZoneEntity(name="C", members=["C"])])
+    order, cycles = topological_order(entities)
+    assert sorted(order) == ["A", "B", "C"]
+    assert sorted(cycles) == [["A", "B", "A"], ["C", "C"]]
+
+def test_topological_order_handles_deep_nesting():
+    depth = 5000
+    entities = by_name([ZoneEntity(name=f"Z{i}", members=[f"Z{i + 1}"]) for i in range(depth)])
+    order, cycles = topological_order(entities)
+    assert cycles == []
+    assert order == [f"Z{i}" for i in reversed(range(depth))]
+
+def test_plan_load_reads_nested_members_from_the_store(tmp_path):
+    store = TextFileStore(str(tmp_path))
+    store.save_entities(campaign())
+    plan = plan_load(store.load_entities(["Colony"]), store, lambda name: False)
+    names = [entity.name for entity in plan.entities]
+    assert sorted(names) == ["Ada", "Bo", "Colony", "Crater", "Storm"]
+    assert names[-1] == "Colony"
+    assert plan.cycles == []
+    assert plan.missing == []
+
+def test_plan_load_skips_open_members(tmp_path):
+    store = TextFileStore(str(tmp_path))
+    store.save_entities(campaign())
+    plan = plan_load(store.load_entities(["Colony"]), store, lambda name: name == "Crater")
+    assert sorted(entity.name for entity in plan.entities) == ["Bo", "Colony"]
+
+def test_plan_load_reports_missing_members(tmp_path):
+    store = TextFileStore(str(tmp_path))
+    store.save_entities([CharacterEntity(name="Ada")])
+    zones = [ZoneEntity(name="Crater", members=["Ada", "Ghost"]), ZoneEntity(name="Dome", members=["Nobody", "Ghost"])]
+    plan = plan_load(zones, store, lambda name: False)
+    assert sorted(entity.name for entity in plan.entities) == ["Ada", "Crater", "Dome"]
+    assert plan.missing == ["Ghost", "Nobody"]
+
+def test_plan_load_reports_cycles(tmp_path):
+    store = TextFileStore(str(tmp_path))
+    store.save_entities([ZoneEntity(name="B", members=["A"])])
+    plan = plan_load([ZoneEntity(name="A", members=["B"])], store, lambda name: False)
+    assert sorted(entity.name for entity in plan.entities) == ["A", "B"]
+    assert len(plan.cycles) == 1
+    assert plan.cycles[0][0] == plan.cycles[0][-1]
+    assert set(plan.cycles[0]) == {"A", "B"}
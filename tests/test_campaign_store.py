@@ -0,0 +1,28 @@
+# Tests of the SQLite campaign store and its import from and export to saved files.
+# Run with: python -m pytest tests
+from entities import CharacterEntity
+from campaign_store import CampaignStore, TextFileStore
+from campaigns import campaign, by_name
+
+def test_campaign_store_import_export_round_trip(tmp_path):
+    TextFileStore(str(tmp_path / "before")).save_entities(campaign())
+    store = CampaignStore(str(tmp_path / "campaign.db"))
+    try:
+        assert store.import_txt(str(tmp_path / "before")) == 5
+        assert by_name(store.load_entities()) == by_name(campaign())
+        assert store.export_txt(str(tmp_path / "after")) == 5
+    finally:
+        store.close()
+    assert by_name(TextFileStore(str(tmp_path / "after")).load_entities()) == by_name(campaign())
+
+def test_campaign_store_saves_over_an_entity(tmp_path):
+    store = CampaignStore(str(tmp_path / "campaign.db"))
+    try:
+        store.save_entities(campaign())
+        stamps = store.stamps()
+        store.save_entities([CharacterEntity(name="Ada", aspects=["Grounded"])])
+        assert store.load_entity("Ada") == CharacterEntity(name="Ada", aspects=["Grounded"])
+        assert store.stamps()["Ada"] != stamps["Ada"]
+        assert store.stamps()["Bo"] == stamps["Bo"]
+    finally:
+        store.close()
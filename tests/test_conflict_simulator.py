@@ -0,0 +1,47 @@
+# Tests of the conflict simulator: seeded runs repeat exactly, in one process or spread over workers.
+# Run with: python -m pytest tests
+import pytest
+
+from entities import CharacterEntity, ObstacleEntity
+from conflict_simulator import MIN_PARALLEL_TRIALS, combatants, simulate
+
+# Two characters (Bo keeps the default refresh of 3) against a storm with two agents, plus a row that is not an agent
+def scene():
+    return combatants([
+        CharacterEntity(name="Ada", careful="3", quick="1", fate_points="1", refresh="3"),
+        CharacterEntity(name="Bo", forceful="2"),
+        ObstacleEntity(name="Storm", rows=[["Wind", "2"], ["Dust", "1"], ["Notes", "heavy"]]),
+    ])
+
+def as_tuple(report):
+    return (report.trials, report.wins, report.losses, report.draws, report.fate_points_spent, report.rounds, dict(report.round_counts))
+
+def test_combatants_take_the_best_approach_and_scored_rows():
+    characters, opposition = scene()
+    assert [(combatant.name, combatant.skill, combatant.fate_points) for combatant in characters] == [("Ada", 3, 3), ("Bo", 2, 3)]
+    assert [(combatant.name, combatant.skill) for combatant in opposition] == [("Wind", 2), ("Dust", 1)]
+
+@pytest.mark.parametrize("mode", ["conflict", "challenge"])
+def test_seeded_runs_repeat_exactly(mode):
+    characters, opposition = scene()
+    report = simulate(characters, opposition, trials=500, mode=mode, workers=1, seed=7)
+    assert as_tuple(report) == as_tuple(simulate(characters, opposition, trials=500, mode=mode, workers=1, seed=7))
+    assert as_tuple(report) != as_tuple(simulate(characters, opposition, trials=500, mode=mode, workers=1, seed=8))
+    assert report.wins + report.losses + report.draws == report.trials == 500
+    assert sum(report.round_counts.values()) == 500
+
+def test_seeded_parallel_runs_repeat_with_the_same_workers():
+    characters, opposition = scene()
+    trials = MIN_PARALLEL_TRIALS * 2
+    first = simulate(characters, opposition, trials=trials, workers=2, seed=3)
+    assert first.trials == trials
+    assert as_tuple(first) == as_tuple(simulate(characters, opposition, trials=trials, workers=2, seed=3))
+
+def test_a_scene_without_characters_is_lost():
+    characters, opposition = scene()
+    report = simulate([], opposition, trials=50, workers=1, seed=1)
+    assert report.losses == 50
+
+def test_unknown_modes_are_refused():
+    with pytest.raises(ValueError):
+        simulate(*scene(), mode="duel")
@@ -0,0 +1,40 @@
+# Tests of the aspect and stunt list models of character windows.
+# Run with: python -m pytest tests
+from PyQt5.QtCore import Qt, QItemSelectionModel
+
+from entities import CharacterEntity
+from character_window import CharacterWindow, EntryListModel
+
+def test_entry_model_edits_the_entity_list_in_place(qapp):
+    entries = ["Red dust", "Oxygen debt"]
+    model = EntryListModel(entries)
+    assert model.rowCount() == 2
+    assert model.data(model.index(1)) == "Oxygen debt"
+    assert model.setData(model.index(0), "Grounded")
+    assert not model.setData(model.index(0), "Grounded")
+    model.append_entries(["Ace", "Medic"])
+    assert entries == ["Grounded", "Oxygen debt", "Ace", "Medic"]
+    assert model.flags(model.index(0)) & Qt.ItemIsEditable
+
+def test_scattered_rows_are_removed_one_run_at_a_time(qapp):
+    model = EntryListModel(list("abcdefghij"))
+    removals = []
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removals.append((first, last)))
+    model.remove_row_numbers(iter([0, 2, 3, 4, 9, 8, 3]))
+    assert model.entries == ["b", "f", "g", "h"]
+    assert removals == [(8, 9), (2, 4), (0, 0)]
+    model.remove_row_numbers([])
+    assert not model.removeRows(3, 2)
+
+def test_removing_selected_entries_updates_the_character(qapp):
+    window = CharacterWindow()
+    entity = CharacterEntity(name="Ada", aspects=["One", "Two", "Three"], stunts=["Ace"])
+    window.set_entity(entity)
+    selection = window.aspects_view.selectionModel()
+    for row in (0, 2):
+        selection.select(window.aspects_model.index(row), QItemSelectionModel.Select)
+    window.remove_selected(window.aspects_view)
+    assert entity.aspects == ["Two"]
+    window.add_stunt_with_text("Medic")
+    assert entity.stunts == ["Ace", "Medic"]
+    assert window.dirty
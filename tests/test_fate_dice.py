@@ -0,0 +1,20 @@
+# Tests of the exact Fate dice odds.
+# Run with: python -m pytest tests
+from fractions import Fraction
+
+from fate_dice import FAIL, TIE, SUCCEED, SUCCEED_WITH_STYLE, distribution, outcome_odds, total_counts
+
+def test_dice_totals_are_exact():
+    assert total_counts(1) == (1, 1, 1)
+    assert total_counts(4) == (1, 4, 10, 16, 19, 16, 10, 4, 1)
+    odds = distribution(0)
+    assert sum(odds.values()) == 1
+    assert odds[0] == Fraction(19, 81)
+    assert odds[4] == odds[-4] == Fraction(1, 81)
+    assert distribution(2)[2] == Fraction(19, 81)
+
+def test_outcome_odds_are_exact():
+    assert outcome_odds(0, 0) == {FAIL: Fraction(31, 81), TIE: Fraction(19, 81), SUCCEED: Fraction(26, 81), SUCCEED_WITH_STYLE: Fraction(5, 81)}
+    assert outcome_odds(3, 1) == outcome_odds(2, 0)
+    assert outcome_odds(-5, 0) == {FAIL: 1, TIE: 0, SUCCEED: 0, SUCCEED_WITH_STYLE: 0}
+    assert outcome_odds(7, 0)[SUCCEED_WITH_STYLE] == 1
@@ -0,0 +1,68 @@
+# Tests of the zone member picker: candidates follow the registry, and typed text ranks the names.
+# Run with: python -m pytest tests
+from PyQt5.QtWidgets import QMdiSubWindow
+
+from default_window import DefaultWindow
+from entities import DefaultEntity, ZoneEntity
+from member_picker import MemberCandidates, MemberFilter
+from window_registry import WindowRegistry
+
+# Sub-window showing an entity with the given name
+def make_sub_window(name, entity_class=DefaultEntity):
+    window = DefaultWindow()
+    window.set_entity(entity_class(name=name))
+    sub_window = QMdiSubWindow()
+    sub_window.setWidget(window)
+    return sub_window
+
+# A registry with windows of the given names, and one zone's view of them
+def picker(*names):
+    registry = WindowRegistry()
+    sub_windows = {name: make_sub_window(name) for name in names}
+    for sub_window in sub_windows.values():
+        registry.add(sub_window)
+    return registry, sub_windows, MemberFilter(MemberCandidates(registry))
+
+def listed(member_filter):
+    return [member_filter.index(row, 0).data() for row in range(member_filter.rowCount())]
+
+def test_names_are_listed_sorted_without_zones(qapp):
+    registry, sub_windows, member_filter = picker("bo", "Cy", "Ada")
+    registry.add(make_sub_window("Mars", ZoneEntity))
+    assert listed(member_filter) == ["Ada", "bo", "Cy"]
+
+def test_matches_rank_prefix_then_substring_then_fuzzy(qapp):
+    registry, sub_windows, member_filter = picker("Stormwind", "Storm", "Dust Storm", "Sto Rim", "Calm")
+    member_filter.set_pattern("storm")
+    # Prefixes, shortest first; then substrings, earliest first; then letters in order, tightest first
+    assert listed(member_filter) == ["Storm", "Stormwind", "Dust Storm", "Sto Rim"]
+    member_filter.set_pattern("srm")
+    assert listed(member_filter) == ["Storm", "Stormwind", "Sto Rim", "Dust Storm"]
+    member_filter.set_pattern("")
+    assert listed(member_filter) == ["Calm", "Dust Storm", "Sto Rim", "Storm", "Stormwind"]
+
+def test_members_are_hidden(qapp):
+    registry, sub_windows, member_filter = picker("Ada", "Bo", "Cy")
+    member_filter.set_members(["Bo"])
+    assert listed(member_filter) == ["Ada", "Cy"]
+    member_filter.set_pattern("o")
+    assert listed(member_filter) == []
+
+def test_rows_follow_the_registry(qapp):
+    registry, sub_windows, member_filter = picker("Ada", "Bo")
+    cy = make_sub_window("Cy")
+    registry.add(cy)
+    sub_windows["Ada"].widget().name_input.setText("Zed")
+    assert listed(member_filter) == ["Bo", "Cy", "Zed"]
+    registry.remove(cy)
+    assert listed(member_filter) == ["Bo", "Zed"]
+
+def test_a_repeated_name_is_listed_once_until_its_first_window_closes(qapp):
+    registry, sub_windows, member_filter = picker("Ada", "Bo")
+    twin = make_sub_window("Ada")
+    registry.add(twin)
+    assert listed(member_filter) == ["Ada", "Bo"]
+    registry.remove(sub_windows["Ada"])
+    assert listed(member_filter) == ["Ada", "Bo"]
+    twin.widget().name_input.setText("")
+    assert listed(member_filter) == ["Bo"]
@@ -0,0 +1,42 @@
+# Tests of pasting obstacle rows and of the table model over an obstacle's rows.
+# Run with: python -m pytest tests
+from PyQt5.QtCore import Qt, QPersistentModelIndex
+
+from entities import ObstacleEntity
+from obstacle_window import ObstacleRowsModel, ObstacleWindow, parse_rows
+
+def test_parse_rows_reads_tabs_colons_and_bare_agents():
+    text = "Guard\t2\n\n  Sniper: 3 \nTime: 12:00: 4\nDust storm\nDrone\t\n"
+    assert parse_rows(text) == [["Guard", "2"], ["Sniper", "3"], ["Time: 12:00", "4"], ["Dust storm", "0"], ["Drone", "0"]]
+    assert parse_rows("") == []
+
+def test_rows_model_edits_the_entity_rows_in_place(qapp):
+    rows = [["Guard", "2"], ["Sniper", "3"]]
+    model = ObstacleRowsModel(rows)
+    assert (model.rowCount(), model.columnCount()) == (2, 2)
+    assert model.headerData(1, Qt.Horizontal) == "Score"
+    assert model.setData(model.index(0, 1), 5)
+    assert not model.setData(model.index(0, 1), "5")
+    model.append_rows([("Drone", "1"), ("Wall", "0")])
+    model.remove_row_numbers([1, 3])
+    assert rows == [["Guard", "5"], ["Drone", "1"]]
+    assert model.flags(model.index(0, 0)) & Qt.ItemIsEditable
+
+def test_rows_sort_by_score_numerically_and_keep_the_selection(qapp):
+    rows = [["a", "10"], ["b", "9"], ["c", "x"], ["d", "-1"]]
+    model = ObstacleRowsModel(rows)
+    persistent = QPersistentModelIndex(model.index(1, 0))
+    model.sort(1)
+    assert [score for agent, score in rows] == ["-1", "9", "10", "x"]
+    assert model.data(model.index(persistent.row(), 0)) == "b"
+    model.sort(0, Qt.DescendingOrder)
+    assert [agent for agent, score in rows] == ["d", "c", "b", "a"]
+
+def test_window_saves_what_the_table_shows(qapp):
+    window = ObstacleWindow(add_default_rows=False)
+    entity = ObstacleEntity(name="Storm", rows=[["Wind", "3"]])
+    window.set_entity(entity)
+    assert not window.dirty
+    window.rows_model.append_rows([["Dust", "2"]])
+    assert window.dirty
+    assert entity.rows == [["Wind", "3"], ["Dust", "2"]]
@@ -0,0 +1,74 @@
+# Tests of the background save pipeline: snapshots, coalescing of repeated saves and partial failures.
+# Run with: python -m pytest tests
+import threading
+
+from entities import CharacterEntity
+from save_pipeline import SavePipeline
+
+# Store that records what it writes; writes can be held back, and entities with a bad name fail
+class RecordingStore:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+        self.writes = []  # (name, notes) in the order they were written
+
+    def save_entities(self, entities):
+        self.gate.wait()
+        if any(entity.name.startswith("Bad") for entity in entities):
+            raise OSError("disk full")
+        with self.lock:
+            self.writes += [(entity.name, entity.notes) for entity in entities]
+
+# Collect what a pipeline's signals report
+def watch(pipeline):
+    events = {'saved': [], 'failed': [], 'finished': []}
+    pipeline.saved.connect(lambda entities: events['saved'].extend((entity.name, entity.notes) for entity in entities))
+    pipeline.failed.connect(lambda name, message: events['failed'].append(name))
+    pipeline.finished.connect(lambda written, elapsed: events['finished'].append(written))
+    return events
+
+def test_saves_write_snapshots(qapp):
+    store = RecordingStore()
+    pipeline = SavePipeline()
+    events = watch(pipeline)
+    entity = CharacterEntity(name="Ada", notes="first")
+    pipeline.save([entity], store)
+    entity.notes = "edited after saving"
+    pipeline.wait()
+    assert store.writes == [("Ada", "first")]
+    assert events['saved'] == [("Ada", "first")]
+    assert events['finished'] == [1]
+    assert not pipeline.busy()
+
+def test_saves_of_an_entity_in_flight_wait_and_replace_each_other(qapp):
+    store = RecordingStore()
+    store.gate.clear()
+    pipeline = SavePipeline()
+    events = watch(pipeline)
+    entity = CharacterEntity(name="Ada", notes="v1")
+    pipeline.save([entity, CharacterEntity(name="Bo", notes="b1")], store)
+    for version in ("v2", "v3", "v4"):
+        entity.notes = version
+        pipeline.save([entity], store)
+    # Only the newest save waits for the one being written
+    assert pipeline.in_flight == {"Ada", "Bo"}
+    assert pipeline.waiting["Ada"][1].notes == "v4"
+    store.gate.set()
+    pipeline.wait()
+    assert sorted(store.writes) == [("Ada", "v1"), ("Ada", "v4"), ("Bo", "b1")]
+    assert store.writes.index(("Ada", "v1")) < store.writes.index(("Ada", "v4"))
+    assert (pipeline.done, pipeline.total) == (3, 3)
+    assert events['finished'] == [3]
+
+def test_failed_entities_do_not_fail_the_rest_of_their_batch(qapp):
+    store = RecordingStore()
+    pipeline = SavePipeline()
+    events = watch(pipeline)
+    pipeline.save([CharacterEntity(name="Ada"), CharacterEntity(name="Bad"), CharacterEntity(name="Bo")], store)
+    pipeline.wait()
+    assert sorted(store.writes) == [("Ada", ""), ("Bo", "")]
+    assert sorted(name for name, notes in events['saved']) == ["Ada", "Bo"]
+    assert events['failed'] == ["Bad"]
+    assert events['finished'] == [2]
+    assert not pipeline.busy()
@@ -0,0 +1,70 @@
+# Tests of the search index: incremental updates and syncing with a store.
+# Run with: python -m pytest tests
+from entities import CharacterEntity
+from campaign_store import CampaignStore, TextFileStore
+from search_index import SearchIndex
+from campaigns import campaign
+
+def search_names(index, query):
+    return [name for score, name, window_type in index.search(query)]
+
+def test_search_index_update_and_remove():
+    index = SearchIndex()
+    for entity in campaign():
+        index.update(entity)
+    assert search_names(index, "rebel pilot") == ["Ada"]
+    assert sorted(search_names(index, "dom")) == ["Bo", "Colony"]
+    assert sorted(search_names(index, "dust")) == ["Ada", "Storm"]
+    index.update(CharacterEntity(name="Ada", high_concept="Miner"))
+    assert search_names(index, "rebel") == []
+    assert search_names(index, "miner") == ["Ada"]
+    index.remove("Storm")
+    assert "Storm" not in index
+    assert search_names(index, "dust") == []
+    assert index.expand("wind") == []
+
+def test_search_index_sync_follows_the_store(tmp_path):
+    store = TextFileStore(str(tmp_path))
+    store.save_entities(campaign())
+    index = SearchIndex()
+    assert index.sync(store) == 5
+    assert index.sync(store) == 0
+    path = tmp_path / "index.json"
+    index.save(str(path))
+    index = SearchIndex.load(str(path))
+    assert len(index) == 5
+    assert index.sync(store) == 0
+    (tmp_path / "Storm.txt").unlink()
+    store.save_entities([CharacterEntity(name="Bo", notes="Left for orbit and a long haul")])
+    assert index.sync(store) == 1
+    assert "Storm" not in index
+    assert search_names(index, "orbit") == ["Bo"]
+    assert search_names(index, "airlock") == []
+
+def test_search_index_prefixes_follow_many_updates():
+    index = SearchIndex()
+    for number in range(500):
+        index.update(CharacterEntity(name=f"Scout{number}", notes=f"relay{number} beacon"))
+    assert len(index.expand("scout")) == 500
+    assert index.expand("relay49") == ["relay49", "relay490", "relay491", "relay492", "relay493", "relay494",
+                                       "relay495", "relay496", "relay497", "relay498", "relay499"]
+    index.remove("Scout49")
+    index.update(CharacterEntity(name="Scout7", notes="relay7 orbit"))
+    assert "relay49" not in index.expand("relay")
+    assert "orbit" in index.expand("or")
+    # A token removed and indexed again between searches is listed once
+    index.remove("Scout8")
+    index.update(CharacterEntity(name="Scout8", notes="relay8"))
+    assert index.expand("relay8") == ["relay8"] + [f"relay8{number}" for number in range(10)]
+    assert index.tokens == sorted(set(index.tokens))
+
+def test_store_stamps_of_named_entities(tmp_path):
+    store = TextFileStore(str(tmp_path))
+    store.save_entities(campaign())
+    assert store.stamps(["Ada", "Nobody"]) == {"Ada": store.stamps()["Ada"]}
+    database = CampaignStore(str(tmp_path / "campaign.db"))
+    try:
+        database.save_entities(campaign())
+        assert database.stamps(["Bo", "Nobody"]) == {"Bo": database.stamps()["Bo"]}
+    finally:
+        database.close()
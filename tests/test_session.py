@@ -0,0 +1,24 @@
+# Tests of the session file: open windows and unopened entities are recorded apart.
+# Run with: python -m pytest tests
+import json
+
+from session import read_session, write_session
+
+def test_open_and_unopened_names_round_trip(tmp_path):
+    path = str(tmp_path / "session.json")
+    write_session(["Ada", "Bo"], "campaign.db", True, ["Cy"], path=path)
+    assert read_session(path) == {"campaign": "campaign.db", "names": ["Ada", "Bo"], "lazy_load": True, "unopened": ["Cy"]}
+
+def test_older_sessions_reopen_every_name(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"campaign": None, "names": ["Ada", "Cy"], "lazy_load": True}))
+    session = read_session(str(path))
+    assert session["names"] == ["Ada", "Cy"] and session["unopened"] == []
+
+def test_unreadable_sessions_are_ignored(tmp_path):
+    path = tmp_path / "session.json"
+    assert read_session(str(path)) is None
+    path.write_text("{not json")
+    assert read_session(str(path)) is None
+    path.write_text(json.dumps({"names": "Ada"}))
+    assert read_session(str(path)) is None
@@ -0,0 +1,59 @@
+# Tests of the thumbnail cache: the memory LRU stays within its byte budget and falls back to the disk cache.
+# Run with: python -m pytest tests
+import os
+
+from PyQt5.QtGui import QImage, QColor
+
+from thumbnail_cache import ThumbnailCache
+
+# Write a square image of the given size and colour and return its path
+def make_image(directory, name, size=300, color="red"):
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    path = os.path.join(directory, f"{name}.png")
+    image.save(path)
+    return path
+
+# Cache with room in memory for the given number of 100 x 100 thumbnails
+def make_cache(tmp_path, thumbnails):
+    thumbnail_bytes = QImage(100, 100, QImage.Format_RGB32).sizeInBytes()
+    return ThumbnailCache(str(tmp_path / "thumbnails"), byte_budget=int(thumbnail_bytes * thumbnails), size=100)
+
+def test_thumbnails_are_scaled_and_cached_on_disk(qapp, tmp_path):
+    cache = make_cache(tmp_path, 4)
+    image = cache.get(make_image(str(tmp_path), "a", size=400))
+    assert (image.width(), image.height()) == (100, 100)
+    assert len(os.listdir(tmp_path / "thumbnails")) == 1
+    assert cache.get(str(tmp_path / "missing.png")) is None
+    assert cache.get("") is None
+
+def test_least_recently_used_thumbnails_leave_memory_first(qapp, tmp_path):
+    cache = make_cache(tmp_path, 2.5)
+    a, b, c = (make_image(str(tmp_path), name) for name in "abc")
+    cache.get(a)
+    cache.get(b)
+    assert cache.peek(a) is not None
+    cache.get(c)
+    assert cache.bytes <= cache.byte_budget
+    assert len(cache.images) == 2
+    assert cache.peek(b) is None
+    assert cache.peek(a) is not None and cache.peek(c) is not None
+    # An evicted thumbnail is read back from disk rather than decoded again
+    assert (cache.misses, cache.disk_hits) == (3, 0)
+    assert cache.get(b) is not None
+    assert (cache.misses, cache.disk_hits) == (3, 1)
+
+def test_a_thumbnail_over_the_budget_is_still_kept(qapp, tmp_path):
+    cache = make_cache(tmp_path, 0.5)
+    path = make_image(str(tmp_path), "a")
+    cache.get(path)
+    assert cache.peek(path) is not None
+    assert cache.bytes > cache.byte_budget
+
+def test_an_edited_image_is_decoded_again(qapp, tmp_path):
+    cache = make_cache(tmp_path, 4)
+    path = make_image(str(tmp_path), "a", color="red")
+    assert QColor(cache.get(path).pixel(50, 50)) == QColor("red")
+    make_image(str(tmp_path), "a", size=200, color="blue")
+    assert QColor(cache.get(path).pixel(50, 50)) == QColor("blue")
+    assert cache.misses == 2
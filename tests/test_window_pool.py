@@ -0,0 +1,70 @@
+# Tests of the window pool: closed windows are reset and reused, up to a cap per window type.
+# Run with: python -m pytest tests
+from PyQt5.QtWidgets import QMdiSubWindow
+from PyQt5.QtCore import QCoreApplication, QEvent
+
+from entities import CharacterEntity
+from window_pool import WindowPool
+
+def test_release_and_acquire_per_type_up_to_the_cap(qapp):
+    pool = WindowPool(cap=2)
+    windows = [QMdiSubWindow() for _ in range(3)]
+    assert pool.acquire("CharacterWindow") is None
+    assert pool.release("CharacterWindow", windows[0])
+    assert pool.release("CharacterWindow", windows[1])
+    assert not pool.release("CharacterWindow", windows[2])
+    assert pool.release("ObstacleWindow", windows[2])
+    assert pool.acquire("CharacterWindow") is windows[1]
+    assert pool.acquire("ObstacleWindow") is windows[2]
+    assert pool.acquire("ObstacleWindow") is None
+    assert pool.stats() == {'hits': 2, 'misses': 2, 'evictions': 1, 'pooled': 1}
+
+def test_lowering_the_cap_discards_the_oldest_windows(qapp):
+    pool = WindowPool(cap=3)
+    windows = [QMdiSubWindow() for _ in range(3)]
+    for sub_window in windows:
+        pool.release("ZoneWindow", sub_window)
+    pool.set_cap(1)
+    assert len(pool) == 1 and pool.evictions == 2
+    assert pool.acquire("ZoneWindow") is windows[2]
+    pool.set_cap(0)
+    assert not pool.release("ZoneWindow", windows[2])
+
+# Main window with no windows open and a pool of the given size
+def make_main_window(cap):
+    from main_window import MainWindow
+    main_window = MainWindow()
+    main_window.window_pool.set_cap(cap)
+    return main_window
+
+def close(sub_window):
+    sub_window.close()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+def test_closed_editors_are_reset_and_reused(qapp):
+    main_window = make_main_window(4)
+    sub_window = main_window.open_window("CharacterWindow", CharacterEntity(name="Ada", notes="Pilot", aspects=["Red dust"]))
+    editor = sub_window.widget()
+    close(sub_window)
+    assert "Ada" not in main_window.registry
+    assert len(main_window.window_pool) == 1
+
+    reused = main_window.open_window("CharacterWindow")
+    assert reused is sub_window and reused.widget() is editor
+    assert main_window.registry.find("") is None and reused in main_window.registry.sub_windows()
+    assert editor.entity == CharacterEntity()
+    assert editor.name_input.text() == "" and editor.aspects_model.entries == []
+    assert editor.notes_input is None or not editor.notes_input.isVisibleTo(editor)
+
+    shown = main_window.open_window("CharacterWindow", CharacterEntity(name="Bo"))
+    assert shown is not sub_window
+    assert main_window.window_pool.stats()['hits'] == 1
+    main_window.close_all_windows()
+
+def test_a_full_pool_lets_closed_windows_go(qapp):
+    main_window = make_main_window(0)
+    sub_window = main_window.open_window("ObstacleWindow")
+    close(sub_window)
+    assert len(main_window.window_pool) == 0 and main_window.window_pool.evictions == 1
+    assert main_window.open_window("ObstacleWindow") is not sub_window
+    main_window.close_all_windows()
@@ -0,0 +1,87 @@
+# Tests of the window registry: lookups by name and ID as windows open, rename and close.
+# Run with: python -m pytest tests
+from PyQt5.QtWidgets import QMdiSubWindow
+
+from default_window import DefaultWindow
+from entities import DefaultEntity
+from window_registry import WindowRegistry
+
+# Sub-window showing an entity with the given name
+def make_sub_window(name):
+    window = DefaultWindow()
+    window.set_entity(DefaultEntity(name=name))
+    sub_window = QMdiSubWindow()
+    sub_window.setWidget(window)
+    return sub_window
+
+def test_lookups_by_name_and_id(qapp):
+    registry = WindowRegistry()
+    ada, bo = make_sub_window("Ada"), make_sub_window("Bo")
+    ada_id, bo_id = registry.add(ada), registry.add(bo)
+    assert ada_id != bo_id
+    assert registry.add(ada) == ada_id
+    assert registry.find("Ada") is ada and registry.find_by_id(bo_id) is bo
+    assert "Bo" in registry and "Cy" not in registry
+    assert registry.sub_windows() == [ada, bo]
+    assert dict(registry.named_windows()) == {"Ada": ada, "Bo": bo}
+    registry.remove(ada)
+    assert "Ada" not in registry and registry.find_by_id(ada_id) is None
+    assert registry.sub_windows() == [bo]
+
+def test_renames_follow_the_name_input(qapp):
+    registry = WindowRegistry()
+    ada = make_sub_window("Ada")
+    entity_id = registry.add(ada)
+    ada.widget().name_input.setText("Ada Vance")
+    assert "Ada" not in registry
+    assert registry.find("Ada Vance") is ada
+    assert registry.name_of(ada) == "Ada Vance"
+    assert registry.entity_id(ada) == entity_id
+    # A removed window's edits no longer reach the registry
+    registry.remove(ada)
+    ada.widget().name_input.setText("Ghost")
+    assert "Ghost" not in registry
+
+def test_duplicate_names_resolve_to_the_oldest_window(qapp):
+    registry = WindowRegistry()
+    first, second = make_sub_window("Ada"), make_sub_window("Ada")
+    registry.add(first)
+    registry.add(second)
+    assert registry.find("Ada") is first
+    registry.remove(first)
+    assert registry.find("Ada") is second
+
+# Record every signal of a registry as (signal, name, ...) tuples
+def watch(registry):
+    events = []
+    registry.window_added.connect(lambda sub_window: events.append(("added", registry.name_of(sub_window))))
+    registry.window_removed.connect(lambda sub_window, name: events.append(("removed", name)))
+    registry.window_renamed.connect(lambda sub_window, old_name, new_name: events.append(("renamed", old_name, new_name)))
+    return events
+
+def test_signals_report_every_change_once(qapp):
+    registry = WindowRegistry()
+    events = watch(registry)
+    ada = make_sub_window("Ada")
+    registry.add(ada)
+    registry.add(ada)
+    ada.widget().name_input.setText("Ada Vance")
+    ada.widget().name_input.setText("Ada Vance")
+    registry.remove(ada)
+    registry.remove(ada)
+    assert events == [("added", "Ada"), ("renamed", "Ada", "Ada Vance"), ("removed", "Ada Vance")]
+
+def test_swapped_widgets_keep_reporting_renames(qapp):
+    registry = WindowRegistry()
+    sub_window = make_sub_window("Ada")
+    registry.add(sub_window)
+    events = watch(registry)
+    old_widget = sub_window.widget()
+    replacement = DefaultWindow()
+    replacement.set_entity(DefaultEntity(name="Ada"))
+    sub_window.setWidget(replacement)
+    registry.rebind(sub_window, old_widget)
+    old_widget.name_input.setText("Stale")
+    replacement.name_input.setText("Bo")
+    assert events == [("renamed", "Ada", "Bo")]
+    assert registry.find("Bo") is sub_window
@@ -0,0 +1,35 @@
+from PyQt5.QtWidgets import QApplication
+
+# Application-wide stylesheets, selected by name.
+# Widgets opt in with properties (like role="action" on buttons) and object names, so one stylesheet set on
+# the application styles every window; no widget carries a stylesheet of its own.
+THEMES = {
+    "Grey": """
+        QMdiArea#campaignArea { qproperty-background: palette(dark); }
+        QPushButton[role="action"] { background-color: #888888; color: white; }
+    """,
+    "Dark": """
+        QMainWindow, QMdiSubWindow { background-color: #2b2b2b; color: #dddddd; }
+        QMdiArea#campaignArea { qproperty-background: #1e1e1e; }
+        QLabel { color: #dddddd; }
+        QLineEdit, QTextEdit, QComboBox, QListView, QTableView {
+            background-color: #3c3f41; color: #dddddd; border: 1px solid #555555;
+            selection-background-color: #4b6eaf;
+        }
+        QHeaderView::section { background-color: #3c3f41; color: #dddddd; border: 1px solid #555555; }
+        QPushButton[role="action"] { background-color: #4e5254; color: white; border: 1px solid #5e6264; padding: 2px 6px; }
+        QPushButton[role="action"]:pressed { background-color: #3a3d3f; }
+    """,
+}
+
+# Theme used when the application starts
+DEFAULT_THEME = "Grey"
+
+# Mark a button for the themed button style
+def button_style(button):
+    button.setProperty("role", "action")
+
+# Style the whole application with a theme; Qt restyles every open widget itself
+def apply_theme(name, app=None):
+    app = app or QApplication.instance()
+    app.setStyleSheet(THEMES[name])
@@ -0,0 +1,188 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+from entities import write_atomic
+from session import app_data_path
+
+# Decode an image into a thumbnail of at most size x size pixels, or None.
+# The reader is asked for the target size, so formats that can (like JPEG) never decode the full bitmap.
+# QImage (unlike QPixmap) may be used off the GUI thread.
+def decode_thumbnail(image_path, size=100):
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    image_size = reader.size()
+    if image_size.isValid():
+        reader.setScaledSize(image_size.scaled(size, size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    return image
+
+# Thumbnails of entity images, shared by every window.
+# Thumbnails are kept in an in-memory LRU limited to a byte budget, backed by a directory of PNG files
+# that later sessions read instead of decoding the full images again.
+# Entries are keyed by path, modification time and file size, so an edited image is decoded afresh.
+class ThumbnailCache:
+    def __init__(self, directory=None, byte_budget=32 * 1024 * 1024, size=100):
+        self.directory = directory  # None until first used, then the application data's thumbnails directory
+        self.byte_budget = byte_budget
+        self.size = size
+        # Loaders fill the cache from worker threads
+        self.lock = threading.Lock()
+        self.images = OrderedDict()  # key -> thumbnail, least recently used first
+        self.bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # Cache key of an image file, or None if it does not exist
+    def key(self, image_path):
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+
+    # Path of the on-disk thumbnail for a key
+    def disk_path(self, key):
+        digest = hashlib.sha1(repr(key + (self.size,)).encode()).hexdigest()
+        return os.path.join(self.disk_directory(), f"{digest}.png")
+
+    # Directory of the on-disk thumbnails
+    def disk_directory(self):
+        if self.directory is None:
+            self.directory = app_data_path("thumbnails")
+        return self.directory
+
+    # Get the thumbnail of an image if it is in memory, without touching the disk
+    def peek(self, image_path):
+        key = self.key(image_path) if image_path else None
+        if key is None:
+            return None
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                self.memory_hits += 1
+            return image
+
+    # Get the thumbnail of an image, or None if it cannot be read
+    def get(self, image_path):
+        if not image_path:
+            return None
+        key = self.key(image_path)
+        if key is None:
+            return None
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                self.memory_hits += 1
+                return image
+
+        disk_path = self.disk_path(key)
+        image = QImage(disk_path) if os.path.exists(disk_path) else QImage()
+        if not image.isNull():
+            with self.lock:
+                self.disk_hits += 1
+        else:
+            image = decode_thumbnail(image_path, self.size)
+            if image is None:
+                return None
+            self.write(image, disk_path)
+            with self.lock:
+                self.misses += 1
+        self.put(key, image)
+        return image
+
+    # Add a thumbnail to the memory cache, evicting the least recently used ones over the budget
+    def put(self, key, image):
+        with self.lock:
+            old_image = self.images.pop(key, None)
+            if old_image is not None:
+                self.bytes -= old_image.sizeInBytes()
+            self.images[key] = image
+            self.bytes += image.sizeInBytes()
+            while self.bytes > self.byte_budget and len(self.images) > 1:
+                _, evicted = self.images.popitem(last=False)
+                self.bytes -= evicted.sizeInBytes()
+
+    # Write a thumbnail to the disk cache atomically; a failed write only costs a later decode
+    def write(self, image, disk_path):
+        try:
+            os.makedirs(self.disk_directory(), exist_ok=True)
+            write_atomic(disk_path, lambda temp_path: image.save(temp_path, "PNG"))
+        except OSError:
+            pass
+
+    # Forget every thumbnail held in memory
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.bytes = 0
+
+# Signals a thumbnail task sends back to the GUI thread
+class ThumbnailTaskSignals(QObject):
+    finished = pyqtSignal(str, QImage)  # image path, thumbnail (null if the image could not be read)
+
+# Fetches one thumbnail through the cache on a pool thread
+class ThumbnailTask(QRunnable):
+    def __init__(self, cache, image_path):
+        super().__init__()
+        self.cache = cache
+        self.image_path = image_path
+        self.signals = ThumbnailTaskSignals()
+        self.lock = threading.Lock()
+        self.image = None  # set once the thumbnail is ready
+
+    def run(self):
+        image = self.cache.get(self.image_path)
+        if image is None:
+            image = QImage()
+        with self.lock:
+            self.image = image
+            self.signals.finished.emit(self.image_path, image)
+
+# Loads thumbnails off the GUI thread.
+# Every window waiting on the same image shares one task; each is called back with the thumbnail when it is ready.
+class ThumbnailLoader(QObject):
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        self.tasks = {}  # image path -> task, kept alive until it reports back
+
+    # Call slot(image_path, thumbnail) on the GUI thread once the thumbnail of the image is ready
+    def request(self, image_path, slot):
+        task = self.tasks.get(image_path)
+        if task is None:
+            task = ThumbnailTask(self.cache, image_path)
+            task.setAutoDelete(False)
+            task.signals.finished.connect(self.task_finished)
+            task.signals.finished.connect(slot)
+            self.tasks[image_path] = task
+            self.pool.start(task)
+            return
+        with task.lock:
+            if task.image is None:
+                task.signals.finished.connect(slot)
+                return
+        # Finished, but its signal has not been delivered yet
+        slot(image_path, task.image)
+
+    # Drop a task once its thumbnail has been delivered
+    def task_finished(self, image_path, image):
+        self.tasks.pop(image_path, None)
+
+    # Whether any thumbnail is still being loaded
+    def busy(self):
+        return bool(self.tasks)
+
+    # Block until every requested thumbnail has been delivered
+    def wait(self):
+        while self.busy():
+            self.pool.waitForDone()
+            QCoreApplication.processEvents()
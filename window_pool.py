@@ -0,0 +1,50 @@
+# Pool of closed sub-windows kept with their editors for reuse, per window type.
+# Reopening a window of a pooled type skips building the editor and its sub-window again.
+class WindowPool:
+    def __init__(self, cap=8):
+        self.cap = cap              # sub-windows kept per window type
+        self.free = {}              # window type -> closed sub-windows, oldest first
+        self.hits = 0               # windows opened from the pool
+        self.misses = 0             # windows built because none of their type was pooled
+        self.evictions = 0          # closed windows destroyed because their type's pool was full
+
+    # Take a pooled sub-window of the given type, or None if there is none
+    def acquire(self, window_type):
+        free = self.free.get(window_type)
+        if free:
+            self.hits += 1
+            return free.pop()
+        self.misses += 1
+        return None
+
+    # Keep a closed sub-window for reuse; returns False if the pool for its type is full
+    def release(self, window_type, sub_window):
+        free = self.free.setdefault(window_type, [])
+        if len(free) >= self.cap:
+            self.evictions += 1
+            return False
+        free.append(sub_window)
+        return True
+
+    # Change the cap, destroying pooled sub-windows beyond it
+    def set_cap(self, cap):
+        self.cap = cap
+        for free in self.free.values():
+            while len(free) > cap:
+                free.pop(0).deleteLater()
+                self.evictions += 1
+
+    # Destroy every pooled sub-window
+    def clear(self):
+        for free in self.free.values():
+            for sub_window in free:
+                sub_window.deleteLater()
+        self.free.clear()
+
+    # Number of pooled sub-windows
+    def __len__(self):
+        return sum(len(free) for free in self.free.values())
+
+    # Counters shown with the pool size setting and read by the benchmarks
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'pooled': len(self)}
@@ -0,0 +1,112 @@
+import itertools
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Registry of open sub-windows, indexed by a stable entity ID and by current name.
+# Its signals are the application-wide bus that pushes window-set changes to subscribers.
+class WindowRegistry(QObject):
+    window_added = pyqtSignal(object)             # sub-window
+    window_removed = pyqtSignal(object, str)      # sub-window, last name
+    window_renamed = pyqtSignal(object, str, str) # sub-window, old name, new name
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.next_id = itertools.count(1)
+        self.ids = {}           # sub-window -> entity ID
+        self.by_id = {}         # entity ID -> sub-window
+        self.by_name = {}       # name -> sub-windows currently using that name, oldest first
+        self.names = {}         # sub-window -> current name
+        self.rename_slots = {}  # sub-window -> slot connected to its name input
+
+    # Start tracking a sub-window and follow its renames
+    def add(self, sub_window):
+        if sub_window in self.ids:
+            return self.ids[sub_window]
+        entity_id = next(self.next_id)
+        self.ids[sub_window] = entity_id
+        self.by_id[entity_id] = sub_window
+        widget = sub_window.widget()
+        name = widget.name_input.text()
+        self.names[sub_window] = name
+        if name:
+            self.by_name.setdefault(name, []).append(sub_window)
+        rename_slot = lambda text, sub_window=sub_window: self.rename(sub_window, text)
+        widget.name_input.textChanged.connect(rename_slot)
+        self.rename_slots[sub_window] = rename_slot
+        self.window_added.emit(sub_window)
+        return entity_id
+
+    # Stop tracking a sub-window
+    def remove(self, sub_window):
+        entity_id = self.ids.pop(sub_window, None)
+        if entity_id is None:
+            return
+        del self.by_id[entity_id]
+        name = self.names.pop(sub_window)
+        self.unlink_name(sub_window, name)
+        rename_slot = self.rename_slots.pop(sub_window)
+        try:
+            sub_window.widget().name_input.textChanged.disconnect(rename_slot)
+        except (RuntimeError, TypeError, AttributeError):
+            pass
+        self.window_removed.emit(sub_window, name)
+
+    # Follow the name input of the widget a tracked sub-window now shows, after its widget was swapped
+    def rebind(self, sub_window, old_widget):
+        rename_slot = self.rename_slots.get(sub_window)
+        if rename_slot is None:
+            return
+        try:
+            old_widget.name_input.textChanged.disconnect(rename_slot)
+        except (RuntimeError, TypeError, AttributeError):
+            pass
+        widget = sub_window.widget()
+        widget.name_input.textChanged.connect(rename_slot)
+        self.rename(sub_window, widget.name_input.text())
+
+    # Move a sub-window to a new name
+    def rename(self, sub_window, name):
+        old_name = self.names.get(sub_window)
+        if old_name is None or old_name == name:
+            return
+        self.unlink_name(sub_window, old_name)
+        self.names[sub_window] = name
+        if name:
+            self.by_name.setdefault(name, []).append(sub_window)
+        self.window_renamed.emit(sub_window, old_name, name)
+
+    # Remove a sub-window from the name index
+    def unlink_name(self, sub_window, name):
+        sub_windows = self.by_name.get(name)
+        if sub_windows:
+            sub_windows.remove(sub_window)
+            if not sub_windows:
+                del self.by_name[name]
+
+    # Find the sub-window with the given name, or None
+    def find(self, name):
+        sub_windows = self.by_name.get(name)
+        return sub_windows[0] if sub_windows else None
+
+    # Find the sub-window with the given entity ID, or None
+    def find_by_id(self, entity_id):
+        return self.by_id.get(entity_id)
+
+    # Get the entity ID of a tracked sub-window, or None
+    def entity_id(self, sub_window):
+        return self.ids.get(sub_window)
+
+    # Get the current name of a tracked sub-window
+    def name_of(self, sub_window):
+        return self.names.get(sub_window, "")
+
+    # Check if a window with the given name is open
+    def __contains__(self, name):
+        return name in self.by_name
+
+    # Iterate over (name, sub-window) pairs for every named window
+    def named_windows(self):
+        return [(name, sub_windows[0]) for name, sub_windows in self.by_name.items()]
+
+    # All tracked sub-windows, in the order they were added
+    def sub_windows(self):
+        return list(self.by_id.values())